@@ -3,16 +3,33 @@
 
 from __future__ import annotations
 
+import codecs
+import hashlib
 import json
+import math
+import multiprocessing
 import os
+import queue
 import re
+import sqlite3
 import sys
-import difflib
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+try:
+    from llama_cpp import Llama, LlamaGrammar  # CPU-only by default if N_GPU_LAYERS=0
+except ImportError:  # LLM_BACKEND=stub runs without llama-cpp-python
+    Llama = LlamaGrammar = None  # type: ignore[assignment,misc]
+
+from fuzzy_index import FuzzyIndex
 
 app = Flask(__name__)
 
@@ -26,16 +43,61 @@ MODEL_FILE = os.getenv(
     "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
 )
 
+# "llama_cpp" (default) or "stub": deterministic fake model, no download (see stub_llama.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "llama_cpp")
+
 N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
 
+# Model worker processes; each gets N_THREADS // WORKERS threads by default
+WORKERS = int(os.getenv("WORKERS", "1"))
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "0"))
+
+# Evaluate the shared system prompt + few-shots once and restore that KV state
+PREFIX_CACHE = os.getenv("PREFIX_CACHE", "1") != "0"
+
+# Cross-request micro-batching: rows wait at most BATCH_MAX_WAIT_MS for company
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "16"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+
 CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
 CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 
+# Two-level memo of LLM answers: in-process LRU over an SQLite file
+MEMO_CACHE = os.getenv("MEMO_CACHE", "1") != "0"
+MEMO_PATH = os.getenv("MEMO_PATH", os.path.join("cache", "memo.sqlite3"))
+MEMO_MAX_ENTRIES = int(os.getenv("MEMO_MAX_ENTRIES", "4096"))
+
+# Admission control: most rows queued or in flight across HTTP requests, and
+# how long a request may wait (clients can ask for less via X-Request-Timeout)
+MAX_PENDING_ROWS = int(os.getenv("MAX_PENDING_ROWS", "512"))
+REQUEST_DEADLINE_S = float(os.getenv("REQUEST_DEADLINE_S", "60"))
+
+# Bulk jobs: state, inputs and results live under JOBS_DIR/<id>/
+JOBS_DIR = os.getenv("JOBS_DIR", "jobs")
+# {"path": ...} jobs may only read files under this directory
+JOBS_INPUT_DIR = os.getenv("JOBS_INPUT_DIR", ".")
+
+# Rows whose rules-only confidence reaches this skip the model (>1 disables)
+RULES_MIN_CONFIDENCE = float(os.getenv("RULES_MIN_CONFIDENCE", "0.92"))
+
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
 
+# Constrain generation to exactly the answer object (set JSON_GRAMMAR=0 for free text)
+JSON_GRAMMAR = os.getenv("JSON_GRAMMAR", "1") != "0"
+MAX_TOKENS = int(os.getenv("MAX_TOKENS", "128"))
+
+# GBNF for {"standardized_program": "...", "standardized_university": "..."};
+# the grammar is complete at the closing brace, so decoding stops there
+ANSWER_GBNF = r"""
+root   ::= "{" ws "\"standardized_program\"" ws ":" ws string ws "," ws "\"standardized_university\"" ws ":" ws string ws "}"
+string ::= "\"" char{0,120} "\""
+char   ::= [^"\\\x00-\x1f] | "\\" (["\\/bfnrt] | "u" [0-9a-fA-F]{4})
+ws     ::= [ \t\n]{0,2}
+"""
+
 # ---------------- Canonical lists + abbrev maps ----------------
 def _read_lines(path: str) -> List[str]:
     """Read non-empty, stripped lines from a file (UTF-8)."""
@@ -49,6 +111,10 @@ def _read_lines(path: str) -> List[str]:
 CANON_UNIS = _read_lines(CANON_UNIS_PATH)
 CANON_PROGS = _read_lines(CANON_PROGS_PATH)
 
+# Indexed fuzzy matchers: same answers as difflib over the full lists, far fewer ratios
+UNI_INDEX = FuzzyIndex(CANON_UNIS)
+PROG_INDEX = FuzzyIndex(CANON_PROGS)
+
 ABBREV_UNI: Dict[str, str] = {
     r"(?i)^mcg(\.|ill)?$": "McGill University",
     r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
@@ -110,16 +176,235 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+# ---------------- Model + prompt-prefix KV cache ----------------
+def _prefix_messages() -> List[Dict[str, str]]:
+    """System prompt + few-shot turns shared by every row."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for x_in, x_out in FEW_SHOTS:
+        messages.append(
+            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
+        )
+        messages.append(
+            {
+                "role": "assistant",
+                "content": json.dumps(x_out, ensure_ascii=False),
+            }
+        )
+    return messages
+
+
+def _build_messages(program_text: str) -> List[Dict[str, str]]:
+    """Full chat for one row: shared prefix plus the row's user turn."""
+    return _prefix_messages() + [
+        {
+            "role": "user",
+            "content": json.dumps({"program": program_text}, ensure_ascii=False),
+        }
+    ]
+
+
+class PrefixCache:
+    """KV-cache snapshot of the prompt prefix shared by every row.
+
+    llama-cpp-python only evaluates the part of a prompt that differs from
+    the tokens already in the context. Priming renders two throwaway rows,
+    takes their common token prefix (system prompt, few-shots and the fixed
+    start of the user turn, whatever the chat template), cuts the context
+    back to it and saves the model state. Before each row, that state is
+    restored if the context no longer starts with the prefix, so only the
+    per-row suffix is evaluated.
+
+    Savings are measured, not assumed: after each row the prompt is compared
+    with the context it started from, and the matching leading tokens are the
+    ones llama.cpp did not evaluate again.
+    """
+
+    def __init__(self) -> None:
+        self.prefix_ids: List[int] = []
+        self.state: Any = None
+        self.rows = 0
+        self.restores = 0
+        self.prompt_tokens = 0
+        self.prompt_tokens_saved = 0
+        self.row_seconds = 0.0
+
+    def prime(self, llm: Llama) -> None:
+        """Find the shared prefix tokens and snapshot the state holding them."""
+        probes = []
+        for probe in ("a", "b"):
+            llm.reset()
+            llm.create_chat_completion(
+                messages=_build_messages(probe), temperature=0.0, max_tokens=1
+            )
+            probes.append([int(t) for t in llm.input_ids])
+        common = 0
+        for left, right in zip(*probes):
+            if left != right:
+                break
+            common += 1
+        # The second probe already evaluated the prefix; keep just that part
+        llm.n_tokens = min(common, llm.n_tokens)
+        self.prefix_ids = [int(t) for t in llm.input_ids[: llm.n_tokens]]
+        self.state = llm.save_state()
+
+    def prepare(self, llm: Llama) -> List[int]:
+        """Restore the prefix snapshot unless the context already starts with it.
+
+        Returns the tokens in the context the next completion starts from.
+        """
+        if self.state is not None:
+            size = len(self.prefix_ids)
+            if llm.n_tokens < size or [int(t) for t in llm.input_ids[:size]] != self.prefix_ids:
+                llm.load_state(self.state)
+                self.restores += 1
+        return [int(t) for t in llm.input_ids]
+
+    def record(self, llm: Llama, context: List[int], prompt_tokens: int, seconds: float) -> None:
+        """Account one completed row; ``context`` is what ``prepare`` returned."""
+        self.rows += 1
+        self.prompt_tokens += prompt_tokens
+        self.row_seconds += seconds
+        # llama.cpp keeps the longest common prefix but always re-evaluates the last prompt token
+        prompt = llm.input_ids[: max(prompt_tokens - 1, 0)]
+        reused = 0
+        for cached, wanted in zip(context, prompt):
+            if cached != int(wanted):
+                break
+            reused += 1
+        self.prompt_tokens_saved += reused
+
+    # Counters that add up across worker processes (see WorkerPool.model_counters)
+    SUMMED = ("rows", "restores", "prompt_tokens", "prompt_tokens_saved", "row_seconds")
+
+    def counters(self) -> Dict[str, Any]:
+        """Raw counters behind :meth:`stats`, cheap to send from a worker."""
+        counters: Dict[str, Any] = {name: getattr(self, name) for name in self.SUMMED}
+        counters.update({"enabled": self.state is not None, "prefix_tokens": len(self.prefix_ids)})
+        return counters
+
+    @staticmethod
+    def summarize(counters: Dict[str, Any]) -> Dict[str, Any]:
+        """Prefix size, prompt-eval tokens saved and mean latency per row."""
+        rows = counters["rows"]
+        return {
+            "enabled": counters["enabled"],
+            "prefix_tokens": counters["prefix_tokens"],
+            "rows": rows,
+            "restores": counters["restores"],
+            "prompt_tokens": counters["prompt_tokens"],
+            "prompt_tokens_saved": counters["prompt_tokens_saved"],
+            "prompt_tokens_evaluated": counters["prompt_tokens"] - counters["prompt_tokens_saved"],
+            "mean_row_ms": round(1000.0 * counters["row_seconds"] / rows, 2) if rows else 0.0,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Prefix size, prompt-eval tokens saved and mean latency per row."""
+        return self.summarize(self.counters())
+
+
+class DecodeStats:
+    """Generated tokens per row and how often the answer failed to parse."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.completion_tokens = 0
+        self.fallbacks = 0
+
+    def record(self, completion_tokens: int, fallback: bool) -> None:
+        with self._lock:
+            self.rows += 1
+            self.completion_tokens += completion_tokens
+            self.fallbacks += int(fallback)
+
+    # Counters that add up across worker processes (see WorkerPool.model_counters)
+    SUMMED = ("rows", "completion_tokens", "fallbacks")
+
+    def counters(self) -> Dict[str, Any]:
+        """Raw counters behind :meth:`stats`, cheap to send from a worker."""
+        with self._lock:
+            return {name: getattr(self, name) for name in self.SUMMED}
+
+    @staticmethod
+    def summarize(counters: Dict[str, Any]) -> Dict[str, Any]:
+        rows = counters["rows"]
+        return {
+            "json_grammar": JSON_GRAMMAR,
+            "rows": rows,
+            "completion_tokens": counters["completion_tokens"],
+            "mean_completion_tokens": round(counters["completion_tokens"] / rows, 2)
+            if rows
+            else 0.0,
+            "fallbacks": counters["fallbacks"],
+            "fallback_rate": round(counters["fallbacks"] / rows, 4) if rows else 0.0,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return self.summarize(self.counters())
+
+
+class Startup:
+    """Model readiness and a timing breakdown of how startup got there."""
+
+    def __init__(self) -> None:
+        self.status = "cold"  # cold -> loading -> ready | failed
+        self.error: str | None = None
+        self.phases: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self.ready_after: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one startup step."""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - began, 3)
+
+    def mark_ready(self) -> None:
+        self.status = "ready"
+        self.ready_after = round(time.perf_counter() - self._started, 3)
+        steps = ", ".join(f"{name} {secs:.2f}s" for name, secs in self.phases.items())
+        print(f"[startup] ready {self.ready_after:.2f}s after boot ({steps})", file=sys.stderr)
+
+    def mark_failed(self, exc: BaseException) -> None:
+        self.status = "failed"
+        self.error = f"{type(exc).__name__}: {exc}"
+        print(f"[startup] model warm-up failed: {self.error}", file=sys.stderr)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "phases_s": dict(self.phases),
+            "ready_after_s": self.ready_after,
+            "error": self.error,
+        }
+
+
 _LLM: Llama | None = None
+_MODEL_LOCK = threading.RLock()  # one completion at a time per Llama
+_STARTUP = Startup()
+_PREFIX = PrefixCache()
+_DECODE = DecodeStats()
+_GRAMMAR: LlamaGrammar | None = None
 
 
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
-    global _LLM
-    if _LLM is not None:
-        return _LLM
+def _answer_grammar() -> LlamaGrammar | None:
+    """Parsed ANSWER_GBNF (once), or None when JSON_GRAMMAR is off."""
+    global _GRAMMAR
+    if LLM_BACKEND == "stub":
+        return None  # the stub always answers with the exact object
+    if JSON_GRAMMAR and _GRAMMAR is None:
+        _GRAMMAR = LlamaGrammar.from_string(ANSWER_GBNF, verbose=False)
+    return _GRAMMAR if JSON_GRAMMAR else None
+
 
-    model_path = hf_hub_download(
+def _model_path() -> str:
+    """Download (or reuse) the GGUF file and return its local path."""
+    if LLM_BACKEND == "stub":
+        return "stub"
+    return hf_hub_download(
         repo_id=MODEL_REPO,
         filename=MODEL_FILE,
         local_dir="models",
@@ -127,14 +412,39 @@ def _load_llm() -> Llama:
         force_filename=MODEL_FILE,
     )
 
-    _LLM = Llama(
-        model_path=model_path,
-        n_ctx=N_CTX,
-        n_threads=N_THREADS,
-        n_gpu_layers=N_GPU_LAYERS,
-        verbose=False,
-    )
-    return _LLM
+
+def _load_llm() -> Llama:
+    """Download (or reuse) the GGUF file and initialize llama.cpp."""
+    global _LLM
+    with _MODEL_LOCK:
+        if _LLM is not None:
+            return _LLM
+
+        _STARTUP.status = "loading"
+        with _STARTUP.phase("download_check"):
+            model_path = _model_path()
+        with _STARTUP.phase("load"):
+            if LLM_BACKEND == "stub":
+                from stub_llama import StubLlama  # pylint: disable=import-outside-toplevel
+
+                backend: Any = StubLlama
+            elif Llama is None:
+                raise RuntimeError("llama-cpp-python is not installed (or set LLM_BACKEND=stub)")
+            else:
+                backend = Llama
+            llm = backend(
+                model_path=model_path,
+                n_ctx=N_CTX,
+                n_threads=N_THREADS,
+                n_gpu_layers=N_GPU_LAYERS,
+                use_mmap=True,  # worker processes share the weights via the page cache
+                verbose=False,
+            )
+        if PREFIX_CACHE:
+            with _STARTUP.phase("prefix_prime"):
+                _PREFIX.prime(llm)
+        _LLM = llm
+        return _LLM
 
 
 def _split_fallback(text: str) -> Tuple[str, str]:
@@ -162,27 +472,28 @@ def _split_fallback(text: str) -> Tuple[str, str]:
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
-        return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+def _score_match(name: str, index: FuzzyIndex, cutoff: float) -> Tuple[str, float]:
+    """Map name onto the indexed names; return (name or match, confidence).
 
+    Exact canonical hits score 1.0, fuzzy hits their difflib ratio and
+    misses 0.0 (the input is returned unchanged).
+    """
+    match, score = index.best_match(name, cutoff=cutoff)
+    if match is None:
+        return name, 0.0
+    return match, score
 
-def _post_normalize_program(prog: str) -> str:
-    """Apply common fixes, title case, then canonical/fuzzy mapping."""
+
+def _normalize_program_scored(prog: str) -> Tuple[str, float]:
+    """Apply common fixes, title case, then canonical/fuzzy mapping, with a score."""
     p = (prog or "").strip()
     p = COMMON_PROG_FIXES.get(p, p)
     p = p.title()
-    if p in CANON_PROGS:
-        return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
-    return match or p
+    return _score_match(p, PROG_INDEX, cutoff=0.84)
 
 
-def _post_normalize_university(uni: str) -> str:
-    """Expand abbreviations, apply common fixes, capitalization, and canonical map."""
+def _normalize_university_scored(uni: str) -> Tuple[str, float]:
+    """Expand abbreviations, apply fixes and capitalization, canonical map, with a score."""
     u = (uni or "").strip()
 
     # Abbreviations
@@ -199,42 +510,299 @@ def _post_normalize_university(uni: str) -> str:
         u = re.sub(r"\bOf\b", "of", u.title())
 
     # Canonical or fuzzy map
-    if u in CANON_UNIS:
-        return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
-    return match or u or "Unknown"
+    match, score = _score_match(u, UNI_INDEX, cutoff=0.86)
+    return match or "Unknown", score
+
+
+def _post_normalize_program(prog: str) -> str:
+    """Apply common fixes, title case, then canonical/fuzzy mapping."""
+    return _normalize_program_scored(prog)[0]
+
+
+def _post_normalize_university(uni: str) -> str:
+    """Expand abbreviations, apply common fixes, capitalization, and canonical map."""
+    return _normalize_university_scored(uni)[0]
+
+
+# ---------------- Persistent memo cache ----------------
+def _memo_version() -> str:
+    """Fingerprint of everything that shapes an answer: model, prompt, decoding, lists, fixes."""
+    digest = hashlib.sha256()
+    for part in (
+        MODEL_REPO,
+        MODEL_FILE,
+        SYSTEM_PROMPT,
+        json.dumps(FEW_SHOTS, sort_keys=True),
+        ANSWER_GBNF if JSON_GRAMMAR else f"free-text:{MAX_TOKENS}",
+        json.dumps([ABBREV_UNI, COMMON_UNI_FIXES, COMMON_PROG_FIXES], sort_keys=True),
+        "\n".join(CANON_UNIS),
+        "\n".join(CANON_PROGS),
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _memo_key(program_text: str) -> str:
+    """Hash of the whitespace-normalized program string."""
+    normalized = re.sub(r"\s+", " ", program_text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class MemoCache:
+    """Memoize deterministic (temperature 0) LLM answers across requests and restarts.
+
+    Lookups check a bounded in-process LRU first, then an SQLite table keyed
+    by (version, input hash); disk hits are promoted into the LRU. The
+    version fingerprints MODEL_REPO/MODEL_FILE, the prompt, the fix tables
+    and the canonical lists, so changing any of them misses every old entry.
+    Rows from other versions are deleted when the store is first opened.
+    """
+
+    def __init__(self, path: str, max_entries: int, version: str, enabled: bool = True) -> None:
+        self.path = path
+        self.max_entries = max(0, max_entries)
+        self.version = version
+        self.enabled = enabled
+        self._lru: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.hits: Counter = Counter()
+        self.misses = 0
+        self.pruned = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open (and create) the store lazily; drop entries from other versions."""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                " version TEXT NOT NULL, key TEXT NOT NULL, result TEXT NOT NULL,"
+                " PRIMARY KEY (version, key))"
+            )
+            self.pruned = db.execute(
+                "DELETE FROM memo WHERE version != ?", (self.version,)
+            ).rowcount
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _remember(self, key: str, result: Dict[str, str]) -> None:
+        """Insert into the LRU, evicting the least recently used entries."""
+        self._lru[key] = result
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, program_text: str) -> Tuple[Dict[str, str] | None, str]:
+        """Cached result and the level it came from (memory, disk or miss)."""
+        if not self.enabled:
+            return None, "miss"
+        key = _memo_key(program_text)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.hits["memory"] += 1
+                return dict(self._lru[key]), "memory"
+            row = self._connect().execute(
+                "SELECT result FROM memo WHERE version = ? AND key = ?",
+                (self.version, key),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, "miss"
+            result = json.loads(row[0])
+            self._remember(key, result)
+            self.hits["disk"] += 1
+            return dict(result), "disk"
+
+    def put(self, program_text: str, result: Dict[str, str]) -> None:
+        """Store a result in both levels."""
+        if not self.enabled:
+            return
+        key = _memo_key(program_text)
+        with self._lock:
+            self._remember(key, dict(result))
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO memo (version, key, result) VALUES (?, ?, ?)",
+                (self.version, key, json.dumps(result, ensure_ascii=False)),
+            )
+            db.commit()
+
+    def lookup(
+        self, program_text: str, compute: Callable[[str], Dict[str, str]]
+    ) -> Tuple[Dict[str, str], bool]:
+        """Return (result, hit), calling compute and storing its answer on a miss."""
+        if not self.enabled:
+            return compute(program_text), False
+        cached, _ = self.get(program_text)
+        if cached is not None:
+            return cached, True
+        result = compute(program_text)
+        self.put(program_text, result)
+        return result, False
+
+    def clear(self) -> None:
+        """Drop every entry from both levels."""
+        with self._lock:
+            self._lru.clear()
+            if not self.enabled:
+                return
+            db = self._connect()
+            db.execute("DELETE FROM memo")
+            db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio per level plus entry counts and the on-disk size."""
+        with self._lock:
+            hits = sum(self.hits.values())
+            lookups = hits + self.misses
+            disk_entries = 0
+            if self.enabled:
+                disk_entries = self._connect().execute(
+                    "SELECT COUNT(*) FROM memo WHERE version = ?", (self.version,)
+                ).fetchone()[0]
+            return {
+                "enabled": self.enabled,
+                "version": self.version,
+                "path": self.path,
+                "lookups": lookups,
+                "hits": {"memory": self.hits["memory"], "disk": self.hits["disk"]},
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._lru),
+                "max_memory_entries": self.max_entries,
+                "disk_entries": disk_entries,
+                "disk_bytes": os.path.getsize(self.path)
+                if self.enabled and os.path.exists(self.path)
+                else 0,
+                "pruned_stale_entries": self.pruned,
+            }
+
+
+_MEMO = MemoCache(MEMO_PATH, MEMO_MAX_ENTRIES, _memo_version(), enabled=MEMO_CACHE)
+
+
+# ---------------- Confidence-tiered routing ----------------
+class TierStats:
+    """Hit counts and cumulative latency per routing tier."""
+
+    TIERS = ("exact", "fuzzy", "memo", "llm")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.seconds: Counter = Counter()
+
+    def record(self, tier: str, seconds: float) -> None:
+        with self._lock:
+            self.hits[tier] += 1
+            self.seconds[tier] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.hits.values())
+            return {
+                "rules_min_confidence": RULES_MIN_CONFIDENCE,
+                "tiers": {
+                    tier: {
+                        "hits": self.hits[tier],
+                        "share": round(self.hits[tier] / total, 4) if total else 0.0,
+                        "mean_ms": round(1000.0 * self.seconds[tier] / self.hits[tier], 3)
+                        if self.hits[tier]
+                        else 0.0,
+                    }
+                    for tier in self.TIERS
+                },
+            }
+
+
+_TIERS = TierStats()
+
+
+def _rules_standardize(program_text: str) -> Tuple[Dict[str, str], float, str]:
+    """Standardize with rules only: split, expand, canonical/fuzzy map.
+
+    Returns:
+        (result, confidence, tier) where confidence is the lower of the
+        program and university match scores and tier is ``"exact"`` when
+        both are canonical hits, else ``"fuzzy"``.
+    """
+    prog, uni = _split_fallback(program_text)
+    std_prog, prog_score = _normalize_program_scored(prog)
+    std_uni, uni_score = _normalize_university_scored(uni)
+    confidence = min(prog_score, uni_score)
+    result = {
+        "standardized_program": std_prog,
+        "standardized_university": std_uni,
+        "source": "rules",
+    }
+    return result, confidence, "exact" if confidence >= 1.0 else "fuzzy"
+
+
+def _standardize_batch(program_texts: List[str]) -> List[Dict[str, str]]:
+    """Route rows: rules when confident, then the memo cache, then the LLM.
+
+    Rows whose rules confidence reaches RULES_MIN_CONFIDENCE are returned
+    immediately with ``source: rules``; only ambiguous rows pay for model
+    inference, and only once per distinct string thanks to the memo cache.
+    The remaining rows go to the model together, so with ``--workers K``
+    they run on K processes at once. Tier hits and latency are recorded for
+    ``GET /metrics`` (model latency is wall time shared across the rows).
+    """
+    results: List[Dict[str, str] | None] = []
+    misses: List[int] = []
+    for idx, text in enumerate(program_texts):
+        started = time.perf_counter()
+        result, confidence, tier = _rules_standardize(text)
+        if confidence < RULES_MIN_CONFIDENCE:
+            result, tier = _MEMO.get(text)[0], "memo"
+        if result is None:
+            misses.append(idx)
+        else:
+            _TIERS.record(tier, time.perf_counter() - started)
+        results.append(result)
+
+    if misses:
+        started = time.perf_counter()
+        answers = _llm_map([program_texts[idx] for idx in misses])
+        per_row = (time.perf_counter() - started) / len(misses)
+        for idx, answer in zip(misses, answers):
+            _MEMO.put(program_texts[idx], answer)
+            _TIERS.record("llm", per_row)
+            results[idx] = answer
+    return results  # type: ignore[return-value]
+
+
+def _standardize_text(program_text: str) -> Dict[str, str]:
+    """Route one row (see ``_standardize_batch``)."""
+    return _standardize_batch([program_text])[0]
 
 
 def _call_llm(program_text: str) -> Dict[str, str]:
     """Query the tiny LLM and return standardized fields."""
     llm = _load_llm()
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    for x_in, x_out in FEW_SHOTS:
-        messages.append(
-            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
+    with _MODEL_LOCK:
+        context = _PREFIX.prepare(llm)
+        started = time.perf_counter()
+        out = llm.create_chat_completion(
+            messages=_build_messages(program_text),
+            temperature=0.0,
+            max_tokens=MAX_TOKENS,
+            top_p=1.0,
+            grammar=_answer_grammar(),
         )
-        messages.append(
-            {
-                "role": "assistant",
-                "content": json.dumps(x_out, ensure_ascii=False),
-            }
-        )
-    messages.append(
-        {
-            "role": "user",
-            "content": json.dumps({"program": program_text}, ensure_ascii=False),
-        }
-    )
-
-    out = llm.create_chat_completion(
-        messages=messages,
-        temperature=0.0,
-        max_tokens=128,
-        top_p=1.0,
-    )
+        usage = out.get("usage") or {}
+        _PREFIX.record(llm, context, int(usage.get("prompt_tokens", 0)), time.perf_counter() - started)
 
     text = (out["choices"][0]["message"]["content"] or "").strip()
+    fallback = False
     try:
         match = JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
@@ -242,15 +810,375 @@ def _call_llm(program_text: str) -> Dict[str, str]:
         std_uni = str(obj.get("standardized_university", "")).strip()
     except Exception:
         std_prog, std_uni = _split_fallback(program_text)
+        fallback = True
+    _DECODE.record(int(usage.get("completion_tokens", 0)), fallback)
 
     std_prog = _post_normalize_program(std_prog)
     std_uni = _post_normalize_university(std_uni)
     return {
         "standardized_program": std_prog,
         "standardized_university": std_uni,
+        "source": "llm",
     }
 
 
+# ---------------- Multi-process serving ----------------
+_WORKER_READY: Any = None
+
+
+def _init_worker(n_threads: int, ready: Any) -> None:
+    """Process-pool initializer: load this worker's own llama.cpp context."""
+    global N_THREADS, _WORKER_READY
+    N_THREADS = n_threads
+    _WORKER_READY = ready
+    _load_llm()
+
+
+def _worker_pid(_: int) -> int:
+    """Warm-up ping; waits for the other workers so each one answers exactly once."""
+    _WORKER_READY.wait()
+    return os.getpid()
+
+
+def _model_counters() -> Dict[str, Dict[str, Any]]:
+    """This process's decoding and prefix-cache counters."""
+    return {"decoding": _DECODE.counters(), "prefix_cache": _PREFIX.counters()}
+
+
+def _worker_call(program_text: str) -> Tuple[int, Dict[str, str], Dict[str, Dict[str, Any]]]:
+    """Run one row in a worker process; report which worker did it and its counters."""
+    result = _call_llm(program_text)
+    return os.getpid(), result, _model_counters()
+
+
+def _sum_counters(parts: List[Dict[str, Any]], summed: Tuple[str, ...]) -> Dict[str, Any]:
+    """Add up the ``summed`` counters of each part; other fields come from the first."""
+    total = dict(parts[0])
+    for part in parts[1:]:
+        for name in summed:
+            total[name] += part[name]
+    return total
+
+
+class WorkerPool:
+    """K model processes fed from one shared queue.
+
+    Each worker opens its own ``Llama`` (own context, KV cache and prefix
+    snapshot) on the same GGUF file. llama.cpp memory-maps the weights, so
+    the OS page cache holds a single copy for all of them. Rows are queued
+    one at a time and whichever worker is idle picks up the next one.
+    Workers are spawned, not forked, so no llama.cpp or thread state is
+    inherited from the server process.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int = 0) -> None:
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, N_THREADS // self.workers)
+        ctx = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, ctx.Barrier(self.workers)),
+        )
+        self._lock = threading.Lock()
+        self.rows_by_worker: Counter = Counter()
+        # Latest counters each worker sent back (they only ever grow)
+        self.counters_by_worker: Dict[int, Dict[str, Dict[str, Any]]] = {}
+
+    def warm(self) -> List[int]:
+        """Start every worker and load its model; return the worker pids."""
+        _model_path()  # download once here rather than racing in K workers
+        futures = [self._executor.submit(_worker_pid, i) for i in range(self.workers)]
+        return sorted({f.result() for f in futures})
+
+    def map(self, program_texts: List[str]) -> List[Dict[str, str]]:
+        """Run rows across the workers, results in input order."""
+        results = []
+        for pid, result, counters in self._executor.map(_worker_call, program_texts):
+            with self._lock:
+                self.rows_by_worker[pid] += 1
+                latest = self.counters_by_worker.get(pid)
+                if latest is None or counters["decoding"]["rows"] >= latest["decoding"]["rows"]:
+                    self.counters_by_worker[pid] = counters
+            results.append(result)
+        return results
+
+    def model_counters(self) -> Dict[str, Dict[str, Any]]:
+        """Decoding and prefix-cache counters summed over every worker."""
+        with self._lock:
+            parts = list(self.counters_by_worker.values())
+        if not parts:
+            return _model_counters()
+        return {
+            "decoding": _sum_counters([p["decoding"] for p in parts], DecodeStats.SUMMED),
+            "prefix_cache": _sum_counters([p["prefix_cache"] for p in parts], PrefixCache.SUMMED),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker count, threads each, and how many rows each worker ran."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "rows_by_worker": {str(pid): n for pid, n in self.rows_by_worker.items()},
+            }
+
+
+_POOL: WorkerPool | None = None
+
+
+def _llm_map(program_texts: List[str]) -> List[Dict[str, str]]:
+    """Run rows through the model: on the worker pool if started, else in-process."""
+    if _POOL is not None:
+        return _POOL.map(program_texts)
+    return [_call_llm(text) for text in program_texts]
+
+
+# ---------------- Startup warm-up ----------------
+WARM_UP_TEXT = "Mathematics, University Of British Columbia"
+
+
+def _warm_up() -> None:
+    """Load the model (or start the workers) and run one dummy completion.
+
+    Runs in a background thread at server boot so the first real request
+    does not pay for the download check, GGUF load and first inference.
+    ``GET /ready`` turns 200 once this finishes.
+    """
+    try:
+        if _POOL is not None:
+            with _STARTUP.phase("workers"):
+                _POOL.warm()
+        else:
+            llm = _load_llm()
+            with _MODEL_LOCK, _STARTUP.phase("warm_up"):
+                llm.create_chat_completion(
+                    messages=_build_messages(WARM_UP_TEXT),
+                    temperature=0.0,
+                    max_tokens=MAX_TOKENS,
+                    grammar=_answer_grammar(),
+                )
+        _STARTUP.mark_ready()
+    except Exception as exc:  # reported by /ready; requests retry the load
+        _STARTUP.mark_failed(exc)
+
+
+# ---------------- Cross-request micro-batching ----------------
+def _bucket(n: int) -> str:
+    """Power-of-two histogram bucket label for n (0, 1, 2-3, 4-7, ...)."""
+    if n < 2:
+        return str(n)
+    lo = 1 << (n.bit_length() - 1)
+    return f"{lo}-{2 * lo - 1}"
+
+
+class Overloaded(RuntimeError):
+    """Raised when admitting more rows would exceed the pending-row limit."""
+
+    def __init__(self, pending: int, retry_after: int) -> None:
+        super().__init__(f"{pending} rows pending; retry in {retry_after}s")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a row's deadline passes before it was processed."""
+
+
+class _PendingRow:
+    """One row waiting in the batch queue for its result."""
+
+    __slots__ = ("program_text", "deadline", "done", "result", "error")
+
+    def __init__(self, program_text: str, deadline: float | None = None) -> None:
+        self.program_text = program_text
+        self.deadline = deadline  # time.monotonic() value; None waits forever
+        self.done = threading.Event()
+        self.result: Dict[str, str] | None = None
+        self.error: BaseException | None = None
+
+
+class MicroBatcher:
+    """Queue rows from all in-flight requests and run them on one worker.
+
+    The worker takes the first queued row, then keeps collecting until it has
+    ``max_batch_size`` rows or ``max_wait_s`` has passed, and runs the batch
+    through ``batch_fn`` (a list of program strings -> list of results).
+    Identical strings in a batch are inferred once. The single worker also
+    keeps concurrent requests from using the one ``Llama`` instance at once.
+
+    Admission control: ``stream(..., admit=True)`` refuses rows with
+    :class:`Overloaded` when the pending count (queued + in flight) would
+    pass ``max_pending``; its ``retry_after`` is the backlog divided by the
+    recent throughput. Rows carry an optional deadline; the worker drops
+    rows whose deadline has passed instead of processing them, and waiters
+    give up at their deadline with :class:`DeadlineExceeded`.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str]], List[Dict[str, str]]],
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_wait_s: float = BATCH_MAX_WAIT_MS / 1000.0,
+        max_pending: int = MAX_PENDING_ROWS,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_s)
+        self.max_pending = max(1, max_pending)
+        self._queue: "queue.Queue[_PendingRow]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self.batches = 0
+        self.rows = 0
+        self.batch_size_hist: Counter = Counter()
+        self.queue_depth_hist: Counter = Counter()
+        self.pending = 0
+        self.rejected = 0
+        self.expired = 0
+        self.rows_per_s = 0.0  # EWMA of per-batch throughput
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="micro-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, texts: List[str]) -> List[Dict[str, str]]:
+        """Queue texts, block until all are processed, return results in order."""
+        return list(self.stream(texts))
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained (1..120)."""
+        with self._lock:
+            if self.rows_per_s <= 0:
+                return 1
+            return min(120, max(1, math.ceil(self.pending / self.rows_per_s)))
+
+    def stream(
+        self, texts: List[str], deadline: float | None = None, admit: bool = False
+    ) -> Iterator[Dict[str, str]]:
+        """Queue texts now; the returned iterator yields results in order as they finish.
+
+        Args:
+            texts: Program strings.
+            deadline: ``time.monotonic()`` after which unprocessed rows are
+                dropped and the iterator raises DeadlineExceeded.
+            admit: Enforce ``max_pending`` (raise Overloaded instead of queueing).
+        """
+        pending = [_PendingRow(t, deadline) for t in texts]
+        with self._lock:
+            if admit and pending and self.pending + len(pending) > self.max_pending:
+                self.rejected += 1
+                backlog = self.pending
+            else:
+                backlog = -1
+                self.pending += len(pending)
+        if backlog >= 0:
+            raise Overloaded(backlog, self.retry_after())
+        if pending:
+            self._ensure_worker()
+        for item in pending:
+            self._queue.put(item)
+
+        def results() -> Iterator[Dict[str, str]]:
+            for item in pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not item.done.wait(timeout):
+                    raise DeadlineExceeded("request deadline passed while rows were queued")
+                if item.error is not None:
+                    raise item.error
+                result, item.result = item.result, None  # drop it once handed out
+                yield result  # type: ignore[misc]
+
+        return results()
+
+    def _collect(self) -> List[_PendingRow]:
+        """Block for one row, then gather more until size or time runs out."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            now = time.monotonic()
+            live: List[_PendingRow] = []
+            expired: List[_PendingRow] = []
+            for item in batch:
+                (live if item.deadline is None or item.deadline > now else expired).append(item)
+            for item in expired:  # the client has given up; don't spend the model on it
+                item.error = DeadlineExceeded("row dropped after its deadline")
+                item.done.set()
+            with self._lock:
+                self.expired += len(expired)
+                self.pending -= len(expired)
+                if live:
+                    self.batches += 1
+                    self.rows += len(live)
+                    self.batch_size_hist[_bucket(len(live))] += 1
+                    self.queue_depth_hist[_bucket(self._queue.qsize())] += 1
+            if not live:
+                continue
+            unique = list(dict.fromkeys(item.program_text for item in live))
+            started = time.perf_counter()
+            try:
+                by_text = dict(zip(unique, self.batch_fn(unique)))
+                for item in live:
+                    item.result = by_text[item.program_text]
+            except Exception as exc:  # surface the failure to every waiter
+                for item in live:
+                    item.error = exc
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.pending -= len(live)
+                if elapsed > 0:
+                    sample = len(live) / elapsed
+                    self.rows_per_s = sample if not self.rows_per_s else 0.8 * self.rows_per_s + 0.2 * sample
+            for item in live:
+                item.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth now plus batch-size and queue-depth histograms."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self.batches,
+                "rows": self.rows,
+                "mean_batch_size": round(self.rows / self.batches, 2)
+                if self.batches
+                else 0.0,
+                "batch_size_hist": dict(self.batch_size_hist),
+                "queue_depth_hist": dict(self.queue_depth_hist),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_s * 1000.0,
+                "pending_rows": self.pending,
+                "max_pending_rows": self.max_pending,
+                "rejected_requests": self.rejected,
+                "expired_rows": self.expired,
+                "rows_per_s": round(self.rows_per_s, 2),
+            }
+
+
+_BATCHER = MicroBatcher(_standardize_batch)
+
+
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     """Accept either a list of rows or {'rows': [...]}."""
     if isinstance(payload, list):
@@ -266,51 +1194,525 @@ def health() -> Any:
     return jsonify({"ok": True})
 
 
+@app.get("/ready")
+def ready() -> Any:
+    """Readiness: 200 once the model is loaded and warmed, else 503."""
+    state = _STARTUP.stats()
+    if _STARTUP.status != "ready" and _LLM is not None and _POOL is None:
+        state["status"] = "ready"  # loaded lazily by a request, no warm-up run
+    is_ready = state["status"] == "ready"
+    return jsonify({"ready": is_ready, "startup": state}), 200 if is_ready else 503
+
+
+@app.get("/metrics")
+def metrics() -> Any:
+    """Batching, decoding, prefix-cache, routing-tier and worker-pool metrics.
+
+    With ``--workers``, decoding and prefix-cache figures are summed over
+    the counters each worker returns with its results.
+    """
+    counters = _POOL.model_counters() if _POOL is not None else _model_counters()
+    return jsonify(
+        {
+            "batching": _BATCHER.stats(),
+            "decoding": DecodeStats.summarize(counters["decoding"]),
+            "prefix_cache": PrefixCache.summarize(counters["prefix_cache"]),
+            "routing": _TIERS.stats(),
+            "workers": _POOL.stats() if _POOL is not None else {"workers": 0},
+        }
+    )
+
+
+@app.get("/admin/cache")
+def cache_stats() -> Any:
+    """Memo cache hit ratio and size."""
+    return jsonify(_MEMO.stats())
+
+
+@app.delete("/admin/cache")
+def cache_clear() -> Any:
+    """Empty the memo cache (both levels)."""
+    _MEMO.clear()
+    return jsonify(_MEMO.stats())
+
+
+def _apply_result(row: Dict[str, Any], result: Dict[str, str]) -> Dict[str, Any]:
+    """Attach the standardized fields to a row."""
+    row["llm-generated-program"] = result["standardized_program"]
+    row["llm-generated-university"] = result["standardized_university"]
+    row["llm-source"] = result["source"]
+    return row
+
+
+NDJSON = "application/x-ndjson"
+
+
 @app.post("/standardize")
 def standardize() -> Any:
-    """Standardize rows from an HTTP request and return JSON."""
+    """Standardize rows from an HTTP request and return JSON.
+
+    With ``Accept: application/x-ndjson`` the rows are streamed back one
+    JSON object per line (chunked) as each is standardized, in input order,
+    instead of a single ``{"rows": [...]}`` document at the end.
+
+    Answers 503 with ``Retry-After`` when the rows would push the pending
+    backlog past MAX_PENDING_ROWS, and 504 when the deadline
+    (REQUEST_DEADLINE_S, or a shorter ``X-Request-Timeout``) passes first.
+    """
     payload = request.get_json(force=True, silent=True)
-    rows = _normalize_input(payload)
+    rows = [row or {} for row in _normalize_input(payload)]
+    if len(rows) > _BATCHER.max_pending:
+        return jsonify({"error": f"at most {_BATCHER.max_pending} rows per request"}), 413
 
-    out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = result["standardized_university"]
-        out.append(row)
+    timeout = REQUEST_DEADLINE_S
+    try:
+        timeout = min(timeout, float(request.headers.get("X-Request-Timeout", timeout)))
+    except ValueError:
+        pass
+    try:
+        results = _BATCHER.stream(
+            [row.get("program") or "" for row in rows],
+            deadline=time.monotonic() + timeout,
+            admit=True,
+        )
+    except Overloaded as exc:
+        return (
+            jsonify({"error": "overloaded", "pending_rows": exc.pending, "retry_after_s": exc.retry_after}),
+            503,
+            {"Retry-After": str(exc.retry_after)},
+        )
+
+    if request.accept_mimetypes.best_match([NDJSON, "application/json"]) == NDJSON:
+        def generate() -> Iterator[str]:
+            try:
+                for idx, result in enumerate(results):
+                    yield json.dumps(_apply_result(rows[idx], result), ensure_ascii=False) + "\n"
+                    rows[idx] = {}  # release each row once written
+            except DeadlineExceeded as exc:  # headers are gone; end with an error line
+                yield json.dumps({"error": str(exc)}) + "\n"
 
+        return Response(generate(), mimetype=NDJSON)
+
+    try:
+        out = [_apply_result(row, result) for row, result in zip(rows, results)]
+    except DeadlineExceeded as exc:
+        return jsonify({"error": str(exc)}), 504
     return jsonify({"rows": out})
 
 
+# ---------------- Streaming input ----------------
+def _iter_json_list(f: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON list, reading the file in chunks."""
+    decode = codecs.getincrementaldecoder("utf-8-sig")().decode
+    decoder = json.JSONDecoder()
+    buf, pos, eof, opened = "", 0, False, False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON list")
+                opened, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if eof or (end < len(buf) and buf[end] in ",] \t\r\n"):
+                    yield obj
+                    pos = end
+                    continue
+        if eof:
+            raise ValueError("unexpected end of JSON list")
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf, pos = buf[pos:] + decode(chunk, final=eof), 0
+
+
+class RowReader:
+    """Iterate rows from a file without loading it all; tracks how much was read.
+
+    ``.jsonl`` / ``.ndjson`` files are read line by line and a top-level
+    JSON list is parsed element by element. A ``{'rows': [...]}`` document
+    is the one shape that is still loaded whole.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._f: BinaryIO | None = None
+
+    @property
+    def fraction(self) -> float:
+        """Share of the file consumed so far (0..1)."""
+        if self._f is None:
+            return 0.0
+        if self._f.closed or not self.size:
+            return 1.0
+        return min(1.0, self._f.tell() / self.size)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            self._f = f
+            if self.path.endswith((".jsonl", ".ndjson")):
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+            head = f.read(4096).lstrip(codecs.BOM_UTF8).lstrip()
+            f.seek(0)
+            if head.startswith(b"["):
+                yield from _iter_json_list(f)
+            else:
+                yield from _normalize_input(json.load(f))
+
+
+def _iter_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Rows from JSON Lines, a JSON list or {'rows': [...]} (see ``RowReader``)."""
+    return iter(RowReader(path))
+
+
+# ---------------- Bulk jobs ----------------
+
+
+def _write_json_atomic(path: str, obj: Any) -> None:
+    """Write JSON via a temp file + rename so readers never see half a file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class JobStore:
+    """Bulk standardization jobs persisted on disk and run in the background.
+
+    Each job lives in ``<root>/<id>/``: ``job.json`` (state), ``input.jsonl``
+    and ``results.jsonl``. One runner thread works through queued jobs in
+    order, feeding rows to the shared micro-batcher in chunks, so jobs get
+    the same rules routing, memo cache and model workers as live requests.
+    ``results.jsonl`` is appended and flushed per chunk and is the source of
+    truth for progress: after a restart, unfinished jobs are re-queued and
+    continue after the last complete result line.
+    """
+
+    ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+    def __init__(self, root: str, chunk_size: int = BATCH_MAX_SIZE) -> None:
+        self.root = root
+        self.chunk_size = max(1, chunk_size)
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._runner: threading.Thread | None = None
+        self._rates: Dict[str, float] = {}
+
+    def _dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self._dir(job_id), "job.json")
+
+    def results_path(self, job_id: str) -> str:
+        return os.path.join(self._dir(job_id), "results.jsonl")
+
+    def _load(self, job_id: str) -> Dict[str, Any] | None:
+        if not self.ID_RE.match(job_id or ""):
+            return None
+        try:
+            with open(self._state_path(job_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _save(self, job: Dict[str, Any]) -> None:
+        _write_json_atomic(self._state_path(job["id"]), job)
+
+    def start(self) -> None:
+        """Start the runner once, re-queueing jobs left unfinished by a restart."""
+        with self._lock:
+            if self._runner is not None:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            unfinished = []
+            for job_id in os.listdir(self.root):
+                job = self._load(job_id)
+                if job and job["status"] in ("queued", "running"):
+                    unfinished.append(job)
+            for job in sorted(unfinished, key=lambda j: j["created"]):
+                self._queue.put(job["id"])
+            self._runner = threading.Thread(target=self._run_loop, name="jobs", daemon=True)
+            self._runner.start()
+
+    def create(self, rows: List[Dict[str, Any]] | None = None, path: str | None = None) -> Dict[str, Any]:
+        """Persist a new job for uploaded rows or a server-side file and queue it."""
+        self.start()
+        job_id = uuid.uuid4().hex
+        os.makedirs(self._dir(job_id))
+        job: Dict[str, Any] = {
+            "id": job_id,
+            "status": "queued",
+            "source": path or "upload",
+            "total": None,
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "error": None,
+        }
+        if rows is not None:
+            job["total"] = self._write_input(job_id, rows)
+        self._save(job)
+        self._queue.put(job_id)
+        return self.status(job_id)  # type: ignore[return-value]
+
+    def _write_input(self, job_id: str, rows: Iterable[Dict[str, Any]]) -> int:
+        """Copy rows into the job's input.jsonl; return the row count."""
+        path = os.path.join(self._dir(job_id), "input.jsonl")
+        count = 0
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row or {}, ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(path + ".tmp", path)
+        return count
+
+    def _completed_rows(self, job_id: str) -> int:
+        """Count complete result lines, cutting off a line torn by a crash."""
+        path = self.results_path(job_id)
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        return data.count(b"\n", 0, end)
+
+    def status(self, job_id: str) -> Dict[str, Any] | None:
+        """Job state plus progress, rows/sec and ETA."""
+        job = self._load(job_id)
+        if job is None:
+            return None
+        done = job.get("done", 0)
+        rate = self._rates.get(job_id, 0.0)
+        total = job["total"]
+        job.update(
+            {
+                "done": done,
+                "progress": round(done / total, 4) if total else float(job["status"] == "done"),
+                "rows_per_sec": round(rate, 2),
+                "eta_seconds": round((total - done) / rate, 1)
+                if rate and total is not None and job["status"] == "running"
+                else None,
+            }
+        )
+        return job
+
+    def _run_loop(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            job = self._load(job_id)
+            if job is None or job["status"] not in ("queued", "running"):
+                continue
+            try:
+                self._run(job)
+            except Exception as exc:  # a bad job must not stop the runner
+                job.update({"status": "failed", "error": str(exc), "finished": time.time()})
+                self._save(job)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        input_path = os.path.join(self._dir(job_id), "input.jsonl")
+        if not os.path.exists(input_path):
+            job["total"] = self._write_input(job_id, _iter_rows(job["source"]))
+        done = self._completed_rows(job_id)
+        job.update({"status": "running", "started": job["started"] or time.time(), "done": done})
+        self._save(job)
+
+        started = time.perf_counter()
+        with open(self.results_path(job_id), "a", encoding="utf-8") as sink:
+            rows = islice(_iter_rows(input_path), done, None)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                results = _BATCHER.submit([row.get("program") or "" for row in chunk])
+                for row, result in zip(chunk, results):
+                    sink.write(json.dumps(_apply_result(row, result), ensure_ascii=False) + "\n")
+                sink.flush()
+                job["done"] += len(chunk)
+                self._rates[job_id] = (job["done"] - done) / (time.perf_counter() - started)
+                self._save(job)
+
+        job.update({"status": "done", "finished": time.time()})
+        self._save(job)
+
+
+_JOBS = JobStore(JOBS_DIR)
+
+
+def _job_input_path(path: str) -> str | None:
+    """Resolve a client-supplied path against JOBS_INPUT_DIR; None if it leads outside."""
+    root = os.path.realpath(JOBS_INPUT_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        return None
+    return resolved
+
+
+@app.post("/jobs")
+def create_job() -> Any:
+    """Queue a bulk job: rows in the body (list or {'rows': [...]}) or {'path': ...}."""
+    payload = request.get_json(force=True, silent=True)
+    if isinstance(payload, dict) and isinstance(payload.get("path"), str):
+        path = _job_input_path(payload["path"])
+        if path is None:
+            return jsonify({"error": f"path must be under JOBS_INPUT_DIR: {payload['path']}"}), 400
+        if not os.path.isfile(path):
+            return jsonify({"error": f"no such file: {payload['path']}"}), 400
+        job = _JOBS.create(path=path)
+    elif isinstance(payload, list) or (isinstance(payload, dict) and isinstance(payload.get("rows"), list)):
+        job = _JOBS.create(rows=_normalize_input(payload))
+    else:
+        return jsonify({"error": "expected a list of rows, {'rows': [...]} or {'path': ...}"}), 400
+    return jsonify(job), 202, {"Location": f"/jobs/{job['id']}"}
+
+
+@app.get("/jobs/<job_id>")
+def get_job(job_id: str) -> Any:
+    """Job status, progress and ETA."""
+    _JOBS.start()
+    job = _JOBS.status(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job)
+
+
+@app.get("/jobs/<job_id>/results")
+def get_job_results(job_id: str) -> Any:
+    """Stream the job's results written so far as JSON Lines."""
+    _JOBS.start()
+    job = _JOBS.status(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    path = _JOBS.results_path(job_id)
+
+    def generate() -> Iterator[bytes]:
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):  # skip a line still being written
+                    yield line
+
+    return Response(generate(), mimetype=NDJSON, headers={"X-Job-Status": job["status"]})
+
+
+def _row_key(row: Dict[str, Any]) -> str:
+    """Stable identity of an input row: its URL, else a hash of its input fields."""
+    url = row.get("url")
+    if url:
+        return f"url:{url}"
+    fields = {k: v for k, v in row.items() if not str(k).startswith("llm-")}
+    digest = hashlib.sha1(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return f"sha1:{digest.hexdigest()}"
+
+
+def _scan_output(out_path: str) -> Counter:
+    """Keys of rows already in an output JSONL; a torn last line is cut off."""
+    done: Counter = Counter()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, "rb+") as f:
+        offset = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                f.truncate(offset)
+                break
+            offset += len(line)
+            if line.strip():
+                done[_row_key(json.loads(line))] += 1
+    return done
+
+
+def _format_eta(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{secs:02d}s" if hours else f"{minutes}m{secs:02d}s"
+
+
 def _cli_process_file(
     in_path: str,
     out_path: str | None,
     append: bool,
     to_stdout: bool,
+    progress_every: float = 5.0,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    """Stream a JSON / JSONL file through the standardizer, writing JSONL incrementally.
+
+    With ``append`` the existing output is scanned first and rows whose key
+    (``url``, else a hash of the input fields) is already there are skipped,
+    so rerunning after a crash picks up where it stopped. Rows go through
+    the same micro-batcher as the server. Progress (rows/sec, ETA from the
+    share of the input read) goes to stderr.
+    """
+    reader = RowReader(in_path)
 
     sink = sys.stdout if to_stdout else None
+    done: Counter = Counter()
     if not to_stdout:
         out_path = out_path or (in_path + ".jsonl")
-        mode = "a" if append else "w"
-        sink = open(out_path, mode, encoding="utf-8")
+        if append:
+            done = _scan_output(out_path)
+        sink = open(out_path, "a" if append else "w", encoding="utf-8")
 
     assert sink is not None  # for type-checkers
 
+    processed = skipped = 0
+    started = last_report = time.perf_counter()
+    start_fraction: float | None = None
+
+    def report(final: bool = False) -> None:
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        line = f"[cli] {processed} rows ({skipped} skipped), {processed / elapsed:.1f} rows/s"
+        read = reader.fraction - (start_fraction or 0.0)
+        if not final and read > 0:
+            line += f", {100 * reader.fraction:.0f}% read, ETA {_format_eta(elapsed * (1 - reader.fraction) / read)}"
+        print(line, file=sys.stderr)
+
     try:
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
-
-            json.dump(row, sink, ensure_ascii=False)
-            sink.write("\n")
+        rows = iter(reader)
+        while True:
+            chunk: List[Dict[str, Any]] = []
+            for row in rows:
+                row = row or {}
+                key = _row_key(row)
+                if done[key] > 0:
+                    done[key] -= 1
+                    skipped += 1
+                    continue
+                chunk.append(row)
+                if len(chunk) >= max(1, BATCH_MAX_SIZE):
+                    break
+            if not chunk:
+                break
+            if start_fraction is None:
+                start_fraction = reader.fraction
+                started = time.perf_counter()
+            results = _BATCHER.submit([row.get("program") or "" for row in chunk])
+            for row, result in zip(chunk, results):
+                json.dump(_apply_result(row, result), sink, ensure_ascii=False)
+                sink.write("\n")
             sink.flush()
+            processed += len(chunk)
+            if time.perf_counter() - last_report >= progress_every:
+                last_report = time.perf_counter()
+                report()
+        report(final=True)
     finally:
         if sink is not sys.stdout:
             sink.close()
@@ -324,7 +1726,7 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--file",
-        help="Path to JSON input (list of rows or {'rows': [...]})",
+        help="Path to JSON input (list of rows or {'rows': [...]}) or JSON Lines (.jsonl)",
         default=None,
     )
     parser.add_argument(
@@ -341,22 +1743,40 @@ if __name__ == "__main__":
     parser.add_argument(
         "--append",
         action="store_true",
-        help="Append to the output file instead of overwriting.",
+        help="Append to the output file instead of overwriting, "
+        "skipping rows already in it (resume after a crash).",
     )
     parser.add_argument(
         "--stdout",
         action="store_true",
         help="Write JSON Lines to stdout instead of a file.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help="Model worker processes sharing the memory-mapped GGUF (default: WORKERS or 1).",
+    )
     args = parser.parse_args()
 
-    if args.serve or args.file is None:
-        port = int(os.getenv("PORT", "8000"))
-        app.run(host="0.0.0.0", port=port, debug=False)
-    else:
-        _cli_process_file(
-            in_path=args.file,
-            out_path=args.out,
-            append=bool(args.append),
-            to_stdout=bool(args.stdout),
-        )
+    if args.workers > 1:
+        _POOL = WorkerPool(args.workers, WORKER_THREADS)
+
+    try:
+        if args.serve or args.file is None:
+            threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+            _JOBS.start()
+            port = int(os.getenv("PORT", "8000"))
+            app.run(host="0.0.0.0", port=port, debug=False)
+        else:
+            if _POOL is not None:
+                _POOL.warm()
+            _cli_process_file(
+                in_path=args.file,
+                out_path=args.out,
+                append=bool(args.append),
+                to_stdout=bool(args.stdout),
+            )
+    finally:
+        if _POOL is not None:
+            _POOL.shutdown()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Program strings shared by the benchmark scripts.
+
+Kept free of ``import app`` so each script can set its environment before
+the app module reads its config.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import List
+
+SAMPLE_PROGRAMS = [
+    "Information Studies, McGill University",
+    "Mathematics, University Of British Columbia",
+    "Computer Science, Stanfrd University",
+    "Physics at MIT",
+    "Electrical Engineering, Georgia Tech",
+    "Economics, UofT",
+    "Public Health, Johns Hopkins",
+    "Chem Eng @ UIUC",
+]
+
+
+def _load_programs(path: str | None, rows: int) -> List[str]:
+    """Program strings from a JSON file, or the built-in samples, repeated to rows."""
+    programs = SAMPLE_PROGRAMS
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if isinstance(payload, dict):
+            payload = payload.get("rows")
+        if isinstance(payload, list):
+            programs = [(r or {}).get("program") or "" for r in payload]
+    programs = [p for p in programs if p] or SAMPLE_PROGRAMS
+    return [programs[i % len(programs)] for i in range(rows)]
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Compare grammar-constrained and free-text decoding on the real model.
+
+Runs the same rows through ``_call_llm`` twice, once with ANSWER_GBNF and
+once with free text (max_tokens=MAX_TOKENS), and reports generated tokens
+per row, the share of answers that fell back to ``_split_fallback``
+because no JSON could be parsed, and latency per row.
+
+Usage:
+    python bench_decoding.py [--rows 50] [--file rows.json] [--model-path tiny.gguf]
+
+Without --model-path the configured MODEL_REPO/MODEL_FILE is downloaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import List
+
+# Must be set before app is imported: always hit the model, never the cache
+os.environ["RULES_MIN_CONFIDENCE"] = "2"
+os.environ["MEMO_CACHE"] = "0"
+
+import app  # pylint: disable=wrong-import-position
+from bench_common import _load_programs  # pylint: disable=wrong-import-position
+
+
+def run(programs: List[str], grammar: bool) -> None:
+    """Standardize programs with or without the grammar and print the stats."""
+    app.JSON_GRAMMAR = grammar
+    app._DECODE = app.DecodeStats()
+    started = time.perf_counter()
+    for text in programs:
+        app._call_llm(text)
+    seconds = time.perf_counter() - started
+    stats = app._DECODE.stats()
+    label = "grammar" if grammar else "free text"
+    print(
+        f"{label:>10} {stats['mean_completion_tokens']:>12.1f} "
+        f"{100 * stats['fallback_rate']:>9.1f}% {1000 * seconds / len(programs):>9.1f}"
+    )
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description="Benchmark grammar-constrained decoding.")
+    ap.add_argument("--rows", type=int, default=50)
+    ap.add_argument("--file", default=None, help="JSON rows to sample program strings from.")
+    ap.add_argument("--model-path", default=None, help="Local GGUF to use instead of downloading.")
+    args = ap.parse_args()
+
+    if args.model_path:
+        app._model_path = lambda: args.model_path
+    programs = _load_programs(args.file, args.rows)
+    app._load_llm()
+    print(f"{len(programs)} rows, max_tokens={app.MAX_TOKENS}")
+    print(f"{'decoding':>10} {'tokens/row':>12} {'fallback':>10} {'ms/row':>9}")
+    run(programs, grammar=False)
+    run(programs, grammar=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Benchmark FuzzyIndex against difflib.get_close_matches on the canonical lists.
+
+Builds a deterministic fixture set (exact names, case changes, typos and
+noise) from canon_universities.txt / canon_programs.txt, checks that the
+index returns exactly what difflib returns, and reports lookups/sec.
+
+Usage:
+    python bench_fuzzy.py [--seed 7] [--per-name 2] [--repeat 1]
+
+Exits non-zero if any fixture disagrees with difflib.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import string
+import sys
+import time
+from typing import Callable, List
+
+from fuzzy_index import FuzzyIndex
+
+
+def _read_lines(path: str) -> List[str]:
+    """Read non-empty, stripped lines from a file (UTF-8)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [ln.strip() for ln in f if ln.strip()]
+
+
+def _mutate(name: str, rng: random.Random) -> str:
+    """Apply one or two random typos (drop, swap, substitute, insert)."""
+    chars = list(name)
+    for _ in range(rng.randint(1, 2)):
+        if len(chars) < 3:
+            break
+        i = rng.randrange(len(chars) - 1)
+        op = rng.choice(("drop", "swap", "sub", "insert"))
+        if op == "drop":
+            del chars[i]
+        elif op == "swap":
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        elif op == "sub":
+            chars[i] = rng.choice(string.ascii_lowercase)
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+def build_fixtures(names: List[str], rng: random.Random, per_name: int) -> List[str]:
+    """Exact hits, case variants, typo variants and unrelated noise."""
+    fixtures: List[str] = []
+    for name in names:
+        fixtures.append(name)
+        fixtures.append(name.lower())
+        fixtures.extend(_mutate(name, rng) for _ in range(per_name))
+    for _ in range(len(names) // 4):
+        length = rng.randint(3, 30)
+        fixtures.append("".join(rng.choice(string.ascii_letters + " ") for _ in range(length)))
+    rng.shuffle(fixtures)
+    return fixtures
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Best wall time of fn over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(label: str, names: List[str], cutoff: float, args: argparse.Namespace) -> int:
+    """Check parity and print throughput for one canonical list; return mismatches."""
+    rng = random.Random(args.seed)
+    fixtures = build_fixtures(names, rng, args.per_name)
+    t0 = time.perf_counter()
+    index = FuzzyIndex(names)
+    t_build = time.perf_counter() - t0
+
+    def baseline() -> List[str | None]:
+        out = []
+        for q in fixtures:
+            m = difflib.get_close_matches(q, names, n=1, cutoff=cutoff)
+            out.append(m[0] if m else None)
+        return out
+
+    expected = baseline()
+    got = [m for m, _ in index.best_matches(fixtures, cutoff=cutoff)]
+    mismatches = [(q, e, g) for q, e, g in zip(fixtures, expected, got) if e != g]
+
+    t_difflib = _time(baseline, args.repeat)
+    t_index = _time(lambda: [index.best_match(q, cutoff) for q in fixtures], args.repeat)
+    t_batch = _time(lambda: index.best_matches(fixtures, cutoff), args.repeat)
+
+    n = len(fixtures)
+    print(f"[{label}] {len(names)} canonical names, {n} fixtures, cutoff={cutoff}")
+    print(f"  index build               : {t_build * 1000:10.1f} ms")
+    print(f"  difflib.get_close_matches : {n / t_difflib:10.0f} lookups/s")
+    print(f"  FuzzyIndex.best_match     : {n / t_index:10.0f} lookups/s  ({t_difflib / t_index:.1f}x)")
+    print(f"  FuzzyIndex.best_matches   : {n / t_batch:10.0f} lookups/s  ({t_difflib / t_batch:.1f}x)")
+    print(f"  parity: {n - len(mismatches)}/{n} identical")
+    for q, e, g in mismatches[:10]:
+        print(f"    {q!r}: difflib={e!r} index={g!r}")
+    return len(mismatches)
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description="Benchmark the fuzzy index against difflib.")
+    ap.add_argument("--unis", default="canon_universities.txt")
+    ap.add_argument("--progs", default="canon_programs.txt")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--per-name", type=int, default=2, help="Typo variants per canonical name.")
+    ap.add_argument("--repeat", type=int, default=1, help="Timing runs; the best is reported.")
+    args = ap.parse_args()
+
+    # Cutoffs match _normalize_university_scored / _normalize_program_scored
+    bad = run("universities", _read_lines(args.unis), 0.86, args)
+    bad += run("programs", _read_lines(args.progs), 0.84, args)
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
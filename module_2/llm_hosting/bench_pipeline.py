@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the standardizer pipeline with the stub model (no download).
+
+Runs with ``LLM_BACKEND=stub`` (see stub_llama.py), so it works on any CPU
+box, CI included. Two parts:
+
+1. Stages, in process: per-row cost of request JSON parsing, the split
+   fallback, fuzzy canonical matching, ``_post_normalize_*``, the whole
+   rules path, ``_call_llm`` around the stub model, and JSON encoding of
+   the output row. For ``_call_llm`` the stub's simulated latency is
+   subtracted, which leaves the Python share of a model row.
+2. End to end: starts ``app.py --serve`` on a free port and POSTs batches
+   of rows to ``/standardize`` from 1, 4, 16 ... client threads. Reports
+   rows/sec, p50/p95 request latency and how busy the model was
+   (from ``GET /metrics`` → ``prefix_cache``).
+
+Usage:
+    python bench_pipeline.py [--rows 256] [--concurrency 1,4,16] [--batch 8]
+    python bench_pipeline.py --force-model --prompt-ms 1 --gen-ms 5
+    python bench_pipeline.py --quick        # small CI smoke run
+
+Exits non-zero if the server does not become ready or a request fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, List
+
+# Must be set before app is imported (and inherited by the server process)
+os.environ["LLM_BACKEND"] = "stub"
+os.environ["MEMO_CACHE"] = "0"
+
+import app  # pylint: disable=wrong-import-position
+from bench_common import _load_programs  # pylint: disable=wrong-import-position
+
+
+def _per_row_us(fn: Callable[[], object], rows: int, repeat: int) -> float:
+    """Best wall time of fn over repeat runs, in microseconds per row."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return 1e6 * best / rows
+
+
+def run_stages(programs: List[str], repeat: int, prompt_ms: float, gen_ms: float) -> None:
+    """Time each pipeline stage in isolation and print microseconds per row."""
+    n = len(programs)
+    body = json.dumps({"rows": [{"program": p, "url": f"u{i}"} for i, p in enumerate(programs)]})
+    splits = [app._split_fallback(p) for p in programs]
+    rows = [{"program": p, "url": f"u{i}"} for i, p in enumerate(programs)]
+    results = [app._rules_standardize(p)[0] for p in programs]
+
+    def fuzzy() -> None:
+        for prog, uni in splits:
+            app._normalize_program_scored(prog)
+            app._normalize_university_scored(uni)
+
+    def post_normalize() -> None:
+        for prog, uni in splits:
+            app._post_normalize_program(prog)
+            app._post_normalize_university(uni)
+
+    stages = [
+        ("parse request", lambda: app._normalize_input(json.loads(body))),
+        ("split fallback", lambda: [app._split_fallback(p) for p in programs]),
+        ("fuzzy match", fuzzy),
+        ("post normalize", post_normalize),
+        ("rules path", lambda: [app._rules_standardize(p) for p in programs]),
+        (
+            "encode row",
+            lambda: [json.dumps(app._apply_result(r, res), ensure_ascii=False) for r, res in zip(rows, results)],
+        ),
+    ]
+    print(f"stages: {n} rows, best of {repeat}")
+    print(f"  {'stage':<24} {'us/row':>10}")
+    for label, fn in stages:
+        print(f"  {label:<24} {_per_row_us(fn, n, repeat):>10.1f}")
+
+    llm = app._load_llm()
+    for latency, label, texts in (
+        ((0.0, 0.0), "_call_llm (stub, 0 ms)", programs),
+        ((prompt_ms, gen_ms), "_call_llm (stub, timed)", programs[:32]),  # sleeps, so fewer rows
+    ):
+        llm.prompt_ms_per_token, llm.gen_ms_per_token = latency
+        llm.simulated_seconds = 0.0
+        started = time.perf_counter()
+        for text in texts:
+            app._call_llm(text)
+        seconds = time.perf_counter() - started
+        model_us = 1e6 * llm.simulated_seconds / len(texts)
+        total_us = 1e6 * seconds / len(texts)
+        print(f"  {label:<24} {total_us:>10.1f}  (python {total_us - model_us:.1f}, model {model_us:.1f})")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_json(url: str) -> Dict[str, Any]:
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def _post_rows(url: str, programs: List[str]) -> None:
+    data = json.dumps({"rows": [{"program": p} for p in programs]}).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        if len(json.loads(resp.read())["rows"]) != len(programs):
+            raise RuntimeError("short response")
+
+
+def _start_server(port: int, args: argparse.Namespace, jobs_dir: str) -> subprocess.Popen:
+    """Start app.py --serve with the stub backend and wait for /ready."""
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        JOBS_DIR=jobs_dir,
+        STUB_PROMPT_MS_PER_TOKEN=str(args.prompt_ms),
+        STUB_GEN_MS_PER_TOKEN=str(args.gen_ms),
+    )
+    if args.force_model:
+        env["RULES_MIN_CONFIDENCE"] = "2"
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, os.path.join(here, "app.py"), "--serve"],
+        cwd=here,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            _get_json(f"http://127.0.0.1:{port}/ready")
+            return proc
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not become ready within 60s")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100.0 * len(ordered)))]
+
+
+def run_level(base: str, programs: List[str], clients: int, batch: int) -> Dict[str, float]:
+    """Send programs in batches from `clients` threads; return throughput and latency."""
+    chunks = [programs[i:i + batch] for i in range(0, len(programs), batch)]
+    latencies: List[float] = []
+    errors: List[BaseException] = []
+    lock = threading.Lock()
+    before = _get_json(f"{base}/metrics")["prefix_cache"]
+
+    def client() -> None:
+        while True:
+            with lock:
+                if not chunks or errors:
+                    return
+                chunk = chunks.pop()
+            started = time.perf_counter()
+            try:
+                _post_rows(f"{base}/standardize", chunk)
+            except Exception as exc:  # pylint: disable=broad-except
+                with lock:
+                    errors.append(exc)
+                return
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+    if errors:
+        raise RuntimeError(f"request failed: {errors[0]!r}")
+
+    after = _get_json(f"{base}/metrics")["prefix_cache"]
+    model_rows = after["rows"] - before["rows"]
+    model_seconds = (after["rows"] * after["mean_row_ms"] - before["rows"] * before["mean_row_ms"]) / 1000.0
+    return {
+        "rows_per_s": len(programs) / seconds,
+        "p50_ms": 1000.0 * _percentile(latencies, 50),
+        "p95_ms": 1000.0 * _percentile(latencies, 95),
+        "model_rows": model_rows,
+        "model_busy": model_seconds / seconds,
+    }
+
+
+def run_end_to_end(programs: List[str], args: argparse.Namespace) -> None:
+    """Start the server once and measure each concurrency level against it."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as jobs_dir:
+        proc = _start_server(port, args, jobs_dir)
+        try:
+            print(
+                f"end to end: {len(programs)} rows in batches of {args.batch}, "
+                f"stub {args.prompt_ms} ms/prompt token, {args.gen_ms} ms/generated token"
+                + (", model forced" if args.force_model else "")
+            )
+            print(f"  {'clients':>7} {'rows/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'model rows':>10} {'model busy':>10}")
+            for clients in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+                r = run_level(base, programs, clients, args.batch)
+                print(
+                    f"  {clients:>7} {r['rows_per_s']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                    f"{r['model_rows']:>10.0f} {100 * r['model_busy']:>9.1f}%"
+                )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description="Benchmark the pipeline with a stub model backend.")
+    ap.add_argument("--rows", type=int, default=256)
+    ap.add_argument("--file", default=None, help="JSON rows to sample program strings from.")
+    ap.add_argument("--concurrency", default="1,4,16", help="Comma-separated client thread counts.")
+    ap.add_argument("--batch", type=int, default=8, help="Rows per /standardize request.")
+    ap.add_argument("--repeat", type=int, default=3, help="Stage timing runs; the best is reported.")
+    ap.add_argument("--prompt-ms", type=float, default=1.0, help="Stub latency per evaluated prompt token.")
+    ap.add_argument("--gen-ms", type=float, default=5.0, help="Stub latency per generated token.")
+    ap.add_argument("--force-model", action="store_true", help="Send every row to the model (skip rules).")
+    ap.add_argument("--quick", action="store_true", help="Small run for CI: 32 rows, 1 and 4 clients.")
+    args = ap.parse_args()
+    if args.quick:
+        args.rows, args.concurrency, args.repeat = 32, "1,4", 1
+
+    programs = _load_programs(args.file, args.rows)
+    run_stages(programs, args.repeat, args.prompt_ms, args.gen_ms)
+    print()
+    try:
+        run_end_to_end(programs, args)
+    except RuntimeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Measure model rows/sec as the number of worker processes grows.
+
+Every row is forced through the model (rules routing and the memo cache are
+off), so the numbers reflect inference throughput only. For each K the pool
+is started and warmed up before timing, then the same rows are run once.
+
+Usage:
+    python bench_workers.py --workers 1,2,4,8 [--rows 64] [--file rows.json]
+    python bench_workers.py --workers 1,2,4 --threads-per-worker 4
+
+Without --threads-per-worker each run splits N_THREADS evenly over K workers;
+setting it pins threads per worker so total threads grow with K.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+# Must be set before app is imported (and inherited by spawned workers)
+os.environ["RULES_MIN_CONFIDENCE"] = "2"
+os.environ["MEMO_CACHE"] = "0"
+
+import app  # pylint: disable=wrong-import-position
+from bench_common import _load_programs  # pylint: disable=wrong-import-position
+
+
+def main() -> None:
+    """CLI entry point."""
+    ap = argparse.ArgumentParser(description="Benchmark rows/sec scaling with worker processes.")
+    ap.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to try.")
+    ap.add_argument("--rows", type=int, default=64)
+    ap.add_argument("--file", default=None, help="JSON rows to sample program strings from.")
+    ap.add_argument("--threads-per-worker", type=int, default=0)
+    args = ap.parse_args()
+
+    programs = _load_programs(args.file, args.rows)
+    print(f"{len(programs)} rows, N_THREADS={app.N_THREADS}, cpus={os.cpu_count()}")
+    print(f"{'K':>3} {'threads/worker':>14} {'seconds':>9} {'rows/s':>9} {'speedup':>8}")
+    base = None
+    for k in [int(x) for x in args.workers.split(",") if x.strip()]:
+        pool = app.WorkerPool(k, args.threads_per_worker)
+        try:
+            pool.warm()
+            started = time.perf_counter()
+            pool.map(programs)
+            seconds = time.perf_counter() - started
+        finally:
+            pool.shutdown()
+        rate = len(programs) / seconds
+        base = base or rate
+        print(f"{k:>3} {pool.threads_per_worker:>14} {seconds:>9.2f} {rate:>9.2f} {rate / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
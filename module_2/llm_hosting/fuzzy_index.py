@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Inverted character index for fast fuzzy matching against canonical lists."""
+
+from __future__ import annotations
+
+import difflib
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class FuzzyIndex:
+    """Drop-in replacement for ``difflib.get_close_matches(..., n=1)``.
+
+    difflib scores every candidate; most are rejected by its cheap
+    ``quick_ratio`` upper bound (shared characters, counted with
+    multiplicity). This index computes that same bound for all names at
+    once from postings keyed by ``(char, k)`` -> names containing ``char``
+    at least ``k`` times, restricted to the lengths that can pass
+    ``real_quick_ratio``. The full ``ratio()`` then runs only on names in
+    descending bound order until the bound drops below the best score, so
+    the result is identical to difflib's, ties included. Exact hits are
+    answered from a set.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        # Sorted by length so a length window is a contiguous id range
+        self.names: List[str] = sorted(dict.fromkeys(names), key=len)
+        self.exact: Set[str] = set(self.names)
+        self._lengths: List[int] = [len(n) for n in self.names]
+        self._postings: Dict[Tuple[str, int], List[int]] = {}
+        for idx, name in enumerate(self.names):
+            for ch, count in Counter(name).items():
+                for k in range(1, count + 1):
+                    self._postings.setdefault((ch, k), []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.exact
+
+    def _bounds(self, name: str, cutoff: float) -> List[Tuple[float, int]]:
+        """(quick_ratio, id) for every name whose bound reaches cutoff, best first."""
+        lq = len(name)
+        # real_quick_ratio >= cutoff; widened by one so float rounding never drops a name
+        lo = bisect_left(self._lengths, lq * cutoff / (2.0 - cutoff) - 1)
+        hi = bisect_right(self._lengths, lq * (2.0 - cutoff) / cutoff + 1)
+        if lo >= hi:
+            return []
+        lists = []
+        for ch, count in Counter(name).items():
+            for k in range(1, count + 1):
+                ids = self._postings.get((ch, k))
+                if ids:
+                    lists.append(ids[bisect_left(ids, lo):bisect_left(ids, hi)])
+        shared = Counter(chain.from_iterable(lists))
+        lengths = self._lengths
+        # Same arithmetic as SequenceMatcher.quick_ratio, so comparisons are exact
+        bounds = [(2.0 * m / (lq + lengths[i]), i) for i, m in shared.items()]
+        bounds = [b for b in bounds if b[0] >= cutoff]
+        bounds.sort(reverse=True)
+        return bounds
+
+    def best_match(self, name: str, cutoff: float = 0.6) -> Tuple[str | None, float]:
+        """Closest name with similarity >= cutoff, and its ratio.
+
+        Returns:
+            (match, ratio), or (None, 0.0) when nothing reaches cutoff.
+
+        Raises:
+            ValueError: if cutoff is not in (0.0, 1.0].
+        """
+        if not 0.0 < cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in (0.0, 1.0]: {cutoff!r}")
+        if not name or not self.names:
+            return None, 0.0
+        if name in self.exact:
+            return name, 1.0
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(name)  # difflib puts the query in seq2
+        best: Tuple[float, str] | None = None
+        for bound, idx in self._bounds(name, cutoff):
+            if best is not None and bound < best[0]:
+                break
+            candidate = self.names[idx]
+            matcher.set_seq1(candidate)
+            ratio = matcher.ratio()
+            # Tuple comparison breaks ties the way heapq.nlargest does in difflib
+            if ratio >= cutoff and (best is None or (ratio, candidate) > best):
+                best = (ratio, candidate)
+        if best is None:
+            return None, 0.0
+        return best[1], best[0]
+
+    def best_matches(
+        self, names: Iterable[str], cutoff: float = 0.6
+    ) -> List[Tuple[str | None, float]]:
+        """Batched ``best_match``; repeated names are looked up once."""
+        names = list(names)
+        cache = {name: self.best_match(name, cutoff) for name in dict.fromkeys(names)}
+        return [cache[name] for name in names]
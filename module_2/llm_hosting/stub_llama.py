@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Deterministic stand-in for ``llama_cpp.Llama`` (benchmarks and CI, no model).
+
+Implements the parts of the Llama API that app.py uses: token-level context
+state (``n_tokens``, ``input_ids``, ``reset``, ``eval``, ``save_state``,
+``load_state``) and ``create_chat_completion``. Prompts are "tokenized" by
+splitting on words and punctuation and hashing each piece, so the prompt
+prefix reuse that llama.cpp does (and PrefixCache relies on) behaves the
+same way. The answer is a valid JSON object built from the user turn by a
+fixed split rule.
+
+Latency is simulated with ``time.sleep``: ``prompt_ms_per_token`` for every
+prompt token that has to be evaluated (not already in the context) and
+``gen_ms_per_token`` for every generated token. Both default to the
+STUB_PROMPT_MS_PER_TOKEN / STUB_GEN_MS_PER_TOKEN env vars (0 if unset).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+import zlib
+from typing import Any, Dict, List
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text: str) -> List[int]:
+    """Stable pseudo-token ids (word/punctuation pieces hashed with crc32)."""
+    return [zlib.crc32(piece.encode("utf-8")) % 32000 for piece in TOKEN_RE.findall(text)]
+
+
+class StubLlama:
+    """Llama look-alike with deterministic output and configurable per-token latency."""
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        prompt_ms_per_token: float | None = None,
+        gen_ms_per_token: float | None = None,
+        **_: Any,
+    ) -> None:
+        self.model_path = model_path
+        self.prompt_ms_per_token = (
+            float(os.getenv("STUB_PROMPT_MS_PER_TOKEN", "0"))
+            if prompt_ms_per_token is None
+            else prompt_ms_per_token
+        )
+        self.gen_ms_per_token = (
+            float(os.getenv("STUB_GEN_MS_PER_TOKEN", "0"))
+            if gen_ms_per_token is None
+            else gen_ms_per_token
+        )
+        self._ids: List[int] = []
+        self.completions = 0
+        self.prompt_tokens_evaluated = 0
+        self.simulated_seconds = 0.0
+
+    @property
+    def n_tokens(self) -> int:
+        return len(self._ids)
+
+    @n_tokens.setter
+    def n_tokens(self, value: int) -> None:
+        """Truncate the context, as assigning ``Llama.n_tokens`` does."""
+        self._ids = self._ids[:value]
+
+    @property
+    def input_ids(self) -> List[int]:
+        return list(self._ids)
+
+    def reset(self) -> None:
+        self._ids = []
+
+    def eval(self, tokens: List[int]) -> None:
+        self._sleep(self.prompt_ms_per_token * len(tokens))
+        self.prompt_tokens_evaluated += len(tokens)
+        self._ids.extend(int(t) for t in tokens)
+
+    def save_state(self) -> List[int]:
+        return list(self._ids)
+
+    def load_state(self, state: List[int]) -> None:
+        self._ids = list(state)
+
+    def _sleep(self, ms: float) -> None:
+        if ms > 0:
+            self.simulated_seconds += ms / 1000.0
+            time.sleep(ms / 1000.0)
+
+    @staticmethod
+    def _render(messages: List[Dict[str, str]]) -> List[int]:
+        text = "".join(f"<|{m['role']}|>\n{m['content']}</s>\n" for m in messages)
+        return tokenize(text + "<|assistant|>\n")
+
+    @staticmethod
+    def _answer(messages: List[Dict[str, str]]) -> Dict[str, str]:
+        """Split the last user turn's program string at the first comma or ' at '."""
+        try:
+            program = str(json.loads(messages[-1]["content"]).get("program", ""))
+        except (ValueError, AttributeError):
+            program = messages[-1]["content"]
+        parts = [p.strip() for p in re.split(r",| at | @ ", program, maxsplit=1)]
+        return {
+            "standardized_program": parts[0].title(),
+            "standardized_university": parts[1] if len(parts) > 1 and parts[1] else "Unknown",
+        }
+
+    def create_chat_completion(
+        self, messages: List[Dict[str, str]], max_tokens: int = 16, **_: Any
+    ) -> Dict[str, Any]:
+        """Evaluate the uncached prompt suffix, then "generate" the JSON answer."""
+        self.completions += 1
+        prompt = self._render(messages)
+        common = 0
+        for cached, wanted in zip(self._ids, prompt[:-1]):  # llama.cpp always re-evals the last token
+            if cached != wanted:
+                break
+            common += 1
+        self._ids = self._ids[:common]
+        self.eval(prompt[common:])
+
+        content = json.dumps(self._answer(messages), ensure_ascii=False)
+        generated = tokenize(content)[:max_tokens]
+        self._sleep(self.gen_ms_per_token * len(generated))
+        self._ids.extend(generated)
+        return {
+            "choices": [{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": len(prompt),
+                "completion_tokens": len(generated),
+                "total_tokens": len(prompt) + len(generated),
+            },
+        }
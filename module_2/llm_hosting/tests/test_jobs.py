@@ -0,0 +1,71 @@
+"""
+Tests for the /jobs endpoint: which server files a {"path": ...} job may read.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to path; the stub backend needs no model download
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('LLM_BACKEND', 'stub')
+
+import app  # pylint: disable=wrong-import-position
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Flask client whose JOBS_INPUT_DIR is tmp_path/inputs; created jobs are captured."""
+    inputs = tmp_path / 'inputs'
+    inputs.mkdir()
+    (inputs / 'rows.jsonl').write_text('{"program": "CS, MIT"}\n')
+    (tmp_path / 'secret.json').write_text('[]')
+    created = []
+    monkeypatch.setattr(app, 'JOBS_INPUT_DIR', str(inputs))
+
+    def create(path=None, rows=None):  # pylint: disable=unused-argument
+        created.append(path)
+        return {'id': 'x'}
+
+    monkeypatch.setattr(app._JOBS, 'create', create)
+    test_client = app.app.test_client()
+    test_client.created = created
+    return test_client
+
+
+class TestPathJobs:
+    """Test that path jobs stay inside JOBS_INPUT_DIR."""
+
+    def test_relative_path_inside_dir_is_queued(self, client, tmp_path):
+        response = client.post('/jobs', json={'path': 'rows.jsonl'})
+        assert response.status_code == 202
+        assert client.created == [os.path.realpath(tmp_path / 'inputs' / 'rows.jsonl')]
+
+    @pytest.mark.parametrize('path', ['../secret.json', 'sub/../../secret.json'])
+    def test_parent_traversal_is_rejected(self, client, path):
+        response = client.post('/jobs', json={'path': path})
+        assert response.status_code == 400
+        assert 'JOBS_INPUT_DIR' in response.get_json()['error']
+        assert not client.created
+
+    def test_absolute_path_outside_dir_is_rejected(self, client, tmp_path):
+        response = client.post('/jobs', json={'path': str(tmp_path / 'secret.json')})
+        assert response.status_code == 400
+        assert not client.created
+
+    def test_symlink_out_of_dir_is_rejected(self, client, tmp_path):
+        os.symlink(tmp_path / 'secret.json', tmp_path / 'inputs' / 'link.json')
+        response = client.post('/jobs', json={'path': 'link.json'})
+        assert response.status_code == 400
+        assert not client.created
+
+    def test_missing_file_inside_dir(self, client):
+        response = client.post('/jobs', json={'path': 'missing.jsonl'})
+        assert response.status_code == 400
+        assert 'no such file' in response.get_json()['error']
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,60 @@
+"""
+Tests for PrefixCache against the stub model: prompt tokens saved are measured.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to path; the stub backend needs no model download
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('LLM_BACKEND', 'stub')
+
+import app  # pylint: disable=wrong-import-position
+from stub_llama import StubLlama  # pylint: disable=wrong-import-position
+
+
+def _run(cache, llm, programs):
+    for program in programs:
+        context = cache.prepare(llm)
+        out = llm.create_chat_completion(messages=app._build_messages(program), max_tokens=8)
+        cache.record(llm, context, out['usage']['prompt_tokens'], 0.0)
+
+
+class TestPrefixCache:
+    """Test priming and measured savings."""
+
+    def test_prime_keeps_evaluated_prefix(self):
+        llm = StubLlama()
+        cache = app.PrefixCache()
+        cache.prime(llm)
+        evaluated = llm.prompt_tokens_evaluated
+
+        assert cache.prefix_ids
+        assert llm.input_ids == cache.prefix_ids
+        assert cache.state == cache.prefix_ids
+        _run(cache, llm, ['Computer Science, MIT'])
+        assert cache.restores == 0
+        assert llm.prompt_tokens_evaluated - evaluated < len(cache.prefix_ids)
+
+    @pytest.mark.parametrize('primed', [True, False])
+    def test_saved_tokens_match_work_skipped(self, primed):
+        llm = StubLlama()
+        cache = app.PrefixCache()
+        if primed:
+            cache.prime(llm)
+        evaluated = llm.prompt_tokens_evaluated
+
+        _run(cache, llm, ['Computer Science, MIT', 'Physics at Stanford', 'Math, Harvard'])
+
+        stats = cache.stats()
+        assert stats['rows'] == 3
+        assert stats['prompt_tokens_evaluated'] == llm.prompt_tokens_evaluated - evaluated
+        if primed:
+            assert stats['prompt_tokens_saved'] >= 3 * len(cache.prefix_ids)
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,47 @@
+"""
+Tests for WorkerPool: counters kept in worker processes reach /metrics.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add the app directory to path; the stub backend needs no model download
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('LLM_BACKEND', 'stub')
+
+import app  # pylint: disable=wrong-import-position
+
+
+PROGRAMS = ['Computer Science, MIT', 'Physics at Stanford', 'Math, Harvard', 'History, Yale'] * 3
+
+
+class TestWorkerCounters:
+    """Test that per-worker counters are summed."""
+
+    def test_sum_counters_adds_only_summed_fields(self):
+        parts = [{'rows': 2, 'prefix_tokens': 40}, {'rows': 3, 'prefix_tokens': 40}]
+        assert app._sum_counters(parts, ('rows',)) == {'rows': 5, 'prefix_tokens': 40}
+
+    def test_metrics_sum_worker_counters(self, monkeypatch):
+        pool = app.WorkerPool(2, threads_per_worker=1)
+        monkeypatch.setattr(app, '_POOL', pool)
+        try:
+            assert len(pool.warm()) == 2
+            pool.map(PROGRAMS)
+            metrics = app.app.test_client().get('/metrics').get_json()
+        finally:
+            pool.shutdown()
+
+        assert sum(metrics['workers']['rows_by_worker'].values()) == len(PROGRAMS)
+        assert metrics['decoding']['rows'] == len(PROGRAMS)
+        assert metrics['decoding']['completion_tokens'] > 0
+        prefix = metrics['prefix_cache']
+        assert prefix['enabled'] and prefix['rows'] == len(PROGRAMS)
+        assert prefix['prompt_tokens_saved'] >= len(PROGRAMS) * prefix['prefix_tokens']
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
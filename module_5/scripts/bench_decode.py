@@ -0,0 +1,106 @@
+"""Micro-benchmark the loader's line decoding: original path vs fast path.
+
+Decodes the same synthetic JSON Lines (no database involved) two ways and
+reports records/sec:
+
+- original: ``json.loads`` + uncompiled ``re.search`` + uncached
+  ``strptime`` + inline row mapping, as load_json_data used to do;
+- fast: ``load_data._json_loads`` (orjson when installed) +
+  ``load_data.build_record`` (precompiled patterns, memoized dates).
+
+It also checks that both produce identical records.
+
+Usage:
+    python scripts/bench_decode.py [--rows 200000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data  # pylint: disable=wrong-import-position
+from bench_load_data import write_synthetic  # pylint: disable=wrong-import-position
+
+
+def _numeric(s):
+    if not s:
+        return None
+    match = re.search(r'(\d+\.?\d*)', s)
+    return float(match.group(1)) if match else None
+
+
+def _date(s):
+    if not s:
+        return None
+    try:
+        return datetime.strptime(s, '%B %d, %Y').date()
+    except ValueError:
+        return None
+
+
+def original_record(line):
+    """Decode one line the way load_json_data did before the fast path."""
+    data = json.loads(line.strip())
+    url = data.get('url')
+    match = re.search(r'/result/(\d+)', url) if url else None
+    if not match:
+        return None
+    clean = load_data.clean_string
+    return (
+        int(match.group(1)), clean(data.get('program')), clean(data.get('comments')),
+        _date(data.get('date_added')), clean(url), clean(data.get('applicant_status')),
+        clean(data.get('semester_year_start')), clean(data.get('citizenship')),
+        _numeric(data.get('gpa')), _numeric(data.get('gre')), _numeric(data.get('gre_v')),
+        _numeric(data.get('gre_aw')), clean(data.get('masters_or_phd')),
+        clean(data.get('llm-generated-program')), clean(data.get('llm-generated-university')),
+    )
+
+
+def fast_record(line):
+    """Decode one line with the optimized loader path."""
+    return load_data.build_record(load_data._json_loads(line))
+
+
+def _best(fn, lines, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        load_data._parse_date_cached.cache_clear()
+        started = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark loader line decoding.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs; the best is reported.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "applicants.jsonl")
+        write_synthetic(path, args.rows)
+        with open(path, "rb") as f:
+            lines = f.readlines()
+
+    mismatches = sum(original_record(line) != fast_record(line) for line in lines)
+    print(f"{len(lines)} lines, json decoder: {'orjson' if load_data.orjson else 'json'}")
+    t_orig = _best(original_record, lines, args.repeat)
+    t_fast = _best(fast_record, lines, args.repeat)
+    print(f"  original : {len(lines) / t_orig:>10.0f} records/s")
+    print(f"  fast     : {len(lines) / t_fast:>10.0f} records/s  ({t_orig / t_fast:.1f}x)")
+    print(f"  parity   : {len(lines) - mismatches}/{len(lines)} identical")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
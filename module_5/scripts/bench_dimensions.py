@@ -0,0 +1,202 @@
+"""Compare the text layout of applicants with the dimension-key layout.
+
+Builds a synthetic applicants table (default: ten million rows) in the text
+layout the table had before :mod:`load_dimensions`, with the status, degree,
+citizenship and LLM-generated program/university names stored in every row.
+A copy is then converted in place by ``create_applicants_table`` (the same
+path an existing database takes) and compacted with ``VACUUM FULL``.
+
+For each layout it reports the table size, and for question_10 and
+question_11 the median latency and the shared buffer hit rate from
+``EXPLAIN (ANALYZE, BUFFERS)``. No secondary indexes are built, so both
+layouts answer with the same scans. Uses the same DATABASE_URL / DB_*
+settings as the loader.
+
+Usage:
+    python scripts/bench_dimensions.py [--rows 10000000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+from psycopg import sql
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data  # pylint: disable=wrong-import-position
+import load_dimensions  # pylint: disable=wrong-import-position
+import migrate  # pylint: disable=wrong-import-position
+import query_data  # pylint: disable=wrong-import-position
+
+TEXT_SCHEMA = "dims_bench_text"
+KEY_SCHEMA = "dims_bench_keys"
+
+# applicants as it was created before the dimension tables existed
+_TEXT_TABLE = """
+CREATE TABLE applicants (
+    p_id INTEGER PRIMARY KEY, program TEXT, comments TEXT, date_added DATE, url TEXT,
+    status TEXT, term TEXT, us_or_international TEXT, gpa NUMERIC(3,2), gre NUMERIC(5,2),
+    gre_v NUMERIC(5,2), gre_aw NUMERIC(3,2), degree TEXT, llm_generated_program TEXT,
+    llm_generated_university TEXT, row_hash BYTEA
+)
+"""
+
+# About 400 universities and 200 programs, spread independently of each other
+_FILL = """
+INSERT INTO applicants
+SELECT i,
+       'Graduate Program ' || i %% 200 || ', University of Somewhere ' || abs(hashint4(i)) %% 400,
+       CASE WHEN i %% 3 = 0 THEN NULL ELSE 'synthetic row' END,
+       DATE '2024-01-01' + i %% 700,
+       'https://www.thegradcafe.com/survey/result/' || i,
+       (ARRAY['Accepted', 'Rejected', 'Wait listed', 'Interview'])[1 + i %% 4],
+       (ARRAY['Fall 2024', 'Spring 2025', 'Fall 2025', 'Fall 2026'])[1 + i / 7 %% 4],
+       (ARRAY['American', 'International'])[1 + i / 3 %% 2],
+       2.5 + i %% 150 / 100.0, 290 + i %% 51, 140 + i %% 31, 3.0 + i %% 4 * 0.5,
+       (ARRAY['PhD', 'Masters'])[1 + i / 5 %% 2],
+       'Graduate Program ' || i %% 200,
+       'University of Somewhere ' || abs(hashint4(i)) %% 400,
+       NULL
+FROM generate_series(1, %s) AS i
+"""
+
+# question_10 and question_11 as they were written against the text layout
+_TEXT_QUERIES = {
+    "question_10": """
+        SELECT llm_generated_university, llm_generated_program, COUNT(*) AS total_applications,
+               SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) AS acceptances,
+               ROUND(100.0 * SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) / COUNT(*), 2)
+        FROM applicants
+        WHERE term = 'Fall 2026' AND llm_generated_university IS NOT NULL AND llm_generated_program IS NOT NULL
+        GROUP BY llm_generated_university, llm_generated_program
+        ORDER BY total_applications DESC
+        LIMIT 10
+    """,
+    "question_11": """
+        SELECT degree, COUNT(*), SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END),
+               ROUND(100.0 * SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) / COUNT(*), 2),
+               ROUND(CAST(AVG(CASE WHEN status = 'Accepted' AND gpa IS NOT NULL THEN gpa END) AS numeric), 2),
+               COUNT(CASE WHEN status = 'Accepted' AND gpa IS NOT NULL THEN 1 END)
+        FROM applicants
+        WHERE degree IN ('PhD', 'Masters')
+        GROUP BY degree
+        ORDER BY degree
+        LIMIT 100
+    """,
+}
+
+
+def _use_schema(conn, schema, fresh=False):
+    with conn.cursor() as cur:
+        if fresh:
+            cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {0} CASCADE").format(sql.Identifier(schema)))
+            cur.execute(sql.SQL("CREATE SCHEMA {0}").format(sql.Identifier(schema)))
+        cur.execute(sql.SQL("SET search_path TO {0}").format(sql.Identifier(schema)))
+    conn.commit()
+
+
+def _vacuum(conn, tables):
+    conn.autocommit = True
+    for table in tables:
+        conn.execute(sql.SQL("VACUUM (FULL, ANALYZE) {0}").format(sql.Identifier(table)))
+    conn.autocommit = False
+
+
+def build(conn, rows):
+    """Create the text-layout table, and a converted copy; return seconds spent converting."""
+    _use_schema(conn, TEXT_SCHEMA, fresh=True)
+    with conn.cursor() as cur:
+        cur.execute(_TEXT_TABLE)
+        cur.execute(_FILL, (rows,))
+    conn.commit()
+    _vacuum(conn, ["applicants"])
+
+    _use_schema(conn, KEY_SCHEMA, fresh=True)
+    with conn.cursor() as cur:
+        cur.execute(_TEXT_TABLE)
+        cur.execute(sql.SQL("INSERT INTO applicants SELECT * FROM {0}.applicants").format(sql.Identifier(TEXT_SCHEMA)))
+    conn.commit()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_data.create_applicants_table(conn)
+    seconds = time.perf_counter() - started
+    _vacuum(conn, ["applicants"] + [table for _, _, table, _ in load_dimensions.DIMENSIONS])
+    return seconds
+
+
+def table_size(conn, tables):
+    """Return the total on-disk size of ``tables`` (heap, TOAST and indexes) in bytes."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT sum(pg_total_relation_size(t::regclass)) FROM unnest(%s::text[]) AS t", (tables,))
+        return int(cur.fetchone()[0])
+
+
+def measure(conn, statement, params, repeat):
+    """Return (median seconds, shared blocks accessed, buffer hit rate) for one statement."""
+    with conn.cursor() as cur:
+        cur.execute(statement, params)  # warm-up
+        cur.fetchall()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            cur.execute(statement, params)
+            cur.fetchall()
+            timings.append(time.perf_counter() - started)
+        cur.execute(sql.SQL("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ") + statement, params)
+        plan = cur.fetchone()[0][0]["Plan"]
+    conn.commit()
+    hit, read = plan["Shared Hit Blocks"], plan["Shared Read Blocks"]
+    return statistics.median(timings), hit + read, hit / (hit + read) if hit + read else 1.0
+
+
+def key_statement(conn, question):
+    """Return the (statement, params) a ``query_data`` question runs."""
+    recorder = migrate._RecordingConnection(conn)
+    with contextlib.redirect_stdout(io.StringIO()):
+        getattr(query_data, question)(recorder)
+    query, params = recorder.statements[-1]
+    return (sql.SQL(query) if isinstance(query, str) else query), params
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the dimension-key layout of applicants.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (the median is reported).")
+    args = parser.parse_args()
+
+    conn = load_data.get_connection()
+    try:
+        started = time.perf_counter()
+        convert_seconds = build(conn, args.rows)
+        print(f"built {args.rows} rows in {time.perf_counter() - started:.1f}s"
+              f" (conversion {convert_seconds:.1f}s)")
+
+        dimensions = [table for _, _, table, _ in load_dimensions.DIMENSIONS]
+        layouts = (
+            ("text", TEXT_SCHEMA, ["applicants"], lambda question: (sql.SQL(_TEXT_QUERIES[question]), None)),
+            ("keys", KEY_SCHEMA, ["applicants"] + dimensions, lambda question: key_statement(conn, question)),
+        )
+        print(f"{'layout':>8} {'size MB':>9} {'query':>12} {'median ms':>10} {'blocks':>8} {'hit rate':>9}")
+        for name, schema, tables, statement_for in layouts:
+            _use_schema(conn, schema)
+            size = table_size(conn, tables) / 2**20
+            for question in _TEXT_QUERIES:
+                seconds, blocks, hit_rate = measure(conn, *statement_for(question), args.repeat)
+                print(f"{name:>8} {size:>9.1f} {question:>12} {seconds * 1000:>10.1f} {blocks:>8} {hit_rate:>9.1%}")
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            for schema in (TEXT_SCHEMA, KEY_SCHEMA):
+                cur.execute(sql.SQL("DROP SCHEMA IF EXISTS {0} CASCADE").format(sql.Identifier(schema)))
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
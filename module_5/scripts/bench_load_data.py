@@ -0,0 +1,118 @@
+"""Compare load_data.load_json_data rows/sec across load modes.
+
+Generates a synthetic GradCafe JSON Lines file (default: one million rows),
+then loads it once per mode into a fresh ``applicants`` table in a scratch
+schema and reports wall time and rows/sec. Uses the same DATABASE_URL /
+DB_* settings as the loader.
+
+Usage:
+    python scripts/bench_load_data.py [--rows 1000000] [--modes insert,copy]
+    python scripts/bench_load_data.py --workers 1,2,4
+    python scripts/bench_load_data.py --pipeline    # parse and write on separate threads
+    python scripts/bench_load_data.py --file ../llm_extend_applicant_data.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data  # pylint: disable=wrong-import-position
+
+SCHEMA = "load_bench"
+
+_STATUSES = ("Accepted", "Rejected", "Wait listed", "Interview")
+_TERMS = ("Fall 2024", "Spring 2025", "Fall 2025", "Fall 2026")
+_DEGREES = ("PhD", "Masters")
+_UNIS = ("Stanford University", "MIT", "Johns Hopkins University", "University of Toronto")
+_PROGS = ("Computer Science", "Mathematics", "Public Health", "Economics")
+
+
+def write_synthetic(path, rows, seed=7):
+    """Write ``rows`` GradCafe-shaped JSON lines to ``path``."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(1, rows + 1):
+            uni, prog = rng.choice(_UNIS), rng.choice(_PROGS)
+            f.write(json.dumps({
+                "url": f"https://www.thegradcafe.com/survey/result/{i}",
+                "program": f"{prog}, {uni}",
+                "comments": "synthetic row" if i % 3 else None,
+                "date_added": f"January {1 + i % 28}, 2026",
+                "applicant_status": rng.choice(_STATUSES),
+                "semester_year_start": rng.choice(_TERMS),
+                "citizenship": rng.choice(("American", "International")),
+                "gpa": f"GPA {rng.uniform(2.5, 4.0):.2f}",
+                "gre": f"GRE {rng.randint(290, 340)}",
+                "gre_v": f"GRE V {rng.randint(140, 170)}",
+                "gre_aw": f"GRE AW {rng.choice((3.0, 3.5, 4.0, 4.5))}",
+                "masters_or_phd": rng.choice(_DEGREES),
+                "llm-generated-program": prog,
+                "llm-generated-university": uni,
+            }) + "\n")
+
+
+def run_mode(conn, path, mode, workers, pipeline=False):
+    """Load ``path`` into an empty applicants table and return (rows, seconds)."""
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        cur.execute(f"SET search_path TO {SCHEMA}")
+    conn.commit()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        load_data.create_applicants_table(conn)
+        started = time.perf_counter()
+        if workers > 1:
+            # Worker processes find the scratch schema through libpq's PGOPTIONS
+            os.environ["PGOPTIONS"] = f"-c search_path={SCHEMA}"
+            rows = load_data.load_json_data_parallel(path, conn, workers, mode=mode, pipeline=pipeline)
+        else:
+            rows = load_data.load_json_data(path, conn, mode=mode, pipeline=pipeline)
+        seconds = time.perf_counter() - started
+    if pipeline:
+        print("  " + next(ln for ln in log.getvalue().splitlines() if ln.startswith("Pipeline:")))
+    return rows, seconds
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark load_json_data modes.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--modes", default=",".join(load_data.LOAD_MODES))
+    parser.add_argument("--workers", default="1", help="Comma-separated worker counts to try.")
+    parser.add_argument("--pipeline", action="store_true", help="Parse on a separate thread from the writer.")
+    parser.add_argument("--file", default=None, help="Existing JSON Lines file instead of synthetic rows.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, "applicants.jsonl")
+            started = time.perf_counter()
+            write_synthetic(path, args.rows)
+            print(f"generated {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+        conn = load_data.get_connection()
+        try:
+            print(f"{'mode':>8} {'workers':>8} {'rows':>10} {'seconds':>9} {'rows/s':>10}")
+            for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+                for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+                    rows, seconds = run_mode(conn, path, mode, workers, args.pipeline)
+                    print(f"{mode:>8} {workers:>8} {rows:>10} {seconds:>9.2f} {rows / seconds:>10.0f}")
+        finally:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            conn.commit()
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
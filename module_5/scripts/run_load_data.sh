@@ -22,4 +22,4 @@ echo "==================================="
 echo ""
 
 # Run the data loader
-python src/load_data.py
+python src/load_data.py "$@"
@@ -83,7 +83,7 @@ setup(
     },
     include_package_data=True,
     package_data={
-        '': ['templates/*.html', 'static/css/*.css'],
+        '': ['templates/*.html', 'static/css/*.css', 'canon_*.txt'],
     },
     zip_safe=False,
 )
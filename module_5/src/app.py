@@ -47,6 +47,7 @@ from datetime import datetime
 from flask import Flask, render_template, jsonify
 
 import load_data
+import load_partitions
 import query_data
 
 app = Flask(__name__)
@@ -308,6 +309,15 @@ def pull_data():
             inserted = 0
             skipped = 0
 
+            # A table partitioned by term needs a partition for every new term
+            load_partitions.ensure_partitions(conn, {
+                load_data.clean_string(_safe_str(entry.get('start_term'), 50))
+                for entry in scraped_data if isinstance(entry, dict)
+            })
+
+            # Status, degree and citizenship are stored as dimension keys
+            interner = load_data.make_interner()
+
             for entry in scraped_data:
                 try:
                     # Extract p_id from URL
@@ -348,7 +358,8 @@ def pull_data():
                     # table/column identifiers are quoted by the driver; values
                     # remain as %s parameters so the driver handles escaping.
                     cursor = conn.cursor()
-                    cursor.execute(load_data.APPLICANT_INSERT, record)
+                    row = interner.encode(cursor, [record])[0]
+                    cursor.execute(load_data.APPLICANT_INSERT, row)
 
                     if cursor.rowcount > 0:
                         inserted += 1
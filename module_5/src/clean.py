@@ -31,8 +31,14 @@ Example:
 
         python clean.py --input raw.json --output clean.json --standardize
 
+    Rules-first standardization (LLM only for low-confidence rows)::
+
+        python clean.py --input raw.json --output clean.json --standardize --standardize-mode rules
+
 Attributes:
     DEFAULT_LLM_API_URL (str): Default LLM API endpoint from environment
+    CANON_UNIS_PATH (str): Canonical university list used by the rules mode
+    CANON_PROGS_PATH (str): Canonical program list used by the rules mode
 
 Functions:
     Public:
@@ -46,6 +52,10 @@ Functions:
         - _clean_record: Clean a single data record
         - _clean_comment_text: Remove badges from comments
         - _standardize_with_llm: Use LLM to standardize names
+        - _record_key: Stable identity for resumable standardization
+        - _compact_progress: Write final output and drop the progress log
+        - _standardize_with_rules: Offline canonical-list standardization
+        - ReplicaPool: Load balancing and hedging across standardizer replicas
 
 See Also:
     - :mod:`scrape`: For generating raw data to clean
@@ -55,11 +65,21 @@ See Also:
 from __future__ import annotations
 
 import argparse
+import difflib
+import functools
+import hashlib
 import json
 import re
+import threading
+import time
 import warnings
 import os
-from typing import Any, Dict, Iterable, List, Optional
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import ExitStack
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import urllib3
 from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
@@ -72,6 +92,36 @@ _http = urllib3.PoolManager()
 # Default LLM API URL from environment variable
 DEFAULT_LLM_API_URL = os.environ.get('LLM_API_URL', 'http://localhost:8000/standardize')
 
+# Canonical name lists, one name per line. Copies of module_2/llm_hosting's lists,
+# packaged with this module; test_canonical_lists_match_llm_hosting keeps them equal
+CANON_UNIS_PATH = os.environ.get(
+    'CANON_UNIS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'canon_universities.txt')
+)
+CANON_PROGS_PATH = os.environ.get(
+    'CANON_PROGS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'canon_programs.txt')
+)
+
+# Rows whose rules confidence is below this are sent to the LLM service
+DEFAULT_CONFIDENCE_THRESHOLD = 0.9
+
+# Deterministic fixes mirrored from the llm_hosting standardizer
+ABBREV_UNI: Dict[str, str] = {
+    r"(?i)^mcg(\.|ill)?$": "McGill University",
+    r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
+    r"(?i)^uoft$": "University of Toronto",
+}
+
+COMMON_UNI_FIXES: Dict[str, str] = {
+    "McGiill University": "McGill University",
+    "Mcgill University": "McGill University",
+    "University Of British Columbia": "University of British Columbia",
+}
+
+COMMON_PROG_FIXES: Dict[str, str] = {
+    "Mathematic": "Mathematics",
+    "Info Studies": "Information Studies",
+}
+
 
 def _validate_file_path(path: str, operation: str = "access") -> str:
     """Validate file path to prevent path traversal attacks.
@@ -264,20 +314,237 @@ def save_data(data: List[Dict[str, Any]], path: str) -> None:
         json.dump(data, fh, indent=2, ensure_ascii=False)
 
 
+def _parse_api_urls(value: str) -> List[str]:
+    """Split a comma-separated list of standardizer URLs."""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+class NoHealthyReplicas(RuntimeError):
+    """Raised when every replica stayed ejected for the pool's whole ``max_wait``."""
+
+
+class ReplicaPool:  # pylint: disable=too-many-instance-attributes
+    """Client-side load balancer over several standardizer replicas.
+
+    Each request goes to the healthy replica with the fewest outstanding
+    requests. A replica that errors or answers 5xx is ejected for
+    ``eject_seconds`` and only re-admitted once its ``GET /`` liveness check
+    passes. With ``hedge=True``, a request still running after the p95 of
+    recent latencies is duplicated to a second replica and the first
+    successful answer wins. When every replica is ejected, a request waits
+    with exponential backoff for one to be re-admitted, for at most
+    ``max_wait`` seconds, and then raises :class:`NoHealthyReplicas`.
+
+    Args:
+        urls: Standardizer endpoint URLs (e.g. ``http://host:8000/standardize``)
+        hedge: Send a hedged duplicate for requests slower than the p95 budget
+        eject_seconds: How long an ejected replica is skipped before re-probing
+        max_in_flight: Expected number of concurrent callers (sizes the hedge threads)
+        max_wait: Longest a request waits for a healthy replica
+    """
+
+    # Latency samples needed before the p95 hedge budget is trusted
+    MIN_HEDGE_SAMPLES = 20
+
+    # First pause while waiting for an ejected replica; doubles up to eject_seconds
+    WAIT_BACKOFF = 0.5
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, urls: List[str], hedge: bool = False, eject_seconds: float = 30.0, max_in_flight: int = 1,
+        max_wait: float = 120.0
+    ):
+        if not urls:
+            raise ValueError("ReplicaPool needs at least one URL")
+        self.urls = list(urls)
+        self.hedge = hedge
+        self.eject_seconds = eject_seconds
+        self.max_wait = max_wait
+        self.outstanding = {url: 0 for url in self.urls}
+        self.ejected_until = {url: 0.0 for url in self.urls}
+        self.probing: set = set()
+        self.latencies: deque = deque(maxlen=256)
+        self._lock = threading.Lock()
+        self._next = 0
+        self._executor = ThreadPoolExecutor(max_workers=2 * max(1, max_in_flight)) if hedge else None
+
+    def __str__(self) -> str:
+        return ", ".join(self.urls)
+
+    @staticmethod
+    def _health_check(url: str) -> bool:
+        """Return True if the replica's ``GET /`` liveness check answers 200."""
+        parts = urlsplit(url)
+        try:
+            resp = _http.request("GET", f"{parts.scheme}://{parts.netloc}/", timeout=2.0, retries=False)
+        except Exception:
+            return False
+        return resp.status == 200
+
+    def _claim_probes(self, exclude: Iterable[str]) -> List[str]:
+        """Mark ejected replicas whose time is up as probing; call with the lock held."""
+        now = time.monotonic()
+        due = [
+            u for u in self.urls
+            if u not in exclude and u not in self.probing and 0.0 < self.ejected_until[u] <= now
+        ]
+        self.probing.update(due)
+        return due
+
+    def _probe(self, url: str) -> None:
+        """Health-check a claimed replica without the lock, then record the result."""
+        healthy = self._health_check(url)
+        with self._lock:
+            self.probing.discard(url)
+            self.ejected_until[url] = 0.0 if healthy else time.monotonic() + self.eject_seconds
+        if healthy:
+            print(f"[llm-pool] re-admitted {url}")
+
+    def _acquire(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """Reserve the least-loaded available replica, rotating between ties.
+
+        Ejected replicas that are due a health check are claimed under the
+        lock and probed after releasing it, so a slow ``GET /`` does not
+        stall other callers; a replica being probed is skipped by them.
+        """
+        with self._lock:
+            due = self._claim_probes(exclude)
+        for url in due:
+            self._probe(url)
+        with self._lock:
+            order = self.urls[self._next:] + self.urls[:self._next]
+            candidates = [u for u in order if u not in exclude and not self.ejected_until[u]]
+            if not candidates:
+                return None
+            url = min(candidates, key=lambda u: self.outstanding[u])
+            self._next = (self.urls.index(url) + 1) % len(self.urls)
+            self.outstanding[url] += 1
+            return url
+
+    def _wait_for_replica(self) -> str:
+        """Reserve a replica, sleeping with backoff while all of them are ejected.
+
+        Raises:
+            NoHealthyReplicas: If none is re-admitted within ``max_wait``
+        """
+        deadline = time.monotonic() + self.max_wait
+        delay = self.WAIT_BACKOFF
+        warned = False
+        while True:
+            url = self._acquire()
+            if url is not None:
+                return url
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise NoHealthyReplicas(
+                    f"no healthy standardizer replicas among: {self} after waiting {self.max_wait:g}s"
+                )
+            if not warned:
+                print(f"[llm-pool] all replicas ejected; waiting up to {self.max_wait:g}s for one to recover")
+                warned = True
+            time.sleep(min(delay, remaining))
+            delay = min(2 * delay, max(self.eject_seconds, self.WAIT_BACKOFF))
+
+    def _eject(self, url: str, reason: Any) -> None:
+        """Take a replica out of rotation after a failed request."""
+        with self._lock:
+            self.ejected_until[url] = time.monotonic() + self.eject_seconds
+        print(f"[llm-pool] ejected {url}: {reason}")
+
+    def hedge_budget(self) -> Optional[float]:
+        """Return the p95 of recent latencies, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < self.MIN_HEDGE_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def _send(self, url: str, body: bytes):
+        """POST body to one replica, tracking outstanding count, latency and health."""
+        start = time.monotonic()
+        try:
+            resp = _http.request("POST", url, body=body, headers={"Content-Type": "application/json"})
+        except Exception as e:
+            self._eject(url, e)
+            raise
+        finally:
+            with self._lock:
+                self.outstanding[url] -= 1
+        if resp.status >= 500:
+            self._eject(url, f"HTTP {resp.status}")
+        else:
+            with self._lock:
+                self.latencies.append(time.monotonic() - start)
+        return resp
+
+    def _send_hedged(self, url: str, body: bytes, budget: float):
+        """Send to url and, if it outlives budget, race a duplicate on another replica."""
+        primary = self._executor.submit(self._send, url, body)
+        try:
+            return primary.result(timeout=budget)
+        except FutureTimeout:
+            pass
+        backup_url = self._acquire(exclude=(url,))
+        if backup_url is None:
+            return primary.result()
+        pending = {primary, self._executor.submit(self._send, backup_url, body)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def request(self, body: bytes):
+        """POST body to the pool and return the urllib3 response.
+
+        A failed request (exception or 5xx) is retried once on another
+        available replica. If no replica is available at first, the request
+        waits for one (see :meth:`_wait_for_replica`).
+
+        Raises:
+            NoHealthyReplicas: If no replica recovers within ``max_wait``
+        """
+        tried: List[str] = []
+        outcome: Any = None
+        for _ in range(min(2, len(self.urls))):
+            url = self._acquire(exclude=tried) if tried else self._wait_for_replica()
+            if url is None:
+                break
+            tried.append(url)
+            budget = self.hedge_budget() if self.hedge else None
+            try:
+                outcome = self._send(url, body) if budget is None else self._send_hedged(url, body, budget)
+            except Exception as e:
+                outcome = e
+                continue
+            if outcome.status < 500:
+                return outcome
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
 def _standardize_university_with_llm(
     entry: Dict[str, Any],
-    api_url: str = None
+    api_url: Union[str, ReplicaPool, None] = None
 ) -> Dict[str, Any]:
     """
     Call the LLM hosting API to standardize the university and program fields.
 
     Args:
         entry: A single entry dictionary with 'university' and 'program_name' fields
-        api_url: The URL of the LLM standardization API endpoint (uses LLM_API_URL env var if not specified)
+        api_url: The URL of the LLM standardization API endpoint (uses LLM_API_URL env var if not specified),
+            or a :class:`ReplicaPool` to balance across several endpoints
 
     Returns:
         The entry dictionary with added 'llm-generated-university' and
         'llm-generated-program' fields, or the original entry if API call fails
+
+    Raises:
+        NoHealthyReplicas: If every replica of a :class:`ReplicaPool` stayed
+            down; the remaining entries would fail the same way
     """
     if api_url is None:
         api_url = DEFAULT_LLM_API_URL
@@ -285,40 +552,274 @@ def _standardize_university_with_llm(
     try:
         # Send single entry wrapped in a list as the API expects a JSON array
         payload = json.dumps([entry]).encode("utf-8")
-        resp = _http.request(
-            "POST",
-            api_url,
-            body=payload,
-            headers={"Content-Type": "application/json"}
-        )
+        if isinstance(api_url, ReplicaPool):
+            resp = api_url.request(payload)
+        else:
+            resp = _http.request(
+                "POST",
+                api_url,
+                body=payload,
+                headers={"Content-Type": "application/json"}
+            )
 
         if resp.status == 200:
             result = json.loads(resp.data.decode("utf-8"))
-            # API returns a list, extract the first (and only) entry
+            # llm_hosting wraps its output as {"rows": [...]}; accept a bare list too
+            if isinstance(result, dict):
+                result = result.get("rows")
             if isinstance(result, list) and len(result) > 0:
                 return result[0]
         else:
             print(f"[llm-api] HTTP {resp.status} from {api_url}")
+    except NoHealthyReplicas:
+        raise
     except Exception as e:
         print(f"[llm-api] error calling {api_url}: {e}")
 
     return entry
 
 
-def _standardize_with_llm(
+def _record_key(entry: Dict[str, Any]) -> str:
+    """Return a stable identity for an entry, used to key the progress log.
+
+    GradCafe result URLs are unique per post, so the URL is used when present.
+    Otherwise the key is a SHA-1 digest of the entry's canonical JSON form.
+
+    Args:
+        entry: A single (cleaned, not yet standardized) entry dictionary
+
+    Returns:
+        Key string that is identical across runs for the same entry
+    """
+    url = entry.get("url")
+    if url:
+        return f"url:{url}"
+    canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+    return "sha1:" + hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _progress_paths(output_path: str) -> Tuple[str, str]:
+    """Return the (log, index) paths of the progress files for output_path."""
+    validated_path = _validate_file_path(output_path, operation="write")
+    return validated_path + ".progress.jsonl", validated_path + ".progress.idx"
+
+
+def _load_progress_index(index_path: str) -> Dict[str, int]:
+    """Read the sidecar index mapping record keys to log byte offsets.
+
+    Each index line is ``<offset>\t<key>``. A line is only appended after its
+    log row has been flushed, so every indexed offset points at a complete row.
+    A torn final line (crash mid-write) is truncated away and that entry is redone.
+
+    Args:
+        index_path: Path to the ``.progress.idx`` sidecar file
+
+    Returns:
+        Dict of record key -> byte offset in the progress log (empty if absent)
+    """
+    index: Dict[str, int] = {}
+    if not os.path.exists(index_path):
+        return index
+    valid_bytes = 0
+    with open(index_path, "rb") as fh:
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            valid_bytes += len(line)
+            offset, _, key = line.decode("utf-8").rstrip("\n").partition("\t")
+            index[key] = int(offset)
+    if valid_bytes < os.path.getsize(index_path):
+        os.truncate(index_path, valid_bytes)
+    return index
+
+
+def _read_progress_row(log_fh, offset: int) -> Dict[str, Any]:
+    """Read the standardized row stored at offset in the progress log."""
+    log_fh.seek(offset)
+    return json.loads(log_fh.readline())["row"]
+
+
+def _compact_progress(data: List[Dict[str, Any]], output_path: str) -> None:
+    """Write the final output file and remove the progress log and index.
+
+    The output format follows the file extension: ``.jsonl`` produces JSON
+    Lines, anything else a JSON array (same as :func:`save_data`).
+
+    Args:
+        data: Standardized entries in input order
+        output_path: Requested output file path
+    """
+    validated_path = _validate_file_path(output_path, operation="write")
+    if validated_path.endswith(".jsonl"):
+        with open(validated_path, "w", encoding="utf-8") as fh:
+            for entry in data:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    else:
+        save_data(data, validated_path)
+    for path in _progress_paths(validated_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_canon(path: str) -> Tuple[Tuple[str, ...], Dict[str, str]]:
+    """Load a canonical name list once per path.
+
+    Args:
+        path: Text file with one canonical name per line
+
+    Returns:
+        Tuple of (names, casefolded name -> name); both empty if the file is missing
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            names = tuple(line.strip() for line in fh if line.strip())
+    except FileNotFoundError:
+        print(f"[rules] canonical list not found: {path}")
+        names = ()
+    return names, {name.casefold(): name for name in names}
+
+
+def _match_canonical(name: str, path: str, cutoff: float) -> Tuple[str, float]:
+    """Map a name onto a canonical list and score the match.
+
+    Args:
+        name: Normalized name to look up
+        path: Canonical list file
+        cutoff: Minimum difflib similarity for a fuzzy match
+
+    Returns:
+        Tuple of (canonical or original name, confidence in [0, 1]). Exact
+        (case-insensitive) hits score 1.0, fuzzy hits their similarity ratio,
+        and misses 0.0.
+    """
+    if not name:
+        return name, 0.0
+    names, exact = _load_canon(path)
+    hit = exact.get(name.casefold())
+    if hit:
+        return hit, 1.0
+    matches = difflib.get_close_matches(name, names, n=1, cutoff=cutoff)
+    if not matches:
+        return name, 0.0
+    return matches[0], difflib.SequenceMatcher(None, name, matches[0]).ratio()
+
+
+def _split_program_text(entry: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the raw (program, university) pair for an entry.
+
+    Scraped entries carry ``program_name`` and ``university`` separately;
+    rows already in the llm_hosting format carry one combined ``program``
+    string such as ``"Information Studies, McGill University"``.
+    """
+    if entry.get("program_name") or entry.get("university"):
+        return entry.get("program_name") or "", entry.get("university") or ""
+    text = re.sub(r"\s+", " ", entry.get("program") or "").strip().strip(",")
+    parts = [p.strip() for p in re.split(r",| at | @ ", text) if p.strip()]
+    return (parts[0] if parts else ""), (parts[1] if len(parts) > 1 else "")
+
+
+def _standardize_with_rules(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Standardize program and university names without calling the LLM.
+
+    Applies the same abbreviation expansions, common fixes, capitalization
+    and canonical/fuzzy mapping as the llm_hosting post-normalization step.
+
+    Args:
+        entry: A single entry dictionary
+
+    Returns:
+        Copy of the entry with 'llm-generated-program', 'llm-generated-university'
+        and 'standardize-confidence' (the lower of the two match scores) added
+    """
+    prog, uni = _split_program_text(entry)
+
+    prog = COMMON_PROG_FIXES.get(prog.strip(), prog.strip()).title()
+    prog, prog_score = _match_canonical(prog, CANON_PROGS_PATH, cutoff=0.84)
+
+    uni = uni.strip()
+    for pat, full in ABBREV_UNI.items():
+        if re.fullmatch(pat, uni):
+            uni = full
+            break
+    uni = COMMON_UNI_FIXES.get(uni, uni)
+    uni = re.sub(r"\bOf\b", "of", uni.title())
+    uni, uni_score = _match_canonical(uni, CANON_UNIS_PATH, cutoff=0.86)
+
+    result = dict(entry)
+    result["llm-generated-program"] = prog
+    result["llm-generated-university"] = uni or "Unknown"
+    result["standardize-confidence"] = round(min(prog_score, uni_score), 3)
+    return result
+
+
+def _standardize_entry(
+    entry: Dict[str, Any],
+    api_url: str,
+    mode: str = "llm",
+    threshold: float = DEFAULT_CONFIDENCE_THRESHOLD
+) -> Dict[str, Any]:
+    """Standardize one entry with the LLM API or, in rules mode, rules first.
+
+    In ``"rules"`` mode the entry is only sent to the LLM API when the rules
+    confidence is below threshold. If that API call fails, the rules result
+    is kept rather than leaving the entry unstandardized.
+    """
+    if mode != "rules":
+        return _standardize_university_with_llm(entry, api_url)
+    ruled = _standardize_with_rules(entry)
+    if ruled["standardize-confidence"] >= threshold:
+        return ruled
+    standardized = _standardize_university_with_llm(entry, api_url)
+    return standardized if "llm-generated-university" in standardized else ruled
+
+
+def _append_progress(log_fh, idx_fh, key: str, row: Dict[str, Any]) -> int:
+    """Append one standardized row to the progress log and index; return its offset."""
+    log_fh.seek(0, os.SEEK_END)
+    offset = log_fh.tell()
+    line = json.dumps({"key": key, "row": row}, ensure_ascii=False) + "\n"
+    log_fh.write(line.encode("utf-8"))
+    log_fh.flush()
+    idx_fh.write(f"{offset}\t{key}\n")
+    return offset
+
+
+def _standardize_with_llm(  # pylint: disable=too-many-arguments,too-many-locals
     data: List[Dict[str, Any]],
-    api_url: str = None,
+    api_url: Union[str, ReplicaPool, None] = None,
     output_path: Optional[str] = None,
-    flush_every: int = 100
+    flush_every: int = 100,
+    *,
+    mode: str = "llm",
+    threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    concurrency: int = 1
 ) -> List[Dict[str, Any]]:
     """
     Standardize university and program fields for all entries using LLM API.
 
+    When output_path is given, every standardized entry is appended to
+    ``<output_path>.progress.jsonl`` and its byte offset to the sidecar
+    ``<output_path>.progress.idx``. Appends are O(1), so a run writes each
+    row once instead of rewriting the whole array on every checkpoint.
+    Entries whose key (see :func:`_record_key`) is already in the index are
+    read back from the log instead of being sent to the API again. An entry
+    whose API call failed is returned unchanged and not logged, so the next
+    run retries it.
+
+    With concurrency > 1, up to that many requests are in flight at once
+    (useful with a :class:`ReplicaPool`); results keep input order.
+
     Args:
         data: List of entry dictionaries
-        api_url: The URL of the LLM standardization API endpoint (uses LLM_API_URL env var if not specified)
-        output_path: If provided, save progress every flush_every entries
-        flush_every: Number of entries to process before saving progress
+        api_url: The URL of the LLM standardization API endpoint (uses LLM_API_URL env var if not specified),
+            or a :class:`ReplicaPool`
+        output_path: If provided, log progress next to this path for resumption
+        flush_every: Number of entries to process before flushing the progress log to disk
+        mode: ``"llm"`` to send every entry to the API, ``"rules"`` to resolve
+            entries offline and only send those below threshold
+        threshold: Minimum rules confidence accepted without an API call
+        concurrency: Maximum number of API requests in flight
 
     Returns:
         List of entries with added 'llm-generated-university' and
@@ -327,17 +828,50 @@ def _standardize_with_llm(
     if api_url is None:
         api_url = DEFAULT_LLM_API_URL
 
-    results = []
-    for i, entry in enumerate(data, 1):
-        standardized = _standardize_university_with_llm(entry, api_url)
-        results.append(standardized)
-        if i % 10 == 0:
-            print(f"[standardize] processed {i}/{len(data)} entries")
-        # Flush to disk every flush_every entries
-        if output_path and i % flush_every == 0:
-            save_data(results, output_path)
-            print(f"[standardize] flushed progress to {output_path}")
+    index: Dict[str, int] = {}
+    log_fh = idx_fh = None
+    log_path = None
+    results: List[Dict[str, Any]] = []
+    failed = 0
+    chunk_size = max(1, concurrency) * 4 if concurrency > 1 else 1
+
+    with ExitStack() as stack:
+        if output_path:
+            log_path, index_path = _progress_paths(output_path)
+            index = _load_progress_index(index_path)
+            if index:
+                print(f"[standardize] resuming: {len(index)} entries already in {log_path}")
+            log_fh = stack.enter_context(open(log_path, "a+b"))
+            idx_fh = stack.enter_context(open(index_path, "a", encoding="utf-8"))
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, concurrency)))
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start:start + chunk_size]
+            keys = [_record_key(entry) for entry in chunk] if log_fh else [None] * len(chunk)
+            todo = [key not in index for key in keys]
+            standardized = executor.map(
+                lambda entry: _standardize_entry(entry, api_url, mode, threshold),
+                [entry for entry, pending in zip(chunk, todo) if pending],
+            )
+            for i, (key, pending) in enumerate(zip(keys, todo), start + 1):
+                if not pending:
+                    results.append(_read_progress_row(log_fh, index[key]))
+                    continue
+                row = next(standardized)
+                results.append(row)
+                if "llm-generated-university" not in row:
+                    failed += 1  # left out of the log so a rerun tries it again
+                elif log_fh:
+                    index[key] = _append_progress(log_fh, idx_fh, key, row)
+                if i % 10 == 0:
+                    print(f"[standardize] processed {i}/{len(data)} entries")
+                if log_fh and i % flush_every == 0:
+                    idx_fh.flush()
+                    os.fsync(log_fh.fileno())
+                    print(f"[standardize] flushed progress to {log_path}")
     print(f"[standardize] completed {len(results)} entries")
+    if failed:
+        print(f"[standardize] {failed} entries could not be standardized; rerun to retry them")
     return results
 
 
@@ -345,8 +879,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Clean and standardize GradCafe application data")
     parser.add_argument("--input", help="Input JSON file", default="applicant_data.json")
     parser.add_argument("--output", help="Output JSON file", default="applicant_data_clean.json")
-    parser.add_argument("--api", help="LLM API URL", default="http://localhost:8000/standardize")
+    parser.add_argument("--api", help="LLM API URL, or several comma-separated replica URLs",
+                        default=DEFAULT_LLM_API_URL)
     parser.add_argument("--standardize", action="store_true", help="Standardize university/program with LLM")
+    parser.add_argument("--standardize-mode", choices=["llm", "rules"], default="llm",
+                        help="llm: send every entry to the API; rules: canonical lists first, API for the rest")
+    parser.add_argument("--confidence-threshold", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD,
+                        help="Minimum rules confidence accepted without an API call (rules mode)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Requests in flight at once (default: one per API URL)")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Duplicate requests slower than the observed p95 to another replica")
     args = parser.parse_args()
 
     print(f"[clean] loading data from {args.input}")
@@ -356,18 +899,20 @@ if __name__ == "__main__":
     cleaned_data = clean_data(raw_data)
 
     if args.standardize:
-        print(f"[clean] standardizing with LLM API at {args.api}")
-        # Check if output already exists and resume from there
-        if os.path.exists(args.output):
-            print(f"[clean] resuming from existing {args.output}")
-            existing = load_data(args.output)
-            # Skip entries that already have LLM fields
-            existing_count = len([e for e in existing if 'llm-generated-university' in e])
-            if existing_count > 0:
-                print(f"[clean] found {existing_count} already processed entries")
-                cleaned_data = existing + cleaned_data[existing_count:]
-        cleaned_data = _standardize_with_llm(cleaned_data, args.api, output_path=args.output, flush_every=100)
-
-    print(f"[clean] saving to {args.output}")
-    save_data(cleaned_data, args.output)
+        print(f"[clean] standardizing ({args.standardize_mode} mode) with LLM API at {args.api}")
+        api_urls = _parse_api_urls(args.api)
+        workers = args.concurrency or len(api_urls)
+        api = args.api
+        if len(api_urls) > 1 or args.hedge:
+            api = ReplicaPool(api_urls, hedge=args.hedge, max_in_flight=workers)
+        # Progress is appended to <output>.progress.jsonl; a rerun skips keys already logged
+        cleaned_data = _standardize_with_llm(
+            cleaned_data, api, output_path=args.output, flush_every=100,
+            mode=args.standardize_mode, threshold=args.confidence_threshold, concurrency=workers,
+        )
+        print(f"[clean] compacting progress into {args.output}")
+        _compact_progress(cleaned_data, args.output)
+    else:
+        print(f"[clean] saving to {args.output}")
+        save_data(cleaned_data, args.output)
     print("Done.")
@@ -1,14 +1,15 @@
-"""Shared database connection utility.
+"""Shared database utilities.
 
 Provides a single :func:`get_connection` function used by both
 :mod:`load_data` and :mod:`query_data` to avoid duplicating connection
-parameter logic.
+parameter logic, and :func:`verify_data`, the summary printed after a load.
 """
 
 import os
 from urllib.parse import urlparse
 
 import psycopg
+from psycopg import sql
 
 
 def get_connection():
@@ -54,3 +55,54 @@ def get_connection():
             conn_params['password'] = os.environ.get('DB_PASSWORD')
 
     return psycopg.connect(**conn_params)
+
+
+def verify_data(conn):
+    """Verify loaded data by displaying database statistics.
+
+    Prints summary statistics including:
+        - Total record count
+        - Sample records
+        - Distribution of application statuses
+
+    Args:
+        conn (psycopg.Connection): Active database connection
+
+    Returns:
+        None
+
+    Note:
+        This function only prints to stdout and doesn't modify the database.
+    """
+    cursor = conn.cursor()
+
+    # Count total records
+    cursor.execute("SELECT COUNT(*) FROM applicants;")
+    total = cursor.fetchone()[0]
+    print(f"\nTotal records in database: {total}")
+
+    # Show sample records
+    cursor.execute("SELECT * FROM applicants LIMIT 5;")
+    print("\nSample records:")
+    for row in cursor.fetchall():
+        print(f"  p_id: {row[0]}, program: {row[1][:50]}...")
+
+    # Show statistics by status, counted per key (LIMIT caps the rows returned)
+    _status_stmt = sql.SQL(
+        "SELECT s.name, c.n FROM ("
+        "SELECT {status}, COUNT(*) AS n FROM {table}"
+        " WHERE {status} IS NOT NULL GROUP BY {status}"
+        ") c JOIN {statuses} s ON s.id = c.{status}"
+        " ORDER BY c.n DESC"
+        " LIMIT 100"
+    ).format(
+        table=sql.Identifier("applicants"),
+        status=sql.Identifier("status_id"),
+        statuses=sql.Identifier("statuses"),
+    )
+    cursor.execute(_status_stmt)
+    print("\nRecords by status:")
+    for status, count in cursor.fetchall():
+        print(f"  {status}: {count}")
+
+    cursor.close()
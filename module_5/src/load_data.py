@@ -6,6 +6,20 @@ database schema creation.
 
 The module supports both batch loading from JSON files and individual record insertion.
 It automatically handles duplicate entries using PostgreSQL's ON CONFLICT clause.
+Batches are written either with ``executemany`` (``insert`` mode, the default) or
+streamed with binary ``COPY`` into a staging table and merged in one statement
+(``copy`` mode), which is much faster for large files. Large files can also be
+split into line-aligned byte ranges that are loaded by several processes at once,
+each on its own connection (:func:`load_json_data_parallel`). With ``pipeline``
+enabled, parsing runs on its own thread and hands batches to the writer through a
+bounded queue, so decoding and database round trips overlap. With ``upsert``
+enabled, every row carries a digest of its values (``row_hash``) and rows that
+already exist are rewritten only when that digest changed. With ``incremental``
+enabled, the ``load_manifest`` table (:mod:`load_manifest`) records how far
+each file was loaded, so a file that only grew is loaded from where the last
+run stopped and an unchanged file is skipped. When ``applicants`` is
+partitioned by term (:mod:`load_partitions`), each batch first creates the
+partitions of any terms it introduces.
 
 Example:
     Load data from a JSON file::
@@ -27,38 +41,150 @@ See Also:
     - :mod:`scrape`: For web scraping applicant data
 """
 
+import argparse
+import functools
+import hashlib
 import json
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 import psycopg
 from psycopg import sql
 
-from db import get_connection
+import load_dimensions
+import load_manifest
+import load_partitions
+from db import get_connection, verify_data
+from load_pipeline import print_pipeline_stats, run_pipeline
+
+try:
+    import orjson
+except ImportError:  # optional: the standard json module is used instead
+    orjson = None
+
+# Line decoder for the loader. orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so callers catch the same exception either way.
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # Maximum rows returned by any SELECT that supports a caller-supplied limit.
 _LIMIT_MAX = 100
 
-# Column order shared by load_json_data and app.pull_data.
-_APPLICANT_COLS = (
+# Field order of parsed records (build_record), shared with app.pull_data.
+_RECORD_FIELDS = (
     "p_id", "program", "comments", "date_added", "url", "status", "term",
     "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
     "llm_generated_program", "llm_generated_university",
 )
+# Stored column order: fields with a dimension table become integer keys
+# (status_id, ..., university_id; see load_dimensions).
+_APPLICANT_COLS = load_dimensions.key_columns(_RECORD_FIELDS)
+_TERM_INDEX = _APPLICANT_COLS.index("term")
 
 # Composed INSERT statement: table/column identifiers are quoted by psycopg;
-# values stay as %s placeholders so the driver handles escaping.
+# values stay as %s placeholders so the driver handles escaping. ON CONFLICT
+# has no target so it matches the key of either layout (p_id, or p_id and
+# term when partitioned; see load_partitions).
 APPLICANT_INSERT = sql.SQL(
     "INSERT INTO {table} ({cols}) VALUES ({vals})"
-    " ON CONFLICT ({pk}) DO NOTHING"
+    " ON CONFLICT DO NOTHING"
 ).format(
     table=sql.Identifier("applicants"),
     cols=sql.SQL(", ").join(map(sql.Identifier, _APPLICANT_COLS)),
     vals=sql.SQL(", ").join(sql.Placeholder() for _ in _APPLICANT_COLS),
-    pk=sql.Identifier("p_id"),
 )
 
+# Upsert mode also loads row_hash, a digest of the other values (record_hash).
+_UPSERT_COLS = _APPLICANT_COLS + ("row_hash",)
+
+# Conflict clause for upserts. The WHERE skips rows whose stored hash already
+# matches, so an unchanged row is not rewritten (no new row version, no WAL).
+# DO UPDATE needs a target; both layouts name their key applicants_pkey.
+_UPSERT_CONFLICT = sql.SQL(
+    " ON CONFLICT ON CONSTRAINT {pk} DO UPDATE SET {updates}"
+    " WHERE {table}.{row_hash} IS DISTINCT FROM EXCLUDED.{row_hash}"
+).format(
+    pk=sql.Identifier("applicants_pkey"),
+    updates=sql.SQL(", ").join(
+        sql.SQL("{col} = EXCLUDED.{col}").format(col=sql.Identifier(col)) for col in _UPSERT_COLS[1:]
+    ),
+    table=sql.Identifier("applicants"),
+    row_hash=sql.Identifier("row_hash"),
+)
+
+APPLICANT_UPSERT = sql.SQL("INSERT INTO {table} ({cols}) VALUES ({vals})").format(
+    table=sql.Identifier("applicants"),
+    cols=sql.SQL(", ").join(map(sql.Identifier, _UPSERT_COLS)),
+    vals=sql.SQL(", ").join(sql.Placeholder() for _ in _UPSERT_COLS),
+) + _UPSERT_CONFLICT
+
+# Rows per commit for each load mode; COPY amortizes the merge over larger batches.
+_BATCH_SIZES = {"insert": 1000, "copy": 50000}
+LOAD_MODES = tuple(_BATCH_SIZES)
+
+# PostgreSQL type of each column in _APPLICANT_COLS order (binary COPY needs them).
+_APPLICANT_TYPES = (
+    "int4", "text", "text", "date", "text", "int2", "text",
+    "int2", "float4", "float4", "float4", "float4", "int2",
+    "int4", "int4",
+)
+_UPSERT_TYPES = _APPLICANT_TYPES + ("bytea",)
+
+_STAGING_IDENT = sql.Identifier("applicants_staging")
+
+# Temporary tables are not WAL-logged and are private to the session, so
+# concurrent loaders never see each other's staged rows. ON COMMIT DELETE ROWS
+# empties the table after every merged batch.
+_STAGING_CREATE = sql.SQL(
+    "CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table})"
+    " ON COMMIT DELETE ROWS"
+).format(staging=_STAGING_IDENT, table=sql.Identifier("applicants"))
+
+_STAGING_COPY = sql.SQL(
+    "COPY {staging} ({cols}) FROM STDIN (FORMAT BINARY)"
+).format(
+    staging=_STAGING_IDENT,
+    cols=sql.SQL(", ").join(map(sql.Identifier, _APPLICANT_COLS)),
+)
+
+_STAGING_MERGE = sql.SQL(
+    "INSERT INTO {table} ({cols}) SELECT {cols} FROM {staging}"
+    " ON CONFLICT DO NOTHING"
+).format(
+    table=sql.Identifier("applicants"),
+    cols=sql.SQL(", ").join(map(sql.Identifier, _APPLICANT_COLS)),
+    staging=_STAGING_IDENT,
+)
+
+_STAGING_COPY_UPSERT = sql.SQL(
+    "COPY {staging} ({cols}) FROM STDIN (FORMAT BINARY)"
+).format(
+    staging=_STAGING_IDENT,
+    cols=sql.SQL(", ").join(map(sql.Identifier, _UPSERT_COLS)),
+)
+
+# ON CONFLICT DO UPDATE may not touch the same row twice in one statement, so
+# only the last staged copy of each p_id is merged (ctid follows COPY order).
+_STAGING_UPSERT = sql.SQL(
+    "INSERT INTO {table} ({cols}) SELECT DISTINCT ON ({pk}) {cols} FROM {staging}"
+    " ORDER BY {pk}, ctid DESC"
+).format(
+    table=sql.Identifier("applicants"),
+    cols=sql.SQL(", ").join(map(sql.Identifier, _UPSERT_COLS)),
+    staging=_STAGING_IDENT,
+    pk=sql.Identifier("p_id"),
+) + _UPSERT_CONFLICT
+
+
+# Patterns used for every loaded line, compiled once.
+_NUMERIC_RE = re.compile(r'(\d+\.?\d*)')
+_P_ID_RE = re.compile(r'/result/(\d+)')
+
+# Distinct date_added strings remembered by parse_date (they repeat heavily).
+_DATE_CACHE_SIZE = 4096
+
 
 def _parse_numeric_str(s):
     """Extract the first numeric value from a string.
@@ -71,7 +197,7 @@ def _parse_numeric_str(s):
     """
     if not s:
         return None
-    match = re.search(r'(\d+\.?\d*)', s)
+    match = _NUMERIC_RE.search(s)
     return float(match.group(1)) if match else None
 
 
@@ -139,6 +265,15 @@ def parse_date(date_str):
     """
     if not date_str:
         return None
+    return _parse_date_cached(date_str)
+
+
+@functools.lru_cache(maxsize=_DATE_CACHE_SIZE)
+def _parse_date_cached(date_str):
+    """``strptime`` behind :func:`parse_date`, memoized per distinct string.
+
+    ``date`` objects are immutable, so sharing cached results is safe.
+    """
     try:
         return datetime.strptime(date_str, '%B %d, %Y').date()
     except ValueError:
@@ -163,7 +298,7 @@ def extract_p_id_from_url(url):
     """
     if not url:
         return None
-    match = re.search(r'/result/(\d+)', url)
+    match = _P_ID_RE.search(url)
     return int(match.group(1)) if match else None
 
 
@@ -188,7 +323,40 @@ def clean_string(s):
     return s.replace('\x00', '')
 
 
-def create_applicants_table(conn):
+# Columns after p_id, shared by both table layouts.
+_APPLICANT_COLUMNS_DDL = """
+    program TEXT,
+    comments TEXT,
+    date_added DATE,
+    url TEXT,
+    status_id SMALLINT,
+    term TEXT,
+    citizenship_id SMALLINT,
+    gpa REAL,
+    gre REAL,
+    gre_v REAL,
+    gre_aw REAL,
+    degree_id SMALLINT,
+    program_id INTEGER,
+    university_id INTEGER,
+    row_hash BYTEA
+"""
+
+
+def _create_table(cursor, partitioned):
+    """Run the DDL of :func:`create_applicants_table`; the caller commits."""
+    load_dimensions.create_dimension_tables(cursor)
+    if partitioned:
+        load_partitions.create_partitioned_table(cursor, _APPLICANT_COLUMNS_DDL)
+    else:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS applicants (p_id INTEGER PRIMARY KEY, {_APPLICANT_COLUMNS_DDL});"
+            " ALTER TABLE applicants ADD COLUMN IF NOT EXISTS row_hash BYTEA;"
+        )
+    load_dimensions.convert_text_columns(cursor)
+
+
+def create_applicants_table(conn, partitioned=False):
     """Create the applicants table in the database if it doesn't exist.
 
     Creates a table with the following schema:
@@ -197,19 +365,27 @@ def create_applicants_table(conn):
         - comments (TEXT): Applicant comments
         - date_added (DATE): Date the entry was posted
         - url (TEXT): Source URL from GradCafe
-        - status (TEXT): Application status (Accepted, Rejected, etc.)
+        - status_id (SMALLINT): Application status (Accepted, Rejected, etc.)
         - term (TEXT): Start term (e.g., 'Fall 2026')
-        - us_or_international (TEXT): Citizenship status
+        - citizenship_id (SMALLINT): Citizenship status
         - gpa (REAL): Grade Point Average
         - gre (REAL): GRE total score
         - gre_v (REAL): GRE verbal score
         - gre_aw (REAL): GRE analytical writing score
-        - degree (TEXT): Degree type (PhD, Masters)
-        - llm_generated_program (TEXT): LLM-standardized program name
-        - llm_generated_university (TEXT): LLM-standardized university name
+        - degree_id (SMALLINT): Degree type (PhD, Masters)
+        - program_id (INTEGER): LLM-standardized program name
+        - university_id (INTEGER): LLM-standardized university name
+        - row_hash (BYTEA): Digest of the other columns, set by upsert loads
+
+    The ``*_id`` columns are keys into the dimension tables created alongside
+    (:mod:`load_dimensions`). A table from before they existed, which stores
+    the names as text, is converted in place.
 
     Args:
         conn (psycopg.Connection): Active database connection
+        partitioned (bool): Create the table list-partitioned by term, keyed
+            on ``(p_id, term)`` (see :mod:`load_partitions`). An existing
+            table is left as it is; ``migrate.py --partition`` converts one.
 
     Returns:
         None
@@ -217,35 +393,303 @@ def create_applicants_table(conn):
     Note:
         This function is idempotent - it can be called multiple times safely.
     """
-    create_table_query = """
-    CREATE TABLE IF NOT EXISTS applicants (
-        p_id INTEGER PRIMARY KEY,
-        program TEXT,
-        comments TEXT,
-        date_added DATE,
-        url TEXT,
-        status TEXT,
-        term TEXT,
-        us_or_international TEXT,
-        gpa REAL,
-        gre REAL,
-        gre_v REAL,
-        gre_aw REAL,
-        degree TEXT,
-        llm_generated_program TEXT,
-        llm_generated_university TEXT
-    );
-    """
-
     cursor = conn.cursor()
     print("Creating applicants table if it doesn't exist...")
-    cursor.execute(create_table_query)
+    _create_table(cursor, partitioned)
     conn.commit()
     cursor.close()
     print("Table 'applicants' is ready.")
 
 
-def load_json_data(json_file_path, conn):
+def build_record(data):
+    """Map one decoded JSON Lines entry to an ``applicants`` row.
+
+    Args:
+        data (dict): One entry as written by the scraper/LLM pipeline
+
+    Returns:
+        tuple: Values in ``_RECORD_FIELDS`` order, or None when no p_id can
+        be extracted from the entry's URL
+
+    Example:
+        >>> build_record({'url': '/result/7', 'gpa': 'GPA 3.9'})[:1]
+        (7,)
+    """
+    get = data.get
+    url = get('url')
+    p_id = extract_p_id_from_url(url)
+    if not p_id:
+        return None
+    # _parse_numeric_str is what parse_gpa/parse_gre_score call; skipping the
+    # wrappers saves four calls per row.
+    return (
+        p_id,
+        clean_string(get('program')),
+        clean_string(get('comments')),
+        parse_date(get('date_added')),
+        clean_string(url),
+        clean_string(get('applicant_status')),
+        clean_string(get('semester_year_start')),
+        clean_string(get('citizenship')),
+        _parse_numeric_str(get('gpa')),
+        _parse_numeric_str(get('gre')),
+        _parse_numeric_str(get('gre_v')),
+        _parse_numeric_str(get('gre_aw')),
+        clean_string(get('masters_or_phd')),
+        clean_string(get('llm-generated-program')),
+        clean_string(get('llm-generated-university')),
+    )
+
+
+def record_hash(record):
+    """Return a 16-byte digest of an ``applicants`` row for change detection.
+
+    Args:
+        record (tuple): Values in ``_RECORD_FIELDS`` order, as from :func:`build_record`
+
+    Returns:
+        bytes: BLAKE2b digest of the row's ``repr``; equal rows give equal digests
+    """
+    return hashlib.blake2b(repr(record).encode("utf-8"), digest_size=16).digest()
+
+
+def make_interner():
+    """Return a :class:`load_dimensions.Interner` for :func:`build_record` records.
+
+    Shared with ``app.pull_data``, which builds records in the same order.
+    """
+    return load_dimensions.Interner(_RECORD_FIELDS)
+
+
+def _insert_batch(cursor, records, upsert=False):
+    """Insert one batch with ``executemany``; the caller commits.
+
+    Args:
+        cursor (psycopg.Cursor): Cursor on ``conn``
+        records (list[tuple]): Rows in ``_APPLICANT_COLS`` order
+            (``_UPSERT_COLS`` when ``upsert`` is set)
+        upsert (bool): Update changed rows instead of skipping existing ones
+    """
+    cursor.executemany(APPLICANT_UPSERT if upsert else APPLICANT_INSERT, records)
+
+
+def _copy_batch(cursor, records, upsert=False):
+    """COPY one batch into the staging table and merge it; the caller commits.
+
+    Rows are streamed in binary format, then moved into ``applicants`` with a
+    single ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``, or
+    ``DO UPDATE`` for changed rows when ``upsert`` is set.
+
+    Args:
+        cursor (psycopg.Cursor): Cursor on ``conn``
+        records (list[tuple]): Rows in ``_APPLICANT_COLS`` order
+            (``_UPSERT_COLS`` when ``upsert`` is set)
+        upsert (bool): Update changed rows instead of skipping existing ones
+
+    Returns:
+        int: Number of rows actually written (new rows, plus changed rows
+        when upserting)
+    """
+    with cursor.copy(_STAGING_COPY_UPSERT if upsert else _STAGING_COPY) as copy:
+        copy.set_types(_UPSERT_TYPES if upsert else _APPLICANT_TYPES)
+        for record in records:
+            copy.write_row(record)
+    cursor.execute(_STAGING_UPSERT if upsert else _STAGING_MERGE)
+    return cursor.rowcount
+
+
+def _iter_batches(f, end, batch_size, counts, hashed=False):
+    """Parse JSON lines from ``f`` into batches of applicant records.
+
+    Reading starts at the current position of ``f`` and stops at the first
+    line that starts at or after ``end``. Unparseable lines are reported and
+    counted in ``counts["skipped"]``; ``counts["lines"]`` counts every line
+    read and ``counts["offset"]`` is the byte offset just past the last
+    newline-terminated line read. Line numbers in warnings count from the
+    starting position.
+
+    Args:
+        f (BinaryIO): File opened in binary mode, positioned at a line start
+        end (int): Byte offset to stop before, or None for end of file
+        batch_size (int): Records per yielded batch (the last may be shorter)
+        counts (dict): Running ``lines``/``skipped``/``offset`` counters,
+            updated in place
+        hashed (bool): Append :func:`record_hash` to every record
+
+    Yields:
+        tuple: ``(records, processed, offset)`` where ``records`` is a list of
+        tuples in ``_RECORD_FIELDS`` order (plus the hash if ``hashed``),
+        ``processed`` the records parsed so far and ``offset`` the value of
+        ``counts["offset"]`` after the batch's last line
+    """
+    records = []
+    pos = counts["offset"] = f.tell()
+    line_num = 0
+    for line in f:
+        if end is not None and pos >= end:
+            break
+        pos += len(line)
+        line_num += 1
+        counts["lines"] = line_num
+        if line.endswith(b"\n"):
+            # A final line without a newline may still be being written
+            counts["offset"] = pos
+        try:
+            record = build_record(_json_loads(line))
+            if record is None:
+                print(f"Warning: Could not extract p_id from line {line_num}, skipping.")
+                counts["skipped"] += 1
+                continue
+
+            records.append(record + (record_hash(record),) if hashed else record)
+
+            # Hand off a batch every batch_size records
+            if len(records) >= batch_size:
+                yield records, line_num - counts["skipped"], counts["offset"]
+                records = []
+
+        except json.JSONDecodeError as e:
+            print(f"Warning: JSON decode error on line {line_num}: {e}")
+            counts["skipped"] += 1
+        except Exception as e:
+            print(f"Warning: Error processing line {line_num}: {e}")
+            counts["skipped"] += 1
+
+    # Remaining records
+    if records:
+        yield records, line_num - counts["skipped"], counts["offset"]
+
+
+def _load_range(json_file_path, conn, options, byte_range=(0, None), manifest=None):
+    """Parse and write the lines that start in bytes ``[start, end)`` of a file.
+
+    ``start`` must be 0 or the first byte of a line. Line numbers in warnings
+    count from ``start``.
+
+    Args:
+        json_file_path (str): Path to the JSON Lines file
+        conn (psycopg.Connection): Active database connection
+        options (dict): Load options from :func:`_load_options`
+        byte_range (tuple): ``(start, end)`` byte offsets; ``end`` may be None
+            for end of file
+        manifest (dict): File identity from :func:`load_manifest.file_identity`;
+            when given, each batch's end offset is committed with the batch
+
+    Returns:
+        tuple: ``(processed, skipped, inserted, offset)``; ``inserted`` counts
+        rows actually written in copy mode and is 0 in insert mode, ``offset``
+        is the byte just past the last complete line read
+    """
+    mode, upsert = options["mode"], options["upsert"]
+    cursor = conn.cursor()
+    if mode == "copy":
+        cursor.execute(_STAGING_CREATE)
+        conn.commit()
+
+    counts = {"lines": 0, "skipped": 0, "inserted": 0, "offset": byte_range[0]}
+    recorded = [byte_range[0]]
+    known_terms = set() if load_partitions.is_partitioned(conn) else None
+    interner = make_interner()
+
+    def write(batch):
+        records, processed, offset = batch
+        if known_terms is not None:
+            new_terms = {record[_TERM_INDEX] for record in records} - known_terms
+            if new_terms:
+                load_partitions.create_partitions(cursor, new_terms)
+                known_terms.update(new_terms)
+        rows = interner.encode(cursor, records)
+        # New partitions and dimension names are committed ahead of the batch,
+        # so concurrent loaders don't wait on them for a whole batch
+        conn.commit()
+        if mode == "copy":
+            counts["inserted"] += _copy_batch(cursor, rows, upsert)
+        else:
+            _insert_batch(cursor, rows, upsert)
+        if manifest is not None:
+            load_manifest.record_offset(cursor, manifest, offset)
+            recorded[0] = offset
+        conn.commit()
+        print(f"Inserted {processed} records...")
+
+    start, end = byte_range
+    with open(json_file_path, 'rb') as f:
+        f.seek(start)
+        batches = _iter_batches(f, end, _BATCH_SIZES[mode], counts, hashed=upsert)
+        if options["pipeline"]:
+            print_pipeline_stats(run_pipeline(batches, write))
+        else:
+            for batch in batches:
+                write(batch)
+
+    if manifest is not None and counts["offset"] > recorded[0]:
+        # Trailing lines that produced no records
+        load_manifest.record_offset(cursor, manifest, counts["offset"])
+        conn.commit()
+    cursor.close()
+    return counts["lines"] - counts["skipped"], counts["skipped"], counts["inserted"], counts["offset"]
+
+
+def _finish_load(conn, options, processed, skipped, inserted):
+    """Run ANALYZE after a copy-mode load and print the load summary.
+
+    Args:
+        conn (psycopg.Connection): Active database connection
+        options (dict): Load options from :func:`_load_options`
+        processed (int): Records parsed and written
+        skipped (int): Lines that could not be loaded
+        inserted (int): Rows actually written (copy mode only)
+    """
+    if options["mode"] == "copy":
+        # Fresh planner statistics after a bulk load
+        cursor = conn.cursor()
+        cursor.execute(sql.SQL("ANALYZE {table}").format(table=sql.Identifier("applicants")))
+        conn.commit()
+        cursor.close()
+
+    print("\nData loading complete!")
+    print(f"Total records processed: {processed}")
+    print(f"Records skipped: {skipped}")
+    if options["mode"] == "copy" and options["upsert"]:
+        print(f"Records inserted or updated: {inserted}")
+        print(f"Unchanged or duplicate: {processed - inserted}")
+    elif options["mode"] == "copy":
+        print(f"Records inserted: {inserted}")
+        print(f"Duplicates skipped: {processed - inserted}")
+
+
+def _load_options(mode="insert", pipeline=False, upsert=False, incremental=False):
+    """Validate the keyword options of :func:`load_json_data`.
+
+    Returns:
+        dict: ``mode``, ``pipeline``, ``upsert`` and ``incremental``
+
+    Raises:
+        ValueError: If ``mode`` is not one of :data:`LOAD_MODES`
+    """
+    if mode not in _BATCH_SIZES:
+        raise ValueError(f"Unknown load mode {mode!r}; expected one of {LOAD_MODES}")
+    return {"mode": mode, "pipeline": pipeline, "upsert": upsert, "incremental": incremental}
+
+
+def _start_incremental(json_file_path, conn):
+    """Look the file up in the load manifest.
+
+    Returns:
+        tuple: ``(identity, start)``: the file's current identity and the byte
+        offset to resume from (equal to its size if nothing new was added)
+    """
+    load_manifest.create_manifest_table(conn)
+    identity = load_manifest.file_identity(json_file_path)
+    start = load_manifest.resume_offset(conn, identity)
+    if start >= identity["size"]:
+        print(f"\n{json_file_path} is unchanged since the last load; nothing to do.")
+    elif start:
+        print(f"\nResuming {json_file_path} at byte {start} of {identity['size']}.")
+    return identity, start
+
+
+def load_json_data(json_file_path, conn, **options):
     """Load applicant data from a JSON Lines file into the database.
 
     Reads a JSON Lines file where each line is a JSON object representing
@@ -256,148 +700,205 @@ def load_json_data(json_file_path, conn):
         json_file_path (str): Path to the JSON Lines file
         conn (psycopg.Connection): Active database connection
 
+    Keyword Args:
+        mode (str): ``"insert"`` (default) to send each batch with ``executemany``, or
+            ``"copy"`` to stream it with binary COPY into a temporary staging
+            table and merge it into ``applicants`` in one statement
+        pipeline (bool): Decode and parse lines on a separate thread that
+            feeds the database writer through a bounded queue, and report
+            each stage's busy/idle time
+        upsert (bool): Store a :func:`record_hash` per row and, for p_ids
+            already present, rewrite only the rows whose hash differs
+        incremental (bool): Resume after the part of the file recorded in
+            ``load_manifest`` by earlier loads, and record each committed
+            batch's end offset there
+
     Returns:
         int: Total number of records successfully processed
 
     Raises:
+        ValueError: If ``mode`` is not one of :data:`LOAD_MODES`
+        TypeError: If an unknown keyword option is passed
         FileNotFoundError: If the JSON file doesn't exist
         json.JSONDecodeError: If the file contains invalid JSON
         psycopg.Error: If database insertion fails
 
     Note:
-        - Data is committed in batches of 1000 records for efficiency
+        - Data is committed in batches of 1000 records (50000 in copy mode)
         - Duplicate p_id values are silently skipped (ON CONFLICT DO NOTHING)
+          unless ``upsert`` is set; then the last changed copy wins
         - Invalid entries are logged and skipped rather than causing failure
+        - Copy mode also reports inserted/duplicate counts and runs ANALYZE
 
     Example:
         >>> conn = psycopg.connect(host='localhost', dbname='mydb')
         >>> records_loaded = load_json_data('applicants.json', conn)
         >>> print(f"Loaded {records_loaded} records")
     """
-    cursor = conn.cursor()
+    options = _load_options(**options)
+    identity, byte_range = None, (0, None)
+    if options["incremental"]:
+        identity, start = _start_incremental(json_file_path, conn)
+        if start >= identity["size"]:
+            return 0
+        byte_range = (start, identity["size"])
+    print(f"\nReading data from {json_file_path}...")
+    processed, skipped, inserted, _ = _load_range(json_file_path, conn, options, byte_range, identity)
+    _finish_load(conn, options, processed, skipped, inserted)
+    return processed
 
-    records = []
-    skipped = 0
-    line_num = 0
 
-    print(f"\nReading data from {json_file_path}...")
+def _shard_ranges(json_file_path, shards, byte_range=(0, None)):
+    """Split a file into at most ``shards`` byte ranges aligned to line starts.
 
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
-            try:
-                data = json.loads(line.strip())
-
-                # Extract p_id from URL
-                p_id = extract_p_id_from_url(data.get('url'))
-                if not p_id:
-                    print(f"Warning: Could not extract p_id from line {line_num}, skipping.")
-                    skipped += 1
-                    continue
-
-                # Map JSON fields to database columns, cleaning strings
-                record = (
-                    p_id,
-                    clean_string(data.get('program')),
-                    clean_string(data.get('comments')),
-                    parse_date(data.get('date_added')),
-                    clean_string(data.get('url')),
-                    clean_string(data.get('applicant_status')),
-                    clean_string(data.get('semester_year_start')),
-                    clean_string(data.get('citizenship')),
-                    parse_gpa(data.get('gpa')),
-                    parse_gre_score(data.get('gre')),
-                    parse_gre_score(data.get('gre_v')),
-                    parse_gre_score(data.get('gre_aw')),
-                    clean_string(data.get('masters_or_phd')),
-                    clean_string(data.get('llm-generated-program')),
-                    clean_string(data.get('llm-generated-university'))
-                )
-
-                records.append(record)
-
-                # Batch insert every 1000 records
-                if len(records) >= 1000:
-                    cursor.executemany(APPLICANT_INSERT, records)
-                    conn.commit()
-                    print(f"Inserted {line_num - skipped} records...")
-                    records = []
-
-            except json.JSONDecodeError as e:
-                print(f"Warning: JSON decode error on line {line_num}: {e}")
-                skipped += 1
-            except Exception as e:
-                print(f"Warning: Error processing line {line_num}: {e}")
-                skipped += 1
-
-    # Insert remaining records
-    if records:
-        cursor.executemany(APPLICANT_INSERT, records)
-        conn.commit()
+    Each cut point is moved forward to just after the next newline, so every
+    line falls in exactly one range. Small files may yield fewer ranges.
 
-    cursor.close()
+    Args:
+        json_file_path (str): Path to the JSON Lines file
+        shards (int): Number of ranges wanted
+        byte_range (tuple): ``(start, end)`` part of the file to split; ``start``
+            must be a line start and ``end`` may be None for end of file
 
-    total_records = line_num - skipped
-    print("\nData loading complete!")
-    print(f"Total records processed: {total_records}")
-    print(f"Records skipped: {skipped}")
+    Returns:
+        list[tuple[int, int]]: Non-empty ``(start, end)`` byte ranges in file order
+    """
+    first, size = byte_range
+    if size is None:
+        size = os.path.getsize(json_file_path)
+    bounds = [first]
+    with open(json_file_path, 'rb') as f:
+        for i in range(1, shards):
+            f.seek(max(first + (size - first) * i // shards - 1, first))
+            f.readline()
+            bounds.append(min(max(f.tell(), bounds[-1]), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _load_shard(json_file_path, options, byte_range):
+    """Load one byte range on a fresh connection (runs in a worker process).
 
-    return total_records
+    Returns:
+        tuple: ``(processed, skipped, inserted, offset)`` for the range
+    """
+    conn = get_connection()
+    try:
+        return _load_range(json_file_path, conn, options, byte_range)
+    finally:
+        conn.close()
 
 
-def verify_data(conn):
-    """Verify loaded data by displaying database statistics.
+def load_json_data_parallel(json_file_path, conn, workers, **options):
+    """Load a JSON Lines file with ``workers`` processes, one shard each.
 
-    Prints summary statistics including:
-        - Total record count
-        - Sample records
-        - Distribution of application statuses
+    The file is split into line-aligned byte ranges (:func:`_shard_ranges`).
+    Every range is parsed and written by its own process over its own
+    :func:`db.get_connection` connection, and the per-shard counts are added
+    up at the end. Processes are spawned rather than forked so no worker
+    inherits the caller's open connection. With ``incremental`` only the part
+    after the manifest offset is sharded, and the new offset is recorded once
+    every shard has committed.
 
     Args:
-        conn (psycopg.Connection): Active database connection
+        json_file_path (str): Path to the JSON Lines file
+        conn (psycopg.Connection): Caller's connection, used for ANALYZE in copy mode
+        workers (int): Number of shards and worker processes
+        **options: ``mode``, ``pipeline``, ``upsert`` and ``incremental`` as for
+            :func:`load_json_data`, applied in every shard
 
     Returns:
-        None
+        int: Total number of records successfully processed
+
+    Raises:
+        ValueError: If ``mode`` is not one of :data:`LOAD_MODES`
+        FileNotFoundError: If the JSON file doesn't exist
+        psycopg.Error: If a shard fails to write
 
     Note:
-        This function only prints to stdout and doesn't modify the database.
+        Warnings from a shard give line numbers relative to the shard start.
     """
-    cursor = conn.cursor()
+    options = _load_options(**options)
+    identity, byte_range = None, (0, None)
+    if options["incremental"]:
+        identity, start = _start_incremental(json_file_path, conn)
+        if start >= identity["size"]:
+            return 0
+        byte_range = (start, identity["size"])
+    shards = _shard_ranges(json_file_path, workers, byte_range)
+    print(f"\nReading data from {json_file_path} in {len(shards)} shards...")
+    with ProcessPoolExecutor(
+        max_workers=max(len(shards), 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futures = [
+            pool.submit(_load_shard, json_file_path, options, shard)
+            for shard in shards
+        ]
+        results = [future.result() for future in futures]
+
+    processed, skipped, inserted = (sum(result[i] for result in results) for i in range(3))
+    if identity is not None:
+        # The last shard ends where the loaded part of the file ends
+        cursor = conn.cursor()
+        load_manifest.record_offset(cursor, identity, results[-1][3])
+        conn.commit()
+        cursor.close()
+    _finish_load(conn, options, processed, skipped, inserted)
+    return processed
 
-    # Count total records
-    cursor.execute("SELECT COUNT(*) FROM applicants;")
-    total = cursor.fetchone()[0]
-    print(f"\nTotal records in database: {total}")
-
-    # Show sample records
-    cursor.execute("SELECT * FROM applicants LIMIT 5;")
-    print("\nSample records:")
-    for row in cursor.fetchall():
-        print(f"  p_id: {row[0]}, program: {row[1][:50]}...")
-
-    # Show statistics by status (LIMIT caps the rows returned)
-    _status_stmt = sql.SQL(
-        "SELECT {status}, COUNT(*) FROM {table}"
-        " WHERE {status} IS NOT NULL"
-        " GROUP BY {status} ORDER BY COUNT(*) DESC"
-        " LIMIT 100"
-    ).format(
-        table=sql.Identifier("applicants"),
-        status=sql.Identifier("status"),
-    )
-    cursor.execute(_status_stmt)
-    print("\nRecords by status:")
-    for status, count in cursor.fetchall():
-        print(f"  {status}: {count}")
 
-    cursor.close()
+def _parse_args(argv):
+    """Parse command-line options for :func:`main`.
 
+    Args:
+        argv (list[str] | None): Arguments without the program name, or None
+            for ``sys.argv[1:]``
 
-def main():
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Load GradCafe applicant data into PostgreSQL.")
+    parser.add_argument(
+        "--mode",
+        choices=LOAD_MODES,
+        default="insert",
+        help="insert: executemany batches (default); copy: binary COPY into a staging table",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Load the file as N line-aligned shards in N processes (default: 1)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Parse on a separate thread from the database writer and report stage times",
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Update existing rows whose content changed instead of skipping them",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Resume after the part of the file recorded in load_manifest instead of reading it all",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point for data loading script.
 
     Connects to the database, creates the schema if needed, loads data from
     a JSON file, and displays verification statistics.
 
+    Args:
+        argv (list[str] | None): Command-line arguments, e.g. ``["--mode", "copy"]``;
+            defaults to ``sys.argv[1:]``, as when run as the gradcafe-load console script
+
     Environment Variables:
         Either use DATABASE_URL (recommended)::
 
@@ -420,6 +921,8 @@ def main():
         The data file is expected at: ../llm_extend_applicant_data.json
         relative to this script's location.
     """
+    args = _parse_args(argv)
+
     # Path to data file in parent directory
     json_file_path = os.path.join(os.path.dirname(__file__), '..', 'llm_extend_applicant_data.json')
 
@@ -431,7 +934,16 @@ def main():
         create_applicants_table(conn)
 
         # Load data
-        load_json_data(json_file_path, conn)
+        options = {
+            "mode": args.mode,
+            "pipeline": args.pipeline,
+            "upsert": args.upsert,
+            "incremental": args.incremental,
+        }
+        if args.workers > 1:
+            load_json_data_parallel(json_file_path, conn, args.workers, **options)
+        else:
+            load_json_data(json_file_path, conn, **options)
 
         # Verify data
         verify_data(conn)
@@ -0,0 +1,175 @@
+"""Dimension tables for the repeated text values of the applicants table.
+
+Status, citizenship and degree take a handful of values, and the
+LLM-standardized university and program names repeat across thousands of
+rows. Each is stored once in a small dimension table (``statuses``,
+``citizenships``, ``degrees``, ``programs``, ``universities``; columns
+``id`` and ``name``) and ``applicants`` holds only its integer key, which
+keeps rows narrow and lets :mod:`query_data` group on integers.
+
+Loaders turn parsed records into rows with an :class:`Interner`, which looks
+names up (adding new ones) and remembers the keys it has seen, so a long load
+only queries a dimension table for names it has not met yet.
+
+Note:
+    ``applicants`` declares no foreign keys on these columns: keys are only
+    written by :class:`Interner`, and per-row foreign key checks would slow
+    bulk loads. Names are never deleted from a dimension table.
+"""
+
+from psycopg import sql
+
+# (key column in applicants, key type, dimension table, text field it replaces)
+DIMENSIONS = (
+    ("status_id", "SMALLINT", "statuses", "status"),
+    ("citizenship_id", "SMALLINT", "citizenships", "us_or_international"),
+    ("degree_id", "SMALLINT", "degrees", "degree"),
+    ("program_id", "INTEGER", "programs", "llm_generated_program"),
+    ("university_id", "INTEGER", "universities", "llm_generated_university"),
+)
+
+# Only names that are missing are inserted, so sequence values are not
+# consumed by conflicts except when two loaders add the same name at once.
+_INSERT_NAMES = """
+INSERT INTO {table} (name)
+SELECT DISTINCT n FROM unnest(%s::text[]) AS n
+WHERE NOT EXISTS (SELECT 1 FROM {table} d WHERE d.name = n)
+ON CONFLICT (name) DO NOTHING
+"""
+
+
+def key_columns(fields):
+    """Return ``fields`` with each dimension's text field replaced by its key column.
+
+    Args:
+        fields (tuple[str]): Field names of a parsed record
+
+    Returns:
+        tuple[str]: Column names of the stored row
+    """
+    keys = {field: column for column, _, _, field in DIMENSIONS}
+    return tuple(keys.get(field, field) for field in fields)
+
+
+def key_lookup(table, name):
+    """Return a scalar subquery for the key of ``name`` in a dimension table.
+
+    The subquery runs once per statement (an InitPlan), and yields NULL for
+    a name that was never loaded, so ``status_id = key_lookup(...)`` then
+    matches nothing, like the equivalent text comparison.
+
+    Args:
+        table (str): Dimension table, e.g. ``"statuses"``
+        name (str): Value to look up, e.g. ``"Accepted"``
+
+    Returns:
+        psycopg.sql.Composed: ``(SELECT id FROM table WHERE name = 'name')``
+    """
+    return sql.SQL("(SELECT id FROM {table} WHERE name = {name})").format(
+        table=sql.Identifier(table), name=sql.Literal(name)
+    )
+
+
+def create_dimension_tables(cursor):
+    """Create the dimension tables if they don't exist; the caller commits."""
+    for _, key_type, table, _ in DIMENSIONS:
+        serial = "SMALLSERIAL" if key_type == "SMALLINT" else "SERIAL"
+        cursor.execute(sql.SQL(
+            "CREATE TABLE IF NOT EXISTS {table}"
+            " (id {serial} PRIMARY KEY, name TEXT NOT NULL UNIQUE)"
+        ).format(table=sql.Identifier(table), serial=sql.SQL(serial)))
+
+
+def convert_text_columns(cursor):
+    """Replace text columns of an existing applicants table with dimension keys.
+
+    Tables created before the dimension tables existed store the names
+    themselves. Their distinct values are added to the dimension tables,
+    the key columns are filled in one ``UPDATE`` (a single table rewrite)
+    and the text columns are dropped. Does nothing for a table that already
+    has the key columns. The caller commits; ``VACUUM FULL applicants``
+    afterwards returns the freed space to the operating system.
+
+    Args:
+        cursor (psycopg.Cursor): Cursor on the connection to use
+
+    Returns:
+        bool: True if a table was converted
+    """
+    cursor.execute(
+        "SELECT attname FROM pg_attribute"
+        " WHERE attrelid = to_regclass('applicants') AND attnum > 0 AND NOT attisdropped"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    pending = [dimension for dimension in DIMENSIONS if dimension[3] in existing]
+    if not pending:
+        return False
+    print("Moving repeated applicant values into dimension tables...")
+    for column, key_type, table, field in pending:
+        cursor.execute(sql.SQL(
+            "INSERT INTO {table} (name) SELECT DISTINCT {field} FROM applicants WHERE {field} IS NOT NULL"
+            " ON CONFLICT (name) DO NOTHING"
+        ).format(table=sql.Identifier(table), field=sql.Identifier(field)))
+        cursor.execute(sql.SQL("ALTER TABLE applicants ADD COLUMN IF NOT EXISTS {column} {key_type}").format(
+            column=sql.Identifier(column), key_type=sql.SQL(key_type)
+        ))
+    cursor.execute(sql.SQL("UPDATE applicants SET {assignments}").format(
+        assignments=sql.SQL(", ").join(
+            sql.SQL("{column} = (SELECT id FROM {table} WHERE name = {field})").format(
+                column=sql.Identifier(column), table=sql.Identifier(table), field=sql.Identifier(field)
+            )
+            for column, _, table, field in pending
+        )
+    ))
+    for _, _, _, field in pending:
+        cursor.execute(sql.SQL("ALTER TABLE applicants DROP COLUMN {field}").format(field=sql.Identifier(field)))
+    return True
+
+
+class Interner:
+    """Replaces dimension names in parsed records with their keys.
+
+    Args:
+        fields (tuple[str]): Field names of the records to encode, e.g.
+            ``load_data._RECORD_FIELDS``; fields without a dimension table
+            are left as they are
+    """
+
+    def __init__(self, fields):
+        self._positions = [(fields.index(field), table) for _, _, table, field in DIMENSIONS if field in fields]
+        self._keys = {table: {} for _, _, table, _ in DIMENSIONS}
+
+    def _learn(self, cursor, table, names):
+        """Fetch (adding where needed) the keys of ``names`` into the cache."""
+        cursor.execute(sql.SQL(_INSERT_NAMES).format(table=sql.Identifier(table)), (names,))
+        cursor.execute(sql.SQL("SELECT name, id FROM {table} WHERE name = ANY(%s)").format(
+            table=sql.Identifier(table)
+        ), (names,))
+        self._keys[table].update(cursor.fetchall())
+
+    def encode(self, cursor, records):
+        """Return ``records`` with every dimension name replaced by its key.
+
+        Names not seen before are looked up, and added to their dimension
+        table if missing; the caller commits. None stays None, and fields
+        beyond the record layout (such as a trailing ``row_hash``) are kept.
+
+        Args:
+            cursor (psycopg.Cursor): Cursor on the connection to use
+            records (list[tuple]): Records in the ``fields`` order
+
+        Returns:
+            list[tuple]: Rows ready to insert
+        """
+        for position, table in self._positions:
+            keys = self._keys[table]
+            new = {record[position] for record in records} - keys.keys() - {None}
+            if new:
+                self._learn(cursor, table, sorted(new))
+        rows = []
+        for record in records:
+            row = list(record)
+            for position, table in self._positions:
+                row[position] = self._keys[table].get(row[position])
+            rows.append(tuple(row))
+        return rows
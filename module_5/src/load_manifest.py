@@ -0,0 +1,177 @@
+"""Load manifest: remember how much of each input file is already loaded.
+
+:mod:`load_data` records, per input file, the file's identity (size, inode,
+modification time and a hash of its first bytes) and the byte offset just
+past the last committed batch in the ``load_manifest`` table, together with
+a hash of the bytes just before that offset. The offset is written in the
+same transaction as the batch, so it never runs ahead of the data. On the
+next run :func:`resume_offset` compares the file with the recorded identity:
+
+- same file, grown by appends: loading resumes at the recorded offset, so
+  only the new tail is parsed and sent to the database;
+- same file, unchanged: the offset equals the size and there is nothing to do;
+- replaced, truncated or rewritten file: loading starts again at byte 0
+  (rows already present are handled by the ON CONFLICT clause as usual).
+
+A file rewritten in place (``open(path, 'w')``, as the standardizer does)
+keeps its inode, and if it grew its mtime is no different from an append.
+It is recognised because the recorded offset no longer follows a newline,
+or the :data:`TAIL_BYTES` before it, or the first :data:`HEAD_BYTES`, no
+longer hash the same.
+
+Note:
+    Only the head and the block before the offset are hashed, so a rewrite
+    that changes neither (e.g. an edit in the middle of a large file that
+    keeps every line length) is not detected. Load without ``--incremental``
+    after such edits.
+"""
+
+import hashlib
+import os
+
+# Leading bytes hashed to recognise a file that was replaced but kept its size.
+HEAD_BYTES = 64 * 1024
+
+# Bytes before the committed offset hashed to recognise a rewrite that grew.
+TAIL_BYTES = 64 * 1024
+
+MANIFEST_CREATE = """
+CREATE TABLE IF NOT EXISTS load_manifest (
+    path TEXT PRIMARY KEY,
+    size BIGINT NOT NULL,
+    inode BIGINT NOT NULL,
+    mtime_ns BIGINT NOT NULL,
+    head_bytes INTEGER NOT NULL,
+    head_hash BYTEA NOT NULL,
+    committed_offset BIGINT NOT NULL,
+    loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+ALTER TABLE load_manifest ADD COLUMN IF NOT EXISTS tail_hash BYTEA;
+"""
+
+_MANIFEST_SELECT = """
+SELECT size, inode, mtime_ns, head_bytes, head_hash, committed_offset, tail_hash
+FROM load_manifest WHERE path = %s
+"""
+
+_MANIFEST_UPSERT = """
+INSERT INTO load_manifest
+    (path, size, inode, mtime_ns, head_bytes, head_hash, committed_offset, tail_hash, loaded_at)
+VALUES
+    (%(path)s, %(size)s, %(inode)s, %(mtime_ns)s, %(head_bytes)s, %(head_hash)s, %(offset)s, %(tail_hash)s, now())
+ON CONFLICT (path) DO UPDATE SET
+    size = EXCLUDED.size,
+    inode = EXCLUDED.inode,
+    mtime_ns = EXCLUDED.mtime_ns,
+    head_bytes = EXCLUDED.head_bytes,
+    head_hash = EXCLUDED.head_hash,
+    committed_offset = EXCLUDED.committed_offset,
+    tail_hash = EXCLUDED.tail_hash,
+    loaded_at = EXCLUDED.loaded_at
+"""
+
+
+def create_manifest_table(conn):
+    """Create the ``load_manifest`` table if it doesn't exist and commit.
+
+    Args:
+        conn (psycopg.Connection): Active database connection
+    """
+    cursor = conn.cursor()
+    cursor.execute(MANIFEST_CREATE)
+    conn.commit()
+    cursor.close()
+
+
+def _hash_range(path, start, end):
+    """Return the BLAKE2b digest of bytes ``start`` to ``end`` of ``path``."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.blake2b(f.read(end - start), digest_size=16).digest()
+
+
+def _tail_hash(path, offset):
+    """Return the digest of the :data:`TAIL_BYTES` ending at ``offset``.
+
+    Returns None when ``offset`` is not at a line boundary, i.e. the byte
+    before it is not a newline.
+    """
+    start = max(0, offset - TAIL_BYTES)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        block = f.read(offset - start)
+    if len(block) != offset - start or (offset and not block.endswith(b"\n")):
+        return None
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def file_identity(path):
+    """Describe ``path`` as it is now, for comparison with the manifest.
+
+    Args:
+        path (str): Input file
+
+    Returns:
+        dict: ``path`` (absolute, symlinks resolved), ``size``, ``inode``,
+        ``mtime_ns``, ``head_bytes`` and ``head_hash``
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    head_bytes = min(stat.st_size, HEAD_BYTES)
+    return {
+        "path": path,
+        "size": stat.st_size,
+        "inode": stat.st_ino,
+        "mtime_ns": stat.st_mtime_ns,
+        "head_bytes": head_bytes,
+        "head_hash": _hash_range(path, 0, head_bytes),
+    }
+
+
+def resume_offset(conn, identity):
+    """Return the byte offset to start loading from.
+
+    Args:
+        conn (psycopg.Connection): Active database connection
+        identity (dict): Current identity from :func:`file_identity`
+
+    Returns:
+        int: The recorded offset if the file is the one recorded (possibly
+        grown), otherwise 0
+    """
+    cursor = conn.cursor()
+    cursor.execute(_MANIFEST_SELECT, (identity["path"],))
+    row = cursor.fetchone()
+    cursor.close()
+    if row is None:
+        return 0
+    size, inode, mtime_ns, head_bytes, head_hash, offset, tail_hash = row
+    if inode != identity["inode"] or identity["size"] < size:
+        return 0  # replaced or truncated
+    if identity["size"] == size and identity["mtime_ns"] != mtime_ns:
+        return 0  # rewritten in place
+    if _hash_range(identity["path"], 0, head_bytes) != bytes(head_hash):
+        return 0
+    if tail_hash is None or _tail_hash(identity["path"], offset) != bytes(tail_hash):
+        return 0  # rewritten and grown, or recorded before tail hashes
+    return offset
+
+
+def record_offset(cursor, identity, offset):
+    """Store ``offset`` as the committed position in the file ``identity``.
+
+    A hash of the :data:`TAIL_BYTES` before ``offset`` is stored with it.
+    Does not commit: call it before committing the batch that ends at
+    ``offset`` so the two become visible together.
+
+    Args:
+        cursor (psycopg.Cursor): Cursor inside the batch's transaction
+        identity (dict): Identity from :func:`file_identity` taken when the
+            load started
+        offset (int): Byte offset just past the last line of the batch
+    """
+    tail_hash = _tail_hash(identity["path"], offset)
+    cursor.execute(_MANIFEST_UPSERT, {**identity, "offset": offset, "tail_hash": tail_hash})
@@ -0,0 +1,120 @@
+"""List partitioning of the applicants table by term.
+
+In the partitioned layout (``create_applicants_table(conn, partitioned=True)``
+or ``python src/migrate.py --partition``) every distinct ``term`` value, i.e.
+one admission cycle such as ``'Fall 2026'``, gets its own partition. Queries
+filtering on ``term = ...`` then only scan that partition, and an old cycle
+is archived by detaching its partition instead of deleting its rows.
+
+Partitions are created on demand: the loader calls :func:`create_partitions`
+for the terms of each batch before writing it, and ``app.pull_data`` calls
+:func:`ensure_partitions` before inserting scraped rows.
+"""
+
+import hashlib
+import re
+
+from psycopg import sql
+
+# Partition holding rows whose term is NULL.
+NO_TERM_PARTITION = "applicants_no_term"
+
+# Terms like 'Fall 2026' map to a readable partition name; the mapping is
+# reversible (capitalized season, four-digit year), so names never collide.
+_CANONICAL_TERM_RE = re.compile(r"([A-Z][a-z]{0,30}) (\d{4})")
+
+# Serializes partition creation between concurrent loaders.
+_PARTITION_LOCK = "SELECT pg_advisory_xact_lock(hashtext('applicants_partitions'))"
+
+# First server version whose unique constraints accept NULLS NOT DISTINCT.
+_NULLS_NOT_DISTINCT_VERSION = 150000
+
+
+def partition_name(term):
+    """Return the name of the partition holding rows of ``term``.
+
+    Args:
+        term (str): Term value, e.g. ``'Fall 2026'``, or None
+
+    Returns:
+        str: ``applicants_fall_2026`` for canonical terms,
+        :data:`NO_TERM_PARTITION` for None, and ``applicants_t_<hash>`` for
+        any other spelling
+    """
+    if term is None:
+        return NO_TERM_PARTITION
+    match = _CANONICAL_TERM_RE.fullmatch(term)
+    if match:
+        return f"applicants_{match[1].lower()}_{match[2]}"
+    return "applicants_t_" + hashlib.blake2b(term.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def is_partitioned(conn):
+    """Return True if ``applicants`` on the search_path is a partitioned table."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('applicants')")
+    row = cursor.fetchone()
+    cursor.close()
+    return row is not None and row[0] == "p"
+
+
+def create_partitioned_table(cursor, columns):
+    """Create the term-partitioned applicants table; the caller commits.
+
+    A unique constraint on a partitioned table must include the partition
+    key, so the key is ``(p_id, term)``, named ``applicants_pkey`` like the
+    primary key of the unpartitioned layout so ``ON CONFLICT ON CONSTRAINT``
+    works on both. A ``p_id`` loaded again under a different term is
+    therefore a new row; upserts do not move it between partitions.
+
+    Args:
+        cursor (psycopg.Cursor): Cursor on the connection to use
+        columns (str): Column definitions after ``p_id``
+    """
+    nulls_not_distinct = cursor.connection.info.server_version >= _NULLS_NOT_DISTINCT_VERSION
+    cursor.execute(sql.SQL(
+        "CREATE TABLE IF NOT EXISTS {table} (p_id INTEGER NOT NULL, {columns},"
+        " CONSTRAINT {key} UNIQUE {nulls}(p_id, term)) PARTITION BY LIST (term)"
+    ).format(
+        table=sql.Identifier("applicants"),
+        columns=sql.SQL(columns),
+        key=sql.Identifier("applicants_pkey"),
+        nulls=sql.SQL("NULLS NOT DISTINCT " if nulls_not_distinct else ""),
+    ))
+    create_partitions(cursor, [None])
+    if not nulls_not_distinct:
+        # Older servers treat NULL terms as distinct keys, so termless rows
+        # are deduplicated by a key local to their partition
+        cursor.execute(sql.SQL("CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {partition} (p_id)").format(
+            index=sql.Identifier(NO_TERM_PARTITION + "_p_id_key"),
+            partition=sql.Identifier(NO_TERM_PARTITION),
+        ))
+
+
+def create_partitions(cursor, terms):
+    """Create the partition of each term that doesn't have one yet; the caller commits.
+
+    Args:
+        cursor (psycopg.Cursor): Cursor on the connection to use
+        terms (Iterable[str]): Term values (None for the no-term partition)
+    """
+    cursor.execute(_PARTITION_LOCK)
+    for term in terms:
+        cursor.execute(sql.SQL("CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES IN ({term})").format(
+            name=sql.Identifier(partition_name(term)),
+            table=sql.Identifier("applicants"),
+            term=sql.Literal(term),
+        ))
+
+
+def ensure_partitions(conn, terms):
+    """Create any missing term partitions if ``applicants`` is partitioned; the caller commits.
+
+    Args:
+        conn (psycopg.Connection): Active database connection
+        terms (Iterable[str]): Term values about to be inserted
+    """
+    if is_partitioned(conn):
+        cursor = conn.cursor()
+        create_partitions(cursor, terms)
+        cursor.close()
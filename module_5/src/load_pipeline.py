@@ -0,0 +1,89 @@
+"""Overlap parsing and database writes in :mod:`load_data`.
+
+:func:`run_pipeline` runs a batch iterator on a parser thread and hands the
+batches to a writer on the calling thread through a bounded queue. It times
+both sides so a load can report which one limited throughput
+(:func:`print_pipeline_stats`).
+"""
+
+import queue
+import threading
+import time
+
+# Parsed batches the parser thread may run ahead of the writer.
+PIPELINE_DEPTH = 4
+
+
+def run_pipeline(batches, write, depth=PIPELINE_DEPTH):
+    """Parse batches on a background thread while the caller writes them.
+
+    The parser thread pulls from ``batches`` and fills a queue of at most
+    ``depth`` batches; the calling thread takes them off and passes each to
+    ``write``. Time is split per stage into busy (parsing / writing) and idle
+    (parser blocked on a full queue / writer waiting on an empty one), which
+    shows which side is the bottleneck. If either side fails, the other is
+    stopped and the exception is re-raised here.
+
+    Args:
+        batches (Iterator): Batches to write, e.g. from ``load_data._iter_batches``
+        write (Callable): Called with each batch on the calling thread
+        depth (int): Queue capacity in batches
+
+    Returns:
+        dict: ``parse_busy``, ``parse_idle``, ``write_busy`` and ``write_idle``
+        in seconds
+    """
+    handoff = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    stats = {"parse_busy": 0.0, "parse_idle": 0.0, "write_busy": 0.0, "write_idle": 0.0}
+
+    def parse():
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                batch = next(batches, None)
+                stats["parse_busy"] += time.perf_counter() - started
+                if batch is None:
+                    break
+                started = time.perf_counter()
+                handoff.put(batch)
+                stats["parse_idle"] += time.perf_counter() - started
+        except Exception as e:
+            errors.append(e)
+        finally:
+            handoff.put(None)
+
+    parser = threading.Thread(target=parse, name="load-parser", daemon=True)
+    parser.start()
+    try:
+        while True:
+            started = time.perf_counter()
+            batch = handoff.get()
+            stats["write_idle"] += time.perf_counter() - started
+            if batch is None:
+                break
+            started = time.perf_counter()
+            write(batch)
+            stats["write_busy"] += time.perf_counter() - started
+    except Exception:
+        # Unblock the parser (it may be waiting on a full queue) until its
+        # end-of-input marker arrives
+        stop.set()
+        while handoff.get() is not None:
+            pass
+        raise
+    parser.join()
+    if errors:
+        raise errors[0]
+    return stats
+
+
+def print_pipeline_stats(stats):
+    """Print per-stage busy/idle seconds and which stage limited throughput."""
+    bottleneck = "parse" if stats["write_idle"] > stats["parse_idle"] else "write"
+    print(
+        f"Pipeline: parse busy {stats['parse_busy']:.2f}s idle {stats['parse_idle']:.2f}s, "
+        f"write busy {stats['write_busy']:.2f}s idle {stats['write_idle']:.2f}s "
+        f"(bottleneck: {bottleneck})"
+    )
@@ -0,0 +1,366 @@
+"""Schema migrations for the applicants database: tables and indexes.
+
+:data:`INDEXES` declares every secondary index the dashboard queries in
+:mod:`query_data` rely on. :func:`create_indexes` builds the missing ones
+with ``CREATE INDEX CONCURRENTLY``, so a live database keeps accepting
+reads and writes while they are built, and :func:`check_index_usage` runs
+each ``question_*`` function and asks ``EXPLAIN`` which indexes its
+statements use.
+
+:func:`partition_applicants` converts an existing table to the layout
+partitioned by term (:mod:`load_partitions`), and :func:`detach_term` takes
+one admission cycle out of it without deleting any rows.
+
+Example:
+    Run after loading data (creates the tables too if needed)::
+
+        python src/migrate.py
+        python src/migrate.py --check
+        python src/migrate.py --partition
+        python src/migrate.py --detach "Fall 2024"
+
+Note:
+    The trigram indexes need the ``pg_trgm`` extension. Where it is not
+    available, or the user may not create it, they are skipped with a
+    warning; the remaining indexes still cover every question.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from datetime import datetime, timezone
+
+import psycopg
+from psycopg import sql
+
+import load_data
+import load_manifest
+import load_partitions
+import query_data
+from db import get_connection
+
+# (index name, definition after "ON applicants", needs pg_trgm)
+INDEXES = (
+    # Equality filters of question_1, 5, 6, 8, 9 and 10 (a term prefix is enough)
+    ("applicants_term_status_degree_idx", "(term, status_id, degree_id)", False),
+    # question_2 and question_4
+    ("applicants_citizenship_term_idx", "(citizenship_id, term)", False),
+    # question_11 groups by degree; gpa is included for an index-only scan
+    ("applicants_degree_status_idx", "(degree_id, status_id) INCLUDE (gpa)", False),
+    # question_3: the predicate matches its WHERE clause exactly
+    (
+        "applicants_scores_idx",
+        "(gpa, gre, gre_v, gre_aw)"
+        " WHERE gpa IS NOT NULL OR gre IS NOT NULL OR gre_v IS NOT NULL OR gre_aw IS NOT NULL",
+        False,
+    ),
+    # program ILIKE '%...%' filters of question_7 to question_9 (the LLM name
+    # filters of question_9 scan the small programs and universities tables instead)
+    ("applicants_program_trgm_idx", "USING gin (program gin_trgm_ops)", True),
+)
+
+# Query functions checked by check_index_usage, in dashboard order.
+QUESTIONS = tuple(f"question_{i}" for i in range(1, 12))
+
+# Indexes visible on the search_path, with whether each finished building.
+# A failed CREATE INDEX CONCURRENTLY leaves an invalid index behind.
+_EXISTING_INDEXES = """
+SELECT c.relname, i.indisvalid
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+WHERE c.relname = ANY(%s) AND pg_table_is_visible(c.oid)
+"""
+
+
+def _enable_trgm(cursor):
+    """Create the pg_trgm extension if possible and report whether it is usable."""
+    cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    if cursor.fetchone() is None:
+        print("Warning: pg_trgm is not available; skipping trigram indexes.")
+        return False
+    try:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except psycopg.Error as e:
+        print(f"Warning: could not create pg_trgm ({e}); skipping trigram indexes.")
+        return False
+    return True
+
+
+def create_indexes(conn):
+    """Create every index in :data:`INDEXES` that doesn't exist yet.
+
+    Indexes are built one at a time with ``CREATE INDEX CONCURRENTLY``, which
+    cannot run inside a transaction, so the connection is switched to
+    autocommit for the duration. An invalid index left by an interrupted
+    concurrent build is dropped and built again. PostgreSQL cannot build an
+    index on a partitioned table concurrently, so there the indexes are built
+    normally; each partition gets its own copy, including partitions created
+    later.
+
+    Args:
+        conn (psycopg.Connection): Database connection with no transaction open
+
+    Returns:
+        list[str]: Names of the indexes built by this call
+    """
+    names = [name for name, _, _ in INDEXES]
+    built = []
+    concurrently = sql.SQL("" if load_partitions.is_partitioned(conn) else "CONCURRENTLY ")
+    conn.commit()
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_EXISTING_INDEXES, (names,))
+        existing = dict(cursor.fetchall())
+        trgm = _enable_trgm(cursor)
+        for name, definition, needs_trgm in INDEXES:
+            if needs_trgm and not trgm:
+                continue
+            if existing.get(name):
+                print(f"Index {name} exists.")
+                continue
+            if name in existing:
+                print(f"Index {name} is invalid (interrupted build); rebuilding.")
+                cursor.execute(sql.SQL("DROP INDEX {concurrently}IF EXISTS {name}").format(
+                    concurrently=concurrently, name=sql.Identifier(name)
+                ))
+            print(f"Creating index {name}...")
+            cursor.execute(sql.SQL("CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} {definition}").format(
+                concurrently=concurrently,
+                name=sql.Identifier(name),
+                table=sql.Identifier("applicants"),
+                definition=sql.SQL(definition),
+            ))
+            built.append(name)
+        cursor.close()
+    finally:
+        conn.autocommit = autocommit
+    return built
+
+
+def partition_applicants(conn):
+    """Convert an unpartitioned applicants table to the term-partitioned layout.
+
+    Runs in one transaction: the old table is renamed, the partitioned table
+    and one partition per distinct term are created, every row is copied
+    across and the old table is dropped. Readers and writers wait for the
+    whole copy, so run it in a maintenance window. The indexes in
+    :data:`INDEXES` are dropped with the old table; :func:`create_indexes`
+    builds them again.
+
+    Args:
+        conn (psycopg.Connection): Connection to a database with an
+            ``applicants`` table
+
+    Returns:
+        bool: True if the table was converted, False if it already was partitioned
+    """
+    if load_partitions.is_partitioned(conn):
+        return False
+    old = sql.Identifier("applicants_unpartitioned")
+    cols = sql.SQL(", ").join(map(sql.Identifier, load_data._UPSERT_COLS))
+    cursor = conn.cursor()
+    cursor.execute(sql.SQL("ALTER TABLE applicants RENAME TO {old}").format(old=old))
+    # Index names are schema-wide; free the ones the new table will use
+    cursor.execute(sql.SQL("ALTER TABLE {old} RENAME CONSTRAINT applicants_pkey TO {key}").format(
+        old=old, key=sql.Identifier("applicants_unpartitioned_pkey")
+    ))
+    for name, _, _ in INDEXES:
+        cursor.execute(sql.SQL("DROP INDEX IF EXISTS {name}").format(name=sql.Identifier(name)))
+    load_data._create_table(cursor, partitioned=True)
+    cursor.execute(sql.SQL("SELECT DISTINCT term FROM {old}").format(old=old))
+    load_partitions.create_partitions(cursor, [row[0] for row in cursor.fetchall()])
+    cursor.execute(sql.SQL("INSERT INTO applicants ({cols}) SELECT {cols} FROM {old}").format(cols=cols, old=old))
+    print(f"Moved {cursor.rowcount} rows into the partitioned applicants table.")
+    cursor.execute(sql.SQL("DROP TABLE {old}").format(old=old))
+    conn.commit()
+    cursor.close()
+    return True
+
+
+def detach_term(conn, term):
+    """Detach the partition of one term, archiving its rows without a DELETE.
+
+    ``DETACH PARTITION ... CONCURRENTLY`` only briefly blocks queries on
+    ``applicants``. The rows stay in a standalone table, which can be dumped
+    and dropped, or attached again later. It is renamed to
+    ``<partition>_archived_<UTC timestamp>`` so that a later load containing
+    the term creates a fresh partition instead of finding the archive under
+    the partition's name.
+
+    Args:
+        conn (psycopg.Connection): Database connection with no transaction open
+        term (str): Term whose rows to detach, e.g. ``'Fall 2024'``
+
+    Returns:
+        str: Name of the archived table
+
+    Raises:
+        ValueError: If ``applicants`` has no partition for ``term``
+    """
+    name = load_partitions.partition_name(term)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM pg_inherits WHERE inhparent = to_regclass('applicants') AND inhrelid = to_regclass(%s)",
+        (name,),
+    )
+    found = cursor.fetchone() is not None
+    conn.commit()
+    if not found:
+        cursor.close()
+        raise ValueError(f"applicants has no partition for term {term!r}")
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        cursor.execute(sql.SQL("ALTER TABLE applicants DETACH PARTITION {name} CONCURRENTLY").format(
+            name=sql.Identifier(name)
+        ))
+        archived = f"{name}_archived_{datetime.now(timezone.utc):%Y%m%d%H%M%S}"
+        cursor.execute(sql.SQL("ALTER TABLE {name} RENAME TO {archived}").format(
+            name=sql.Identifier(name), archived=sql.Identifier(archived)
+        ))
+    finally:
+        cursor.close()
+        conn.autocommit = autocommit
+    return archived
+
+
+class _RecordingCursor:
+    """Cursor proxy that remembers every statement it executes."""
+
+    def __init__(self, cursor, statements):
+        self._cursor = cursor
+        self._statements = statements
+
+    def execute(self, query, params=None):
+        """Record ``query`` and run it on the real cursor."""
+        self._statements.append((query, params))
+        return self._cursor.execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _RecordingConnection:
+    """Connection proxy whose cursors record their statements."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.statements = []
+
+    def cursor(self):
+        """Return a :class:`_RecordingCursor` on a new real cursor."""
+        return _RecordingCursor(self._conn.cursor(), self.statements)
+
+
+def _plan_indexes(plan):
+    """Return the names of all indexes scanned anywhere in an EXPLAIN JSON plan."""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        names |= _plan_indexes(child)
+    return names
+
+
+def check_index_usage(conn):
+    """Report the indexes each ``question_*`` query can use.
+
+    Every question function in :data:`QUESTIONS` is run once (output
+    discarded) to capture the statements it executes, and each statement is
+    then passed to ``EXPLAIN (FORMAT JSON)``. Sequential scans are disabled
+    while explaining: on a small table the planner rightly prefers them, and
+    the point of the check is whether an index *can* serve the query.
+
+    Args:
+        conn (psycopg.Connection): Connection to a database with data loaded
+
+    Returns:
+        dict: Question name -> list of per-statement index name sets; a
+        question uses an index when none of its sets is empty
+    """
+    usage = {}
+    cursor = conn.cursor()
+    for question in QUESTIONS:
+        recorder = _RecordingConnection(conn)
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(query_data, question)(recorder)
+        usage[question] = []
+        cursor.execute("SET enable_seqscan = off")
+        for query, params in recorder.statements:
+            statement = sql.SQL(query) if isinstance(query, str) else query
+            cursor.execute(sql.SQL("EXPLAIN (FORMAT JSON) ") + statement, params)
+            usage[question].append(_plan_indexes(cursor.fetchone()[0][0]["Plan"]))
+        cursor.execute("RESET enable_seqscan")
+    cursor.close()
+    conn.commit()
+    return usage
+
+
+def _print_index_usage(usage):
+    """Print one line per question and return True if all of them use an index."""
+    ok = True
+    for question, statements in usage.items():
+        uses_index = all(statements)
+        ok = ok and uses_index
+        names = ", ".join(sorted(set().union(*statements))) or "none"
+        print(f"  {question:<12} {'ok' if uses_index else 'NO INDEX':<9} {names}")
+    return ok
+
+
+def main(argv=None):
+    """Create the tables and indexes, optionally partitioning and checking index usage.
+
+    Args:
+        argv (list[str] | None): Command-line arguments, e.g. ``["--check"]``;
+            defaults to ``sys.argv[1:]``
+
+    Returns:
+        int: 0 on success, 1 if ``--check`` found a question without an
+        index or ``--detach`` named a term without a partition
+    """
+    parser = argparse.ArgumentParser(description="Create the applicants tables and indexes.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="After migrating, EXPLAIN every question_* query and fail if one uses no index",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Partition applicants by term, converting an existing unpartitioned table",
+    )
+    parser.add_argument(
+        "--detach",
+        metavar="TERM",
+        action="append",
+        default=[],
+        help="Detach the partition of TERM (e.g. 'Fall 2024') into a standalone table; repeatable",
+    )
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        load_data.create_applicants_table(conn, partitioned=args.partition)
+        if args.partition and partition_applicants(conn):
+            print("Table 'applicants' is now partitioned by term.")
+        load_manifest.create_manifest_table(conn)
+        for term in args.detach:
+            try:
+                print(f"Detached {term!r} into table {detach_term(conn, term)}.")
+            except ValueError as e:
+                print(f"Error: {e}")
+                return 1
+        built = create_indexes(conn)
+        print(f"Migration complete: {len(built)} index(es) built.")
+        if args.check:
+            print("Index usage per question:")
+            if not _print_index_usage(check_index_usage(conn)):
+                return 1
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,7 @@ See Also:
 import psycopg
 from psycopg import sql
 
+import load_dimensions
 from db import get_connection
 
 # Hard ceiling on caller-supplied LIMIT values (clamp to 1–_LIMIT_MAX).
@@ -88,14 +89,14 @@ def question_2(conn):
     cursor = conn.cursor()
 
     # Total entries
-    cursor.execute("SELECT COUNT(*) FROM applicants WHERE us_or_international IS NOT NULL;")
+    cursor.execute("SELECT COUNT(*) FROM applicants WHERE citizenship_id IS NOT NULL;")
     total = cursor.fetchone()[0]
 
     # International students (not American or Other)
     cursor.execute("""
         SELECT COUNT(*)
         FROM applicants
-        WHERE us_or_international = 'International';
+        WHERE citizenship_id = (SELECT id FROM citizenships WHERE name = 'International');
     """)
     international = cursor.fetchone()[0]
 
@@ -182,7 +183,7 @@ def question_4(conn):
     Note:
         Only includes entries with:
             - term = 'Fall 2026'
-            - us_or_international = 'American'
+            - citizenship = 'American'
             - Non-null GPA value
 
     Example:
@@ -196,7 +197,7 @@ def question_4(conn):
         SELECT AVG(gpa), COUNT(gpa)
         FROM applicants
         WHERE term = 'Fall 2026'
-          AND us_or_international = 'American'
+          AND citizenship_id = (SELECT id FROM citizenships WHERE name = 'American')
           AND gpa IS NOT NULL;
     """
     cursor.execute(query)
@@ -225,7 +226,7 @@ def question_5(conn):
         SELECT COUNT(*)
         FROM applicants
         WHERE term = 'Fall 2026'
-          AND status = 'Accepted';
+          AND status_id = (SELECT id FROM statuses WHERE name = 'Accepted');
     """)
     acceptances = cursor.fetchone()[0]
 
@@ -246,7 +247,7 @@ def question_6(conn):
         SELECT AVG(gpa), COUNT(gpa)
         FROM applicants
         WHERE term = 'Fall 2026'
-          AND status = 'Accepted'
+          AND status_id = (SELECT id FROM statuses WHERE name = 'Accepted')
           AND gpa IS NOT NULL;
     """
     cursor.execute(query)
@@ -267,7 +268,7 @@ def question_7(conn):
         FROM applicants
         WHERE (program ILIKE '%Johns Hopkins%' OR program ILIKE '%JHU%')
           AND program ILIKE '%Computer Science%'
-          AND degree = 'Masters';
+          AND degree_id = (SELECT id FROM degrees WHERE name = 'Masters');
     """
     cursor.execute(query)
     count = cursor.fetchone()[0]
@@ -286,9 +287,9 @@ def question_8(conn):
     query = """
         SELECT COUNT(*)
         FROM applicants
-        WHERE term ILIKE '%2026%'
-          AND status = 'Accepted'
-          AND degree = 'PhD'
+        WHERE term IN ('Spring 2026', 'Summer 2026', 'Fall 2026', 'Winter 2026')
+          AND status_id = (SELECT id FROM statuses WHERE name = 'Accepted')
+          AND degree_id = (SELECT id FROM degrees WHERE name = 'PhD')
           AND program ILIKE '%Computer Science%'
           AND (
               program ILIKE '%Georgetown%' OR
@@ -315,16 +316,17 @@ def question_9(conn):
     query = """
         SELECT COUNT(*)
         FROM applicants
-        WHERE term ILIKE '%2026%'
-          AND status = 'Accepted'
-          AND degree = 'PhD'
-          AND llm_generated_program ILIKE '%Computer Science%'
-          AND (
-              llm_generated_university ILIKE '%Georgetown%' OR
-              llm_generated_university ILIKE '%MIT%' OR
-              llm_generated_university ILIKE '%Stanford%' OR
-              llm_generated_university ILIKE '%Carnegie Mellon%' OR
-              llm_generated_university ILIKE '%CMU%'
+        WHERE term IN ('Spring 2026', 'Summer 2026', 'Fall 2026', 'Winter 2026')
+          AND status_id = (SELECT id FROM statuses WHERE name = 'Accepted')
+          AND degree_id = (SELECT id FROM degrees WHERE name = 'PhD')
+          AND program_id IN (SELECT id FROM programs WHERE name ILIKE '%Computer Science%')
+          AND university_id IN (
+              SELECT id FROM universities
+              WHERE name ILIKE '%Georgetown%' OR
+                    name ILIKE '%MIT%' OR
+                    name ILIKE '%Stanford%' OR
+                    name ILIKE '%Carnegie Mellon%' OR
+                    name ILIKE '%CMU%'
           );
     """
     cursor.execute(query)
@@ -334,9 +336,9 @@ def question_9(conn):
     cursor.execute("""
         SELECT COUNT(*)
         FROM applicants
-        WHERE term ILIKE '%2026%'
-          AND status = 'Accepted'
-          AND degree = 'PhD'
+        WHERE term IN ('Spring 2026', 'Summer 2026', 'Fall 2026', 'Winter 2026')
+          AND status_id = (SELECT id FROM statuses WHERE name = 'Accepted')
+          AND degree_id = (SELECT id FROM degrees WHERE name = 'PhD')
           AND program ILIKE '%Computer Science%'
           AND (
               program ILIKE '%Georgetown%' OR
@@ -383,7 +385,9 @@ def question_10(conn, limit=10):
 
     Note:
         Uses LLM-generated standardized university and program names for
-        better aggregation of similar programs.
+        better aggregation of similar programs. Rows are grouped on their
+        integer keys, and only the top ``limit`` groups are joined to the
+        ``universities`` and ``programs`` tables for their names.
 
     Example:
         >>> conn = get_connection()
@@ -400,28 +404,37 @@ def question_10(conn, limit=10):
     # driver.  The LIMIT value is passed as a parameter (%s) — never embedded
     # in the SQL text — so the driver handles type safety.
     stmt = sql.SQL("""
-        SELECT
-            {univ},
-            {prog},
-            COUNT(*) AS total_applications,
-            SUM(CASE WHEN {status} = 'Accepted' THEN 1 ELSE 0 END) AS acceptances,
-            ROUND(
-                100.0 * SUM(CASE WHEN {status} = 'Accepted' THEN 1 ELSE 0 END) / COUNT(*),
-                2
-            ) AS acceptance_rate
-        FROM {table}
-        WHERE {term} = 'Fall 2026'
-            AND {univ} IS NOT NULL
-            AND {prog} IS NOT NULL
-        GROUP BY {univ}, {prog}
-        ORDER BY total_applications DESC
-        LIMIT {lim}
+        SELECT {universities}.name, {programs}.name, c.total_applications, c.acceptances, c.acceptance_rate
+        FROM (
+            SELECT
+                {univ},
+                {prog},
+                COUNT(*) AS total_applications,
+                SUM(CASE WHEN {status} = {accepted} THEN 1 ELSE 0 END) AS acceptances,
+                ROUND(
+                    100.0 * SUM(CASE WHEN {status} = {accepted} THEN 1 ELSE 0 END) / COUNT(*),
+                    2
+                ) AS acceptance_rate
+            FROM {table}
+            WHERE {term} = 'Fall 2026'
+                AND {univ} IS NOT NULL
+                AND {prog} IS NOT NULL
+            GROUP BY {univ}, {prog}
+            ORDER BY total_applications DESC
+            LIMIT {lim}
+        ) c
+        JOIN {universities} ON {universities}.id = c.{univ}
+        JOIN {programs} ON {programs}.id = c.{prog}
+        ORDER BY c.total_applications DESC
     """).format(
         table=sql.Identifier("applicants"),
-        univ=sql.Identifier("llm_generated_university"),
-        prog=sql.Identifier("llm_generated_program"),
-        status=sql.Identifier("status"),
+        univ=sql.Identifier("university_id"),
+        prog=sql.Identifier("program_id"),
+        status=sql.Identifier("status_id"),
+        accepted=load_dimensions.key_lookup("statuses", "Accepted"),
         term=sql.Identifier("term"),
+        universities=sql.Identifier("universities"),
+        programs=sql.Identifier("programs"),
         lim=sql.Placeholder(),
     )
     cursor.execute(stmt, [limit])
@@ -444,34 +457,43 @@ def question_11(conn):
     cursor = conn.cursor()
 
     # Identifiers are quoted via sql.SQL so any future rename stays safe.
-    # LIMIT 100 provides an inherent upper bound on rows returned.
+    # LIMIT 100 provides an inherent upper bound on rows returned. Every
+    # degree key is aggregated (there are only a few) and the join keeps PhD
+    # and Masters, so no per-row name lookup is needed.
     stmt = sql.SQL("""
-        SELECT
-            {degree},
-            COUNT(*) AS total_applications,
-            SUM(CASE WHEN {status} = 'Accepted' THEN 1 ELSE 0 END) AS acceptances,
-            ROUND(
-                100.0 * SUM(CASE WHEN {status} = 'Accepted' THEN 1 ELSE 0 END) / COUNT(*),
-                2
-            ) AS acceptance_rate,
-            ROUND(
-                CAST(
-                    AVG(CASE WHEN {status} = 'Accepted' AND {gpa} IS NOT NULL THEN {gpa} END)
-                    AS numeric
-                ),
-                2
-            ) AS avg_gpa_accepted,
-            COUNT(CASE WHEN {status} = 'Accepted' AND {gpa} IS NOT NULL THEN 1 END) AS gpa_count
-        FROM {table}
-        WHERE {degree} IN ('PhD', 'Masters')
-        GROUP BY {degree}
-        ORDER BY {degree}
+        SELECT {degrees}.name, c.total_applications, c.acceptances, c.acceptance_rate,
+               c.avg_gpa_accepted, c.gpa_count
+        FROM (
+            SELECT
+                {degree},
+                COUNT(*) AS total_applications,
+                SUM(CASE WHEN {status} = {accepted} THEN 1 ELSE 0 END) AS acceptances,
+                ROUND(
+                    100.0 * SUM(CASE WHEN {status} = {accepted} THEN 1 ELSE 0 END) / COUNT(*),
+                    2
+                ) AS acceptance_rate,
+                ROUND(
+                    CAST(
+                        AVG(CASE WHEN {status} = {accepted} AND {gpa} IS NOT NULL THEN {gpa} END)
+                        AS numeric
+                    ),
+                    2
+                ) AS avg_gpa_accepted,
+                COUNT(CASE WHEN {status} = {accepted} AND {gpa} IS NOT NULL THEN 1 END) AS gpa_count
+            FROM {table}
+            GROUP BY {degree}
+        ) c
+        JOIN {degrees} ON {degrees}.id = c.{degree}
+        WHERE {degrees}.name IN ('PhD', 'Masters')
+        ORDER BY {degrees}.name
         LIMIT 100
     """).format(
         table=sql.Identifier("applicants"),
-        degree=sql.Identifier("degree"),
-        status=sql.Identifier("status"),
+        degree=sql.Identifier("degree_id"),
+        status=sql.Identifier("status_id"),
+        accepted=load_dimensions.key_lookup("statuses", "Accepted"),
         gpa=sql.Identifier("gpa"),
+        degrees=sql.Identifier("degrees"),
     )
     cursor.execute(stmt)
     results = cursor.fetchall()
@@ -77,6 +77,25 @@ def mock_query_functions(monkeypatch):
     monkeypatch.setattr('query_data.question_11', lambda _conn: [])
 
 
+@pytest.fixture
+def scratch_schema():
+    """Connection whose search_path points at a throwaway schema."""
+    from db import get_connection
+
+    conn = get_connection()
+    with conn.cursor() as cur:
+        cur.execute("DROP SCHEMA IF EXISTS load_data_test CASCADE")
+        cur.execute("CREATE SCHEMA load_data_test")
+        cur.execute("SET search_path TO load_data_test")
+    conn.commit()
+    yield conn
+    conn.rollback()
+    with conn.cursor() as cur:
+        cur.execute("DROP SCHEMA IF EXISTS load_data_test CASCADE")
+    conn.commit()
+    conn.close()
+
+
 @pytest.fixture
 def app(mock_query_functions):
     """Create and configure a test Flask application instance."""
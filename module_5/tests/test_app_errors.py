@@ -265,7 +265,10 @@ class TestAdditionalPullDataErrors:
         # Mock cursor to raise exception on execute
         class MockCursor:
             def execute(self, query, params=None):
-                raise RuntimeError("Database insert failed")
+                if params is not None:
+                    raise RuntimeError("Database insert failed")
+            def fetchone(self):
+                return None
             def close(self):
                 pass
             rowcount = 0
@@ -328,6 +331,10 @@ class TestAdditionalPullDataErrors:
                 self.rowcount = 1
             def execute(self, query, params=None):
                 pass
+            def fetchone(self):
+                return None
+            def fetchall(self):
+                return []
             def close(self):
                 pass
 
@@ -24,6 +24,12 @@ class MockCursor:
     def execute(self, query, params=None):
         self.executed_queries.append((query, params))
 
+    def fetchone(self):
+        return None  # applicants is not partitioned
+
+    def fetchall(self):
+        return []  # no dimension keys
+
     def close(self):
         self.closed = True
 
@@ -150,7 +156,8 @@ class TestPullDataEndpoint:
 
         class CountingMockCursor(original_cursor_class):
             def execute(self, query, params=None):
-                call_count['cursor_execute'] += 1
+                if params is not None and not isinstance(params[0], list):  # inserts, not lookups
+                    call_count['cursor_execute'] += 1
                 super().execute(query, params)
 
         class CountingMockConnection:
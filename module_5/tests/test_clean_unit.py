@@ -8,6 +8,7 @@ import json
 import os
 import runpy
 import sys
+import time
 from unittest.mock import MagicMock
 
 import pytest
@@ -374,6 +375,15 @@ class TestStandardizeWithLLM:
         captured = capsys.readouterr()
         assert 'completed' in captured.out
 
+    def test_standardize_reports_progress_without_output(self, monkeypatch, capsys):
+        """Test progress messages when no progress log is kept."""
+        monkeypatch.setattr('clean._standardize_university_with_llm', lambda entry, api_url: entry)
+
+        result = clean._standardize_with_llm([{'n': i} for i in range(10)])
+
+        assert len(result) == 10
+        assert 'processed 10/10' in capsys.readouterr().out
+
     def test_standardize_with_flush(self, tmp_path, monkeypatch, capsys):
         """Test flushing progress to file."""
         output_file = tmp_path / "progress.json"
@@ -440,11 +450,14 @@ class TestCleanMainBlock:
         assert output_file.exists()
 
     def test_main_standardize_with_existing(self, tmp_path, monkeypatch):
-        """Test __main__ block with --standardize and existing output with LLM entries."""
+        """Test __main__ block resumes from an existing progress log."""
+        sent = []
+
         class MockPoolManager:
             def request(self, method, url, body=None, headers=None):
                 entries = json.loads(body) if body else []
                 for e in entries:
+                    sent.append(e['university'])
                     e['llm-generated-university'] = 'Mock University'
                     e['llm-generated-program'] = 'Mock Program'
                 resp = MagicMock()
@@ -454,16 +467,13 @@ class TestCleanMainBlock:
 
         input_file = tmp_path / "input.json"
         output_file = tmp_path / "output.json"
-        input_file.write_text(json.dumps([
-            {"university": "Stanford", "program_name": "CS"},
-            {"university": "MIT", "program_name": "EE"},
-        ]))
-        # Pre-create output with one LLM-processed entry
-        output_file.write_text(json.dumps([
-            {"university": "Stanford", "program_name": "CS",
-             "llm-generated-university": "Stanford University",
-             "llm-generated-program": "Computer Science"},
-        ]))
+        done = {"university": "Stanford", "program_name": "CS"}
+        input_file.write_text(json.dumps([done, {"university": "MIT", "program_name": "EE"}]))
+        # Pre-create a progress log holding the first entry
+        key = clean._record_key(done)
+        row = dict(done, **{"llm-generated-university": "Stanford University"})
+        (tmp_path / "output.json.progress.jsonl").write_text(json.dumps({"key": key, "row": row}) + "\n")
+        (tmp_path / "output.json.progress.idx").write_text(f"0\t{key}\n")
         monkeypatch.setattr(urllib3, 'PoolManager', MockPoolManager)
         monkeypatch.setattr(sys, 'argv', [
             'clean.py', '--input', str(input_file), '--output', str(output_file),
@@ -471,7 +481,403 @@ class TestCleanMainBlock:
         ])
         src_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'clean.py')
         runpy.run_path(src_path, run_name='__main__')
-        assert output_file.exists()
+
+        assert sent == ['MIT']
+        saved = json.loads(output_file.read_text())
+        assert saved[0]['llm-generated-university'] == 'Stanford University'
+        assert saved[1]['llm-generated-university'] == 'Mock University'
+        assert not (tmp_path / "output.json.progress.jsonl").exists()
+        assert not (tmp_path / "output.json.progress.idx").exists()
+
+
+@pytest.mark.db
+class TestProgressLog:
+    """Test the append-only progress log used by --standardize."""
+
+    def test_record_key_prefers_url(self):
+        """Test that entries with a URL are keyed by it."""
+        assert clean._record_key({'url': '/result/1', 'x': 1}) == 'url:/result/1'
+
+    def test_record_key_hash_is_order_independent(self):
+        """Test that URL-less entries hash to the same key regardless of key order."""
+        key = clean._record_key({'a': 1, 'b': 2})
+        assert key.startswith('sha1:')
+        assert key == clean._record_key({'b': 2, 'a': 1})
+        assert key != clean._record_key({'a': 1, 'b': 3})
+
+    def test_load_progress_index_missing_file(self, tmp_path):
+        """Test that a missing index means nothing was processed."""
+        assert not clean._load_progress_index(str(tmp_path / "none.idx"))
+
+    def test_load_progress_index_truncates_torn_line(self, tmp_path):
+        """Test that a partially written final index line is dropped."""
+        idx = tmp_path / "out.idx"
+        idx.write_text("0\tk1\n25\tk2\n51\tk")
+        index = clean._load_progress_index(str(idx))
+        assert index == {'k1': 0, 'k2': 25}
+        assert idx.read_text() == "0\tk1\n25\tk2\n"
+
+    def test_progress_log_is_append_only(self, tmp_path, monkeypatch):
+        """Test that each entry is appended once and resumed entries are not re-sent."""
+        output_file = tmp_path / "out.json"
+        data = [{'url': f'/result/{i}', 'university': f'U{i}'} for i in range(5)]
+        sent = []
+
+        def mock_standardize(entry, api_url):
+            sent.append(entry['url'])
+            return dict(entry, **{'llm-generated-university': entry['university'] + ' University'})
+
+        monkeypatch.setattr('clean._standardize_university_with_llm', mock_standardize)
+
+        clean._standardize_with_llm(data[:3], output_path=str(output_file), flush_every=2)
+        log = tmp_path / "out.json.progress.jsonl"
+        assert len(log.read_text().splitlines()) == 3
+
+        result = clean._standardize_with_llm(data, output_path=str(output_file))
+        assert sent == [f'/result/{i}' for i in range(5)]
+        assert len(log.read_text().splitlines()) == 5
+        assert [r['llm-generated-university'] for r in result] == [f'U{i} University' for i in range(5)]
+
+    def test_failed_entries_are_retried_on_rerun(self, tmp_path, monkeypatch, capsys):
+        """Test that entries whose API call failed are not logged as done."""
+        output_file = tmp_path / "out.json"
+        data = [{'url': f'/result/{i}', 'university': f'U{i}'} for i in range(3)]
+        monkeypatch.setattr('clean._http', MockReplicaHTTP({'http://api/s': ConnectionError('refused')}))
+
+        first = clean._standardize_with_llm(data, 'http://api/s', output_path=str(output_file))
+
+        assert not any('llm-generated-university' in row for row in first)
+        assert not (tmp_path / "out.json.progress.idx").read_text()
+        assert '3 entries could not be standardized' in capsys.readouterr().out
+
+        http = MockReplicaHTTP({'http://api/s': 200})
+        monkeypatch.setattr('clean._http', http)
+        second = clean._standardize_with_llm(data, 'http://api/s', output_path=str(output_file))
+
+        assert 'resuming' not in capsys.readouterr().out
+        assert len(http.posts) == 3
+        assert [row['llm-generated-university'] for row in second] == ['http://api/s'] * 3
+        assert len((tmp_path / "out.json.progress.idx").read_text().splitlines()) == 3
+
+    def test_compact_progress_jsonl(self, tmp_path):
+        """Test compaction into JSON Lines removes the progress files."""
+        output_file = tmp_path / "out.jsonl"
+        for suffix in ('.progress.jsonl', '.progress.idx'):
+            (tmp_path / f"out.jsonl{suffix}").write_text('')
+        clean._compact_progress([{'a': 1}, {'a': 2}], str(output_file))
+        lines = output_file.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [{'a': 1}, {'a': 2}]
+        assert not (tmp_path / "out.jsonl.progress.jsonl").exists()
+        assert not (tmp_path / "out.jsonl.progress.idx").exists()
+
+
+@pytest.mark.db
+class TestRulesStandardization:
+    """Test the offline rules mode (canonical lists, LLM only below threshold)."""
+
+    def test_exact_canonical_hit_is_fully_confident(self):
+        """Test abbreviations and exact canonical names score 1.0."""
+        result = clean._standardize_with_rules({'program_name': 'Mathematic', 'university': 'UBC'})
+
+        assert result['llm-generated-program'] == 'Mathematics'
+        assert result['llm-generated-university'] == 'University of British Columbia'
+        assert result['standardize-confidence'] == 1.0
+
+    def test_fuzzy_hit_scores_similarity(self):
+        """Test that fuzzy matches are mapped and scored below 1.0."""
+        result = clean._standardize_with_rules(
+            {'program_name': 'Computer Science', 'university': 'Stanfrd University'}
+        )
+
+        assert result['llm-generated-university'] == 'Stanford University'
+        assert 0.86 <= result['standardize-confidence'] < 1.0
+
+    def test_combined_program_text_and_missing_university(self):
+        """Test splitting a combined 'program' string; no university means zero confidence."""
+        result = clean._standardize_with_rules({'program': 'Basket weaving'})
+
+        assert result['llm-generated-program'] == 'Basket Weaving'
+        assert result['llm-generated-university'] == 'Unknown'
+        assert result['standardize-confidence'] == 0.0
+
+    def test_missing_canonical_list(self, monkeypatch, capsys):
+        """Test that a missing canonical file degrades to zero confidence."""
+        monkeypatch.setattr('clean.CANON_UNIS_PATH', '/nonexistent/canon.txt')
+
+        result = clean._standardize_with_rules({'program': 'Mathematics, McGill University'})
+
+        assert result['standardize-confidence'] == 0.0
+        assert 'not found' in capsys.readouterr().out
+
+    @pytest.mark.parametrize('name', ['canon_programs.txt', 'canon_universities.txt'])
+    def test_canonical_lists_match_llm_hosting(self, name):
+        """Test the packaged lists stay identical to module_2/llm_hosting's copies."""
+        here = os.path.dirname(__file__)
+        with open(os.path.join(here, '..', 'src', name), 'rb') as f:
+            packaged = f.read()
+        with open(os.path.join(here, '..', '..', 'module_2', 'llm_hosting', name), 'rb') as f:
+            hosted = f.read()
+
+        assert packaged == hosted, f"src/{name} differs from module_2/llm_hosting/{name}; copy it over"
+
+    def test_confident_rows_skip_the_api(self, monkeypatch):
+        """Test that rules mode only calls the API for low-confidence rows."""
+        sent = []
+
+        def mock_standardize(entry, api_url):
+            sent.append(entry['university'])
+            return dict(entry, **{'llm-generated-university': 'From LLM'})
+
+        monkeypatch.setattr('clean._standardize_university_with_llm', mock_standardize)
+        data = [
+            {'program_name': 'Physics', 'university': 'Yale University'},
+            {'program_name': 'Physics', 'university': 'Nowhere Tech'},
+        ]
+
+        result = clean._standardize_with_llm(data, mode='rules')
+
+        assert sent == ['Nowhere Tech']
+        assert result[0]['llm-generated-university'] == 'Yale University'
+        assert result[1]['llm-generated-university'] == 'From LLM'
+
+    def test_rules_result_kept_when_api_fails(self, monkeypatch):
+        """Test that a failed API call falls back to the rules result."""
+        monkeypatch.setattr('clean._standardize_university_with_llm', lambda entry, api_url: entry)
+
+        result = clean._standardize_entry(
+            {'program_name': 'Physics', 'university': 'Nowhere Tech'}, 'http://x', mode='rules'
+        )
+
+        assert result['llm-generated-university'] == 'Nowhere Tech'
+        assert result['standardize-confidence'] == 0.0
+
+    def test_main_rules_mode(self, tmp_path, monkeypatch):
+        """Test __main__ with --standardize-mode rules and a threshold of zero."""
+        input_file = tmp_path / "input.json"
+        output_file = tmp_path / "output.jsonl"
+        input_file.write_text('[{"university": "Yale University", "program_name": "Physics"}]')
+        monkeypatch.setattr(sys, 'argv', [
+            'clean.py', '--input', str(input_file), '--output', str(output_file),
+            '--standardize', '--standardize-mode', 'rules', '--confidence-threshold', '0'
+        ])
+        src_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'clean.py')
+        runpy.run_path(src_path, run_name='__main__')
+
+        row = json.loads(output_file.read_text())
+        assert row['llm-generated-university'] == 'Yale University'
+
+
+class MockReplicaHTTP:
+    """Per-URL scripted HTTP client: each behaviour is a status code, an exception, or (delay, status)."""
+
+    def __init__(self, behaviours, health_status=200):
+        self.behaviours = behaviours
+        self.health_status = health_status
+        self.posts = []
+
+    def request(self, method, url, **kwargs):
+        if method == 'GET':
+            if isinstance(self.health_status, Exception):
+                raise self.health_status
+            return MagicMock(status=self.health_status)
+        self.posts.append(url)
+        behaviour = self.behaviours[url]
+        if isinstance(behaviour, tuple):
+            time.sleep(behaviour[0])
+            behaviour = behaviour[1]
+        if isinstance(behaviour, Exception):
+            raise behaviour
+        rows = [dict(row, **{'llm-generated-university': url}) for row in json.loads(kwargs['body'])]
+        return MagicMock(status=behaviour, data=json.dumps({'rows': rows}).encode('utf-8'))
+
+
+@pytest.mark.db
+class TestReplicaPool:
+    """Test client-side load balancing across standardizer replicas."""
+
+    def test_parse_api_urls(self):
+        """Test splitting comma-separated URLs."""
+        assert clean._parse_api_urls(' http://a/s, ,http://b/s ') == ['http://a/s', 'http://b/s']
+
+    def test_pool_requires_urls(self):
+        """Test that an empty pool is rejected."""
+        with pytest.raises(ValueError):
+            clean.ReplicaPool([])
+
+    def test_least_outstanding_with_rotation(self):
+        """Test that the least-loaded replica is chosen and ties rotate."""
+        pool = clean.ReplicaPool(['a', 'b'])
+        assert str(pool) == 'a, b'
+        pool.outstanding['a'] = 3
+        assert pool._acquire() == 'b'
+        pool.outstanding = {'a': 0, 'b': 0}
+        assert [pool._acquire(), pool._acquire(), pool._acquire()] == ['a', 'b', 'a']
+
+    def test_failed_replica_is_ejected_and_retried_elsewhere(self, monkeypatch, capsys):
+        """Test that an error ejects a replica and the request is retried on another."""
+        http = MockReplicaHTTP({'http://a/s': ConnectionError('down'), 'http://b/s': 200})
+        monkeypatch.setattr('clean._http', http)
+        pool = clean.ReplicaPool(['http://a/s', 'http://b/s'])
+
+        resp = pool.request(b'[{}]')
+
+        assert resp.status == 200
+        assert http.posts == ['http://a/s', 'http://b/s']
+        assert pool.ejected_until['http://a/s'] > 0
+        assert pool.outstanding == {'http://a/s': 0, 'http://b/s': 0}
+        assert 'ejected http://a/s' in capsys.readouterr().out
+
+    def test_all_replicas_failing(self, monkeypatch):
+        """Test the last 5xx response is returned and the last error re-raised."""
+        monkeypatch.setattr('clean._http', MockReplicaHTTP({'a': 503, 'b': 502}))
+        assert clean.ReplicaPool(['a', 'b']).request(b'[]').status == 502
+
+        monkeypatch.setattr('clean._http', MockReplicaHTTP({'a': OSError('x'), 'b': OSError('y')}))
+        with pytest.raises(OSError):
+            clean.ReplicaPool(['a', 'b']).request(b'[]')
+
+    def test_no_available_replicas(self, tmp_path, capsys):
+        """Test that a pool whose replicas stay down stops the batch instead of skipping rows."""
+        pool = clean.ReplicaPool(['http://a/s'], max_wait=0)
+        pool.ejected_until['http://a/s'] = time.monotonic() + 60
+        with pytest.raises(clean.NoHealthyReplicas):
+            pool.request(b'[]')
+
+        with pytest.raises(clean.NoHealthyReplicas):
+            clean._standardize_university_with_llm({'university': 'X'}, pool)
+
+        output = tmp_path / 'out.json'
+        with pytest.raises(clean.NoHealthyReplicas, match='no healthy standardizer replicas'):
+            clean._standardize_with_llm([{'url': '/result/1'}], pool, output_path=str(output))
+        assert not (tmp_path / 'out.json.progress.idx').read_text()
+
+    def test_all_replicas_down_waits_for_recovery(self, monkeypatch, capsys):
+        """Test that a request waits with backoff until an ejected replica passes its health check."""
+        http = MockReplicaHTTP({'http://a:1/s': 200, 'http://b:1/s': 200}, health_status=ConnectionError('down'))
+        monkeypatch.setattr('clean._http', http)
+        monkeypatch.setattr(clean.ReplicaPool, 'WAIT_BACKOFF', 0.01)
+        pool = clean.ReplicaPool(['http://a:1/s', 'http://b:1/s'], eject_seconds=0.02, max_wait=5)
+        pool.ejected_until = {url: 1.0 for url in pool.urls}
+        sleeps = []
+        real_sleep = time.sleep
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 3:
+                http.health_status = 200
+            real_sleep(seconds)
+
+        monkeypatch.setattr('clean.time.sleep', sleep)
+
+        assert pool.request(b'[{}]').status == 200
+        assert sleeps[:2] == [0.01, 0.02]
+        assert len(http.posts) == 1
+        out = capsys.readouterr().out
+        assert 'all replicas ejected' in out and 're-admitted' in out
+
+    def test_ejected_replica_readmitted_by_health_check(self, monkeypatch, capsys):
+        """Test that an ejected replica returns only after GET / succeeds."""
+        http = MockReplicaHTTP({}, health_status=ConnectionError('still down'))
+        monkeypatch.setattr('clean._http', http)
+        pool = clean.ReplicaPool(['http://a:1/s'], eject_seconds=60)
+        pool.ejected_until['http://a:1/s'] = 1.0
+
+        assert pool._acquire() is None
+        assert pool.ejected_until['http://a:1/s'] > time.monotonic()
+
+        http.health_status = 200
+        pool.ejected_until['http://a:1/s'] = 1.0
+        assert pool._acquire() == 'http://a:1/s'
+        assert 're-admitted' in capsys.readouterr().out
+
+    def test_health_check_runs_without_lock(self, monkeypatch):
+        """Test that other callers are served by healthy replicas while one is probed."""
+        pool = clean.ReplicaPool(['a', 'b'])
+        pool.ejected_until['a'] = 1.0
+        seen = []
+
+        def health_check(url):
+            assert not pool._lock.locked()
+            assert 'a' in pool.probing
+            seen.append((url, pool._acquire()))
+            return False
+
+        monkeypatch.setattr(pool, '_health_check', health_check)
+
+        assert pool._acquire() == 'b'
+        assert seen == [('a', 'b')]
+        assert not pool.probing
+        assert pool.ejected_until['a'] > time.monotonic()
+
+    def test_hedge_budget_is_p95(self):
+        """Test the hedge budget waits for enough samples, then tracks p95."""
+        pool = clean.ReplicaPool(['a'], hedge=True)
+        pool.latencies.extend([0.1] * 19)
+        assert pool.hedge_budget() is None
+        pool.latencies.extend([0.1] * 80 + [5.0])
+        assert pool.hedge_budget() == 0.1
+
+    def test_slow_request_is_hedged(self, monkeypatch):
+        """Test that a request slower than the budget is raced on a second replica."""
+        http = MockReplicaHTTP({'http://a/s': (0.5, 200), 'http://b/s': 200})
+        monkeypatch.setattr('clean._http', http)
+        pool = clean.ReplicaPool(['http://a/s', 'http://b/s'], hedge=True)
+        pool.latencies.extend([0.01] * 20)
+
+        result = clean._standardize_university_with_llm({'u': 1}, pool)
+
+        assert result['llm-generated-university'] == 'http://b/s'
+
+    def test_hedge_without_spare_replica_waits(self, monkeypatch):
+        """Test that with no second replica the slow primary is awaited."""
+        monkeypatch.setattr('clean._http', MockReplicaHTTP({'a': (0.05, 200)}))
+        pool = clean.ReplicaPool(['a'], hedge=True)
+        pool.latencies.extend([0.001] * 20)
+        assert pool.request(b'[{}]').status == 200
+
+    def test_hedge_both_failing_raises(self, monkeypatch):
+        """Test that the error surfaces when primary and hedge both fail."""
+        http = MockReplicaHTTP({'a': (0.05, OSError('slow fail')), 'b': OSError('fast fail')})
+        monkeypatch.setattr('clean._http', http)
+        pool = clean.ReplicaPool(['a', 'b'], hedge=True)
+        pool.latencies.extend([0.001] * 20)
+        with pytest.raises(OSError):
+            pool.request(b'[{}]')
+
+    def test_concurrent_standardize_keeps_order(self, tmp_path, monkeypatch):
+        """Test that concurrent requests keep input order and resume correctly."""
+        monkeypatch.setattr('clean._http', MockReplicaHTTP({'http://a/s': (0.01, 200), 'http://b/s': 200}))
+        pool = clean.ReplicaPool(['http://a/s', 'http://b/s'])
+        data = [{'url': f'/result/{i}'} for i in range(25)]
+        output = str(tmp_path / 'out.json')
+
+        first = clean._standardize_with_llm(data[:10], pool, output_path=output, concurrency=2)
+        result = clean._standardize_with_llm(data, pool, output_path=output, concurrency=2)
+
+        assert [r['url'] for r in result] == [d['url'] for d in data]
+        assert result[:10] == first
+        assert {r['llm-generated-university'] for r in result} == {'http://a/s', 'http://b/s'}
+
+    def test_main_with_replicas(self, tmp_path, monkeypatch):
+        """Test __main__ with several --api URLs and --hedge."""
+        class MockPoolManager(MockReplicaHTTP):
+            def __init__(self):
+                super().__init__({'http://a/s': 200, 'http://b/s': 200})
+
+        input_file = tmp_path / "input.json"
+        output_file = tmp_path / "output.json"
+        input_file.write_text(json.dumps([{'url': f'/result/{i}'} for i in range(4)]))
+        monkeypatch.setattr(urllib3, 'PoolManager', MockPoolManager)
+        monkeypatch.setattr(sys, 'argv', [
+            'clean.py', '--input', str(input_file), '--output', str(output_file),
+            '--standardize', '--api', 'http://a/s,http://b/s', '--hedge'
+        ])
+        src_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'clean.py')
+        runpy.run_path(src_path, run_name='__main__')
+
+        saved = json.loads(output_file.read_text())
+        assert len(saved) == 4
+        assert all('llm-generated-university' in row for row in saved)
 
 
 # Run tests with pytest
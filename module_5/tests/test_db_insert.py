@@ -22,6 +22,7 @@ class MockCursor:
         self.closed = False
         self._inserted_data = []
         self._duplicate_check = set()
+        self._dimension_names = None
 
     def execute(self, query, params=None):
         """Track executed queries and simulate ON CONFLICT behavior."""
@@ -29,6 +30,12 @@ class MockCursor:
         query_str = query if isinstance(query, str) else str(query)
         self.executed_queries.append((query_str, params))
 
+        # Dimension name lookups (load_dimensions.Interner) bind a list of
+        # names; the mock numbers them from 1 in the order given
+        self._dimension_names = params[0] if params and isinstance(params[0], list) else None
+        if self._dimension_names is not None:
+            return
+
         # Simulate ON CONFLICT DO NOTHING behavior
         if params and 'ON CONFLICT' in query_str:
             # Use p_id (first param) as unique identifier
@@ -45,8 +52,13 @@ class MockCursor:
             # Regular query
             self.rowcount = 1
 
+    def fetchone(self):
+        return None  # applicants is not partitioned
+
     def fetchall(self):
         """Return mock data for queries."""
+        if self._dimension_names is not None:
+            return [(name, key) for key, name in enumerate(self._dimension_names, 1)]
         # Return sample data that matches the expected structure
         return [
             {
@@ -179,8 +191,8 @@ class TestInsertOnPull:
         insert_queries = [q for q in cursor.executed_queries if 'INSERT' in q[0]]
         assert len(insert_queries) > 0, "Should have executed INSERT query"
 
-        # Verify required fields were included
-        _insert_query, insert_params = insert_queries[0]
+        # Verify required fields were included (dimension names are inserted first)
+        _insert_query, insert_params = insert_queries[-1]
         assert insert_params is not None
         assert len(insert_params) >= 13  # At least 13 fields based on app.py
 
@@ -190,7 +202,9 @@ class TestInsertOnPull:
         assert 'Stanford University' in program
         assert 'Computer Science' in program
         assert url == 'https://www.thegradcafe.com/survey/?p=123'
-        assert status == 'Accepted'
+        assert status == 1  # key of 'Accepted' in the statuses table
+        status_lookups = [params for query, params in cursor.executed_queries if "Identifier('statuses')" in query]
+        assert (['Accepted'],) in status_lookups
 
     def test_multiple_rows_inserted(self, client, monkeypatch):
         """Test that multiple rows can be inserted in a single pull."""
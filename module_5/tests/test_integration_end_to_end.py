@@ -16,6 +16,8 @@ import pytest
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import load_dimensions
+
 
 class MockSubprocessResult:
     """Mock object for subprocess.run() results."""
@@ -152,19 +154,21 @@ def test_db_table(test_db_connection):
         comments TEXT,
         date_added DATE,
         url TEXT,
-        status TEXT,
+        status_id SMALLINT,
         term TEXT,
-        us_or_international TEXT,
+        citizenship_id SMALLINT,
         gpa NUMERIC(3,2),
         gre NUMERIC(5,2),
         gre_v NUMERIC(5,2),
         gre_aw NUMERIC(3,2),
-        degree TEXT,
-        llm_generated_program TEXT,
-        llm_generated_university TEXT
+        degree_id SMALLINT,
+        program_id INTEGER,
+        university_id INTEGER
     );
     """
     cursor.execute(create_table_sql)
+    # Dimension tables are shared lookups, created alongside the real table
+    load_dimensions.create_dimension_tables(cursor)
     conn.commit()
     cursor.close()
 
@@ -0,0 +1,483 @@
+"""
+Unit and database tests for the bulk loading paths in load_data.py:
+COPY mode, sharded multi-process loading, the parse/write pipeline and upserts.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data
+import load_pipeline
+
+
+def _write_jsonl(path, rows):
+    """Write rows as JSON Lines and return the path as a string."""
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+    return str(path)
+
+
+@pytest.mark.db
+class TestLoadJSONDataCopyMode:
+    """Test the COPY-based load path."""
+
+    def test_copy_mode_streams_rows_merges_and_analyzes(self, tmp_path, capsys, monkeypatch):
+        """Batches are COPYed, merged, counted and followed by ANALYZE."""
+        monkeypatch.setitem(load_data._BATCH_SIZES, 'copy', 2)
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", [
+            {"url": f"https://test.com/result/{i}", "program": "Test", "gpa": "GPA 3.5"}
+            for i in range(1, 4)
+        ])
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.rowcount = 1
+        copy = cursor.copy.return_value.__enter__.return_value
+
+        result = load_data.load_json_data(json_file, conn, mode='copy')
+
+        assert result == 3
+        assert cursor.copy.call_count == 2  # one full batch of 2, then the remainder
+        copy.set_types.assert_called_with(load_data._APPLICANT_TYPES)
+        assert copy.write_row.call_count == 3
+        assert copy.write_row.call_args_list[0].args[0][:2] == (1, 'Test')
+        executed = [c.args[0] for c in cursor.execute.call_args_list]
+        assert executed[0] is load_data._STAGING_CREATE
+        assert executed.count(load_data._STAGING_MERGE) == 2
+        assert 'ANALYZE' in repr(executed[-1])
+        cursor.executemany.assert_not_called()
+        captured = capsys.readouterr()
+        assert 'Records inserted: 2' in captured.out
+        assert 'Duplicates skipped: 1' in captured.out
+
+    def test_insert_mode_does_not_copy(self, tmp_path):
+        """The default mode keeps using executemany."""
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", [{"url": "https://test.com/result/7"}])
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+
+        assert load_data.load_json_data(json_file, conn) == 1
+        cursor.executemany.assert_called_once()
+        cursor.copy.assert_not_called()
+
+    def test_unknown_mode_raises(self, tmp_path):
+        """An unsupported mode is rejected before reading the file."""
+        with pytest.raises(ValueError, match='Unknown load mode'):
+            load_data.load_json_data(str(tmp_path / "missing.jsonl"), MagicMock(), mode='bulk')
+
+    def test_column_types_match_columns(self):
+        """Binary COPY needs one type per loaded column."""
+        assert len(load_data._APPLICANT_TYPES) == len(load_data._APPLICANT_COLS)
+
+    def test_main_passes_mode_flag(self, monkeypatch):
+        """main() forwards --mode to load_json_data."""
+        calls = []
+        monkeypatch.setattr('load_data.get_connection', MagicMock)
+        monkeypatch.setattr('load_data.create_applicants_table', lambda conn: None)
+        monkeypatch.setattr('load_data.verify_data', lambda conn: None)
+        monkeypatch.setattr(
+            'load_data.load_json_data', lambda path, conn, mode='insert', **_: calls.append(mode)
+        )
+
+        load_data.main(['--mode', 'copy'])
+
+        assert calls == ['copy']
+
+    def test_parse_args_rejects_unknown_mode(self):
+        """Only the supported load modes are accepted on the command line."""
+        assert load_data._parse_args([]).mode == 'insert'
+        with pytest.raises(SystemExit):
+            load_data._parse_args(['--mode', 'bulk'])
+
+
+class _InlineExecutor:
+    """Stand-in for ProcessPoolExecutor that runs tasks in the calling process."""
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = MagicMock()
+        future.result.return_value = fn(*args)
+        return future
+
+
+@pytest.mark.db
+class TestParallelLoad:
+    """Test sharded multi-process loading."""
+
+    def test_shard_ranges_split_on_line_boundaries(self, tmp_path):
+        """Every line lands in exactly one shard."""
+        lines = [json.dumps({"url": f"/result/{i}", "program": "x" * (i % 7)}) for i in range(50)]
+        path = tmp_path / "rows.jsonl"
+        path.write_text("\n".join(lines) + "\n")
+        data = path.read_bytes()
+
+        for shards in (1, 2, 3, 8, 200):
+            ranges = load_data._shard_ranges(str(path), shards)
+            assert len(ranges) <= shards
+            assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+            assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+            assert all(start == 0 or data[start - 1:start] == b"\n" for start, _ in ranges)
+            pieces = [data[start:end].decode() for start, end in ranges]
+            assert "".join(pieces).splitlines() == lines
+
+    def test_shard_ranges_empty_file(self, tmp_path):
+        """An empty file has no shards."""
+        path = tmp_path / "empty.jsonl"
+        path.write_text("")
+        assert not load_data._shard_ranges(str(path), 4)
+
+    def test_load_range_reads_only_its_bytes(self, tmp_path):
+        """A range loads the lines that start inside it and nothing else."""
+        path = tmp_path / "rows.jsonl"
+        lines = [json.dumps({"url": f"/result/{i}"}) + "\n" for i in range(1, 5)]
+        path.write_text("".join(lines))
+        start = len(lines[0])
+        end = start + len(lines[1]) + len(lines[2])
+        conn = MagicMock()
+
+        assert load_data._load_range(str(path), conn, load_data._load_options(), (start, end)) == (2, 0, 0, end)
+        records = conn.cursor.return_value.executemany.call_args.args[1]
+        assert [r[0] for r in records] == [2, 3]
+
+    def test_load_shard_uses_own_connection(self, tmp_path, monkeypatch):
+        """Each shard opens and closes its own connection."""
+        conn = MagicMock()
+        monkeypatch.setattr('load_data.get_connection', lambda: conn)
+        path = _write_jsonl(tmp_path / "rows.jsonl", [{"url": "/result/9"}, {"url": "nope"}])
+
+        size = os.path.getsize(path)
+        assert load_data._load_shard(path, load_data._load_options(), (0, None)) == (1, 1, 0, size)
+        conn.close.assert_called_once()
+
+    def test_parallel_merges_shard_counts(self, tmp_path, monkeypatch, capsys):
+        """Counts from all shards are added up and reported once."""
+        def shard_connection():
+            shard_conn = MagicMock()
+            shard_conn.cursor.return_value.rowcount = 1
+            return shard_conn
+
+        monkeypatch.setattr('load_data.ProcessPoolExecutor', _InlineExecutor)
+        monkeypatch.setattr('load_data.get_connection', shard_connection)
+        rows = [{"url": f"/result/{i}"} for i in range(1, 10)] + [{"url": "none"}]
+        path = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        conn = MagicMock()
+
+        assert load_data.load_json_data_parallel(path, conn, 3, mode='copy') == 9
+        out = capsys.readouterr().out
+        assert 'in 3 shards' in out
+        assert 'Records skipped: 1' in out
+        assert 'Records inserted: 3' in out  # one mocked rowcount per shard
+        assert 'ANALYZE' in repr(conn.cursor.return_value.execute.call_args.args[0])
+
+    def test_parallel_rejects_unknown_mode(self, tmp_path):
+        """Mode is checked before any process starts."""
+        with pytest.raises(ValueError):
+            load_data.load_json_data_parallel(str(tmp_path / "x.jsonl"), MagicMock(), 2, mode='bulk')
+
+    def test_main_with_workers_uses_parallel_loader(self, monkeypatch):
+        """main() switches to the sharded loader when --workers > 1."""
+        calls = []
+        monkeypatch.setattr('load_data.get_connection', MagicMock)
+        monkeypatch.setattr('load_data.create_applicants_table', lambda conn: None)
+        monkeypatch.setattr('load_data.verify_data', lambda conn: None)
+        monkeypatch.setattr(
+            'load_data.load_json_data_parallel',
+            lambda path, conn, workers, **opts: calls.append((workers, opts['mode'], opts['pipeline'])),
+        )
+
+        load_data.main(['--workers', '4', '--pipeline'])
+
+        assert calls == [(4, 'insert', True)]
+
+
+@pytest.mark.db
+class TestPipelinedLoad:
+    """Test the parser-thread / writer pipeline."""
+
+    def test_pipeline_writes_same_batches(self, tmp_path, capsys, monkeypatch):
+        """Pipelined loading writes the same records as the serial loop."""
+        monkeypatch.setitem(load_data._BATCH_SIZES, 'insert', 3)
+        rows = [{"url": f"/result/{i}", "gpa": "3.1"} for i in range(1, 11)] + [{"url": "bad"}]
+        path = _write_jsonl(tmp_path / "rows.jsonl", rows)
+
+        serial, piped = MagicMock(), MagicMock()
+        assert load_data.load_json_data(path, serial) == 10
+        assert load_data.load_json_data(path, piped, pipeline=True) == 10
+
+        def written(conn):
+            return [call.args[1] for call in conn.cursor.return_value.executemany.call_args_list]
+
+        assert written(piped) == written(serial)
+        assert len(written(piped)) == 4
+        out = capsys.readouterr().out
+        assert 'Pipeline: parse busy' in out
+        assert 'bottleneck:' in out
+
+    def test_writer_error_stops_parser(self):
+        """A failed write stops the parser thread and re-raises on the caller."""
+        produced = []
+
+        def batches():
+            for i in range(100):
+                produced.append(i)
+                yield [i], i
+
+        def write(batch):
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError, match='db down'):
+            load_pipeline.run_pipeline(batches(), write, depth=1)
+        assert len(produced) < 100
+
+    def test_parser_error_is_reraised(self):
+        """An error while reading the input surfaces after queued batches are written."""
+        written = []
+
+        def batches():
+            yield [1], 1
+            raise OSError("disk gone")
+
+        with pytest.raises(OSError, match='disk gone'):
+            load_pipeline.run_pipeline(batches(), written.append)
+        assert written == [([1], 1)]
+
+    def test_stage_stats_name_the_bottleneck(self, capsys):
+        """The stage the other one waited on is reported as the bottleneck."""
+        load_pipeline.print_pipeline_stats(
+            {"parse_busy": 5.0, "parse_idle": 0.1, "write_busy": 1.0, "write_idle": 4.0}
+        )
+        load_pipeline.print_pipeline_stats(
+            {"parse_busy": 1.0, "parse_idle": 4.0, "write_busy": 5.0, "write_idle": 0.1}
+        )
+        out = capsys.readouterr().out.splitlines()
+        assert out[0].endswith('(bottleneck: parse)')
+        assert out[1].endswith('(bottleneck: write)')
+
+
+@pytest.mark.db
+class TestCopyModeDatabase:
+    """Run the COPY path against PostgreSQL."""
+
+    def test_copy_load_matches_insert_load(self, tmp_path, scratch_schema):
+        """COPY stores the same values as executemany and skips duplicates."""
+        rows = [
+            {
+                "url": "https://test.com/result/101", "program": "Stanford, CS", "comments": "a\x00b",
+                "date_added": "February 1, 2025", "applicant_status": "Accepted",
+                "semester_year_start": "Fall 2025", "citizenship": "International",
+                "gpa": "GPA 3.8", "gre": "GRE 325", "gre_v": "GRE V 165", "gre_aw": "GRE AW 4.5",
+                "masters_or_phd": "PhD", "llm-generated-program": "CS", "llm-generated-university": "Stanford",
+            },
+            {"url": "https://test.com/result/102", "program": "MIT, CS"},
+            {"url": "https://test.com/result/101", "program": "Duplicate"},
+        ]
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        conn = scratch_schema
+        load_data.create_applicants_table(conn)
+
+        assert load_data.load_json_data(json_file, conn, mode='copy') == 3
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM applicants ORDER BY p_id")
+            copied = cur.fetchall()
+            cur.execute("TRUNCATE applicants")
+        conn.commit()
+
+        load_data.load_json_data(json_file, conn)
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM applicants ORDER BY p_id")
+            inserted = cur.fetchall()
+
+        assert copied == inserted
+        assert [row[0] for row in copied] == [101, 102]
+        assert copied[0][1] == 'Stanford, CS'
+        assert copied[0][2] == 'ab'
+
+        # Reloading inserts nothing new
+        assert load_data.load_json_data(json_file, conn, mode='copy') == 3
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM applicants")
+            assert cur.fetchone()[0] == 2
+
+
+    def test_parallel_load_in_worker_processes(self, tmp_path, scratch_schema, monkeypatch):
+        """Spawned workers load every shard over their own connections."""
+        # Worker connections pick up the scratch schema through libpq's PGOPTIONS
+        monkeypatch.setenv('PGOPTIONS', '-c search_path=load_data_test')
+        rows = [{"url": f"https://test.com/result/{i}", "gpa": "3.5"} for i in range(1, 301)]
+        rows.append({"url": "https://test.com/result/5"})  # duplicate across shards
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        conn = scratch_schema
+        load_data.create_applicants_table(conn)
+
+        for mode in load_data.LOAD_MODES:
+            assert load_data.load_json_data_parallel(json_file, conn, 3, mode=mode) == 301
+            with conn.cursor() as cur:
+                cur.execute("SELECT count(*), min(p_id), max(p_id) FROM applicants")
+                assert cur.fetchone() == (300, 1, 300)
+                cur.execute("TRUNCATE applicants")
+            conn.commit()
+
+    def test_pipelined_copy_load(self, tmp_path, scratch_schema, monkeypatch):
+        """The pipeline feeds COPY batches correctly against PostgreSQL."""
+        monkeypatch.setitem(load_data._BATCH_SIZES, 'copy', 7)
+        rows = [{"url": f"https://test.com/result/{i}", "date_added": "March 3, 2026"} for i in range(1, 51)]
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        conn = scratch_schema
+        load_data.create_applicants_table(conn)
+
+        assert load_data.load_json_data(json_file, conn, mode='copy', pipeline=True) == 50
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*), count(DISTINCT date_added) FROM applicants")
+            assert cur.fetchone() == (50, 1)
+
+
+@pytest.mark.db
+class TestUpsertMode:
+    """Test the change-aware upsert path."""
+
+    def test_record_hash_tracks_content(self):
+        """Equal rows hash equally; any changed value changes the hash."""
+        record = load_data.build_record({"url": "/result/1", "llm-generated-program": "CS"})
+        same = load_data.build_record({"url": "/result/1", "llm-generated-program": "CS"})
+        changed = load_data.build_record({"url": "/result/1", "llm-generated-program": "Computer Science"})
+
+        assert len(load_data.record_hash(record)) == 16
+        assert load_data.record_hash(record) == load_data.record_hash(same)
+        assert load_data.record_hash(record) != load_data.record_hash(changed)
+
+    def test_insert_upsert_sends_hashed_rows(self, tmp_path):
+        """Insert mode upserts rows that carry their hash as the last value."""
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", [{"url": "/result/4", "program": "X"}])
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+
+        assert load_data.load_json_data(json_file, conn, upsert=True) == 1
+        statement, records = cursor.executemany.call_args.args
+        assert statement is load_data.APPLICANT_UPSERT
+        assert len(records[0]) == len(load_data._UPSERT_COLS)
+        assert records[0][-1] == load_data.record_hash(records[0][:-1])
+
+    def test_copy_upsert_merges_and_reports(self, tmp_path, capsys):
+        """Copy mode stages the hash column and reports written/unchanged rows."""
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", [{"url": f"/result/{i}"} for i in (1, 2, 3)])
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.rowcount = 1
+        copy = cursor.copy.return_value.__enter__.return_value
+
+        assert load_data.load_json_data(json_file, conn, mode='copy', upsert=True) == 3
+        cursor.copy.assert_called_once_with(load_data._STAGING_COPY_UPSERT)
+        copy.set_types.assert_called_once_with(load_data._UPSERT_TYPES)
+        assert load_data._STAGING_UPSERT in [c.args[0] for c in cursor.execute.call_args_list]
+        out = capsys.readouterr().out
+        assert 'Records inserted or updated: 1' in out
+        assert 'Unchanged or duplicate: 2' in out
+
+    def test_main_passes_upsert_flag(self, monkeypatch):
+        """main() forwards --upsert to load_json_data."""
+        calls = []
+        monkeypatch.setattr('load_data.get_connection', MagicMock)
+        monkeypatch.setattr('load_data.create_applicants_table', lambda conn: None)
+        monkeypatch.setattr('load_data.verify_data', lambda conn: None)
+        monkeypatch.setattr('load_data.load_json_data', lambda path, conn, **opts: calls.append(opts))
+
+        load_data.main(['--upsert', '--mode', 'copy'])
+
+        assert calls == [{"mode": "copy", "pipeline": False, "upsert": True, "incremental": False}]
+
+        load_data.main(['--incremental'])
+        assert calls[-1]["incremental"] is True
+
+        monkeypatch.setattr(sys, 'argv', ['gradcafe-load', '--upsert'])
+        load_data.main()
+        assert calls[-1]["upsert"] is True
+
+    def test_parallel_rejects_unknown_option(self, tmp_path):
+        """Only load_json_data's options are accepted."""
+        with pytest.raises(TypeError):
+            load_data.load_json_data_parallel(str(tmp_path / "x.jsonl"), MagicMock(), 2, batch=5)
+
+
+@pytest.mark.db
+class TestUpsertDatabase:
+    """Run upserts against PostgreSQL."""
+
+    @pytest.mark.parametrize('mode', load_data.LOAD_MODES)
+    def test_reload_updates_only_changed_rows(self, tmp_path, scratch_schema, mode):
+        """Changed rows are rewritten; unchanged rows keep their row version."""
+        rows = [{"url": f"https://test.com/result/{i}", "llm-generated-program": "CS"} for i in (1, 2, 3)]
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        conn = scratch_schema
+        load_data.create_applicants_table(conn)
+        load_data.load_json_data(json_file, conn, mode=mode)  # plain load: no hashes yet
+
+        def versions():
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT p_id, a.xmin::text, p.name FROM applicants a"
+                    " LEFT JOIN programs p ON p.id = a.program_id ORDER BY p_id"
+                )
+                return cur.fetchall()
+
+        # First upsert fills in the missing hashes
+        load_data.load_json_data(json_file, conn, mode=mode, upsert=True)
+        before = versions()
+
+        rows[1]["llm-generated-program"] = "Computer Science"
+        rows.append({"url": "https://test.com/result/4"})
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        load_data.load_json_data(json_file, conn, mode=mode, upsert=True)
+        after = versions()
+
+        assert [row[2] for row in after] == ["CS", "Computer Science", "CS", None]
+        assert after[0] == before[0] and after[2] == before[2]  # untouched
+        assert after[1][1] != before[1][1]
+
+    def test_copy_upsert_keeps_last_duplicate_in_batch(self, tmp_path, scratch_schema):
+        """A p_id repeated within one COPY batch is merged once, last copy winning."""
+        rows = [
+            {"url": "https://test.com/result/7", "program": "first"},
+            {"url": "https://test.com/result/7", "program": "second"},
+        ]
+        json_file = _write_jsonl(tmp_path / "rows.jsonl", rows)
+        conn = scratch_schema
+        load_data.create_applicants_table(conn)
+
+        load_data.load_json_data(json_file, conn, mode='copy', upsert=True)
+        with conn.cursor() as cur:
+            cur.execute("SELECT program FROM applicants")
+            assert cur.fetchall() == [("second",)]
+
+    def test_create_table_adds_hash_column_to_existing_table(self, scratch_schema):
+        """Tables created before upsert support gain the row_hash column."""
+        conn = scratch_schema
+        with conn.cursor() as cur:
+            cur.execute("CREATE TABLE applicants (p_id INTEGER PRIMARY KEY, program TEXT)")
+        conn.commit()
+
+        load_data.create_applicants_table(conn)
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT data_type FROM information_schema.columns"
+                " WHERE table_schema = 'load_data_test' AND column_name = 'row_hash'"
+            )
+            assert cur.fetchone() == ("bytea",)
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
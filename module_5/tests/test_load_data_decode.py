@@ -0,0 +1,206 @@
+"""
+Parity tests for the fast record decoding path in load_data.py.
+
+The reference functions below are the original implementations (uncompiled
+``re.search``, uncached ``strptime``, ``json.loads`` and an inline row
+mapping). Randomized inputs from fixed seeds check that the optimized path
+returns exactly the same values.
+"""
+
+import importlib
+import json
+import os
+import random
+import re
+import string
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data
+
+SEEDS = range(5)
+CASES_PER_SEED = 400
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+]
+
+
+def ref_numeric(s):
+    if not s:
+        return None
+    match = re.search(r'(\d+\.?\d*)', s)
+    return float(match.group(1)) if match else None
+
+
+def ref_date(date_str):
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, '%B %d, %Y').date()
+    except ValueError:
+        return None
+
+
+def ref_p_id(url):
+    if not url:
+        return None
+    match = re.search(r'/result/(\d+)', url)
+    return int(match.group(1)) if match else None
+
+
+def ref_record(data):
+    p_id = ref_p_id(data.get('url'))
+    if not p_id:
+        return None
+    return (
+        p_id,
+        load_data.clean_string(data.get('program')),
+        load_data.clean_string(data.get('comments')),
+        ref_date(data.get('date_added')),
+        load_data.clean_string(data.get('url')),
+        load_data.clean_string(data.get('applicant_status')),
+        load_data.clean_string(data.get('semester_year_start')),
+        load_data.clean_string(data.get('citizenship')),
+        ref_numeric(data.get('gpa')),
+        ref_numeric(data.get('gre')),
+        ref_numeric(data.get('gre_v')),
+        ref_numeric(data.get('gre_aw')),
+        load_data.clean_string(data.get('masters_or_phd')),
+        load_data.clean_string(data.get('llm-generated-program')),
+        load_data.clean_string(data.get('llm-generated-university')),
+    )
+
+
+def random_text(rng, alphabet=string.ascii_letters + string.digits + " .,/-\x00", max_len=20):
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_len)))
+
+
+def random_numeric(rng):
+    return rng.choice([
+        None, "",
+        f"GPA {rng.uniform(0, 4):.2f}",
+        f"GRE {rng.randint(130, 340)}",
+        f"GRE AW {rng.choice(['3.5', '4.', '.5', '10'])}",
+        random_text(rng, "0123456789. abcGRE٣"),
+        random_text(rng),
+    ])
+
+
+def random_date(rng):
+    return rng.choice([
+        None, "",
+        f"{rng.choice(MONTHS)} {rng.randint(1, 31)}, {rng.randint(1990, 2030)}",
+        f"{rng.choice(MONTHS)[:3]} {rng.randint(1, 31)}, {rng.randint(1990, 2030)}",
+        f"{rng.choice(MONTHS).lower()} {rng.randint(0, 40):02d}, {rng.randint(1, 9999)}",
+        f"{rng.randint(1990, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        random_text(rng),
+    ])
+
+
+def random_url(rng):
+    return rng.choice([
+        None, "",
+        f"https://www.thegradcafe.com/survey/result/{rng.randint(0, 10**9)}",
+        f"/result/{rng.randint(0, 999)}/extra",
+        f"https://example.com/results/{rng.randint(1, 99)}",
+        random_text(rng, string.ascii_letters + "/:." + string.digits),
+    ])
+
+
+def random_entry(rng):
+    entry = {
+        "url": random_url(rng),
+        "program": random_text(rng),
+        "comments": rng.choice([None, random_text(rng, max_len=60)]),
+        "date_added": random_date(rng),
+        "applicant_status": rng.choice(["Accepted", "Rejected", "Wait listed", None]),
+        "semester_year_start": rng.choice(["Fall 2026", "Spring 2025", None]),
+        "citizenship": rng.choice(["American", "International", None]),
+        "gpa": random_numeric(rng),
+        "gre": random_numeric(rng),
+        "gre_v": random_numeric(rng),
+        "gre_aw": random_numeric(rng),
+        "masters_or_phd": rng.choice(["PhD", "Masters", None]),
+        "llm-generated-program": random_text(rng),
+        "llm-generated-university": random_text(rng),
+    }
+    for key in rng.sample(sorted(entry), rng.randint(0, 3)):
+        del entry[key]  # fields missing from the line
+    return entry
+
+
+@pytest.mark.db
+class TestDecodeParity:
+    """The optimized helpers agree with the original implementations."""
+
+    @pytest.mark.parametrize('seed', SEEDS)
+    def test_numeric_parsers_match(self, seed):
+        rng = random.Random(seed)
+        for _ in range(CASES_PER_SEED):
+            value = random_numeric(rng)
+            assert load_data.parse_gpa(value) == ref_numeric(value)
+            assert load_data.parse_gre_score(value) == ref_numeric(value)
+
+    @pytest.mark.parametrize('seed', SEEDS)
+    def test_parse_date_matches_including_cache_hits(self, seed):
+        rng = random.Random(seed)
+        values = [random_date(rng) for _ in range(CASES_PER_SEED)]
+        for value in values + values:  # second pass is served from the cache
+            assert load_data.parse_date(value) == ref_date(value)
+
+    @pytest.mark.parametrize('seed', SEEDS)
+    def test_extract_p_id_matches(self, seed):
+        rng = random.Random(seed)
+        for _ in range(CASES_PER_SEED):
+            url = random_url(rng)
+            assert load_data.extract_p_id_from_url(url) == ref_p_id(url)
+
+    @pytest.mark.parametrize('seed', SEEDS)
+    def test_build_record_matches_from_json_lines(self, seed):
+        rng = random.Random(seed)
+        for _ in range(CASES_PER_SEED):
+            line = (json.dumps(random_entry(rng)) + "\n").encode("utf-8")
+            assert load_data.build_record(load_data._json_loads(line)) == ref_record(json.loads(line))
+
+    def test_build_record_without_p_id(self):
+        assert load_data.build_record({"url": "https://example.com"}) is None
+        assert load_data.build_record({}) is None
+
+
+@pytest.mark.db
+class TestDecodeHelpers:
+    """Caching and optional-dependency behavior."""
+
+    def test_parse_date_cache_is_bounded_and_hit(self):
+        load_data._parse_date_cached.cache_clear()
+        for _ in range(3):
+            load_data.parse_date('January 31, 2026')
+        info = load_data._parse_date_cached.cache_info()
+        assert info.maxsize == load_data._DATE_CACHE_SIZE
+        assert (info.hits, info.misses) == (2, 1)
+
+    def test_falls_back_to_stdlib_json_without_orjson(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'orjson', None)  # makes the import fail
+        try:
+            importlib.reload(load_data)
+            assert load_data.orjson is None
+            assert load_data._json_loads is json.loads
+        finally:
+            monkeypatch.undo()
+            importlib.reload(load_data)
+
+    def test_invalid_json_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            load_data._json_loads(b'{invalid json}\n')
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -17,6 +17,7 @@ import pytest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import load_data
+import load_dimensions
 
 
 @pytest.mark.db
@@ -165,6 +166,9 @@ class TestCreateApplicantsTable:
                 for params in params_list:
                     self.execute(query, params)
 
+            def fetchall(self):
+                return []  # no existing applicants columns to convert
+
             def close(self):
                 self.closed = True
 
@@ -182,11 +186,12 @@ class TestCreateApplicantsTable:
         mock_conn = MockConnection()
         load_data.create_applicants_table(mock_conn)
 
-        # Verify table was created
+        # Verify table was created (the dimension tables are created first)
         assert mock_conn.committed
         assert mock_conn._cursor.closed
-        assert len(mock_conn._cursor.queries) == 1
-        assert 'CREATE TABLE' in mock_conn._cursor.queries[0]
+        ddl = [query for query in mock_conn._cursor.queries if isinstance(query, str)]
+        assert 'CREATE TABLE IF NOT EXISTS applicants' in ddl[0]
+        assert len(mock_conn._cursor.queries) == len(load_dimensions.DIMENSIONS) + 2
 
         # Check console output
         captured = capsys.readouterr()
@@ -236,6 +241,12 @@ class TestLoadJSONData:
                 for params in params_list:
                     self.execute(query, params)
 
+            def fetchone(self):
+                return None  # no catalog rows: applicants is not partitioned
+
+            def fetchall(self):
+                return []  # dimension names get no keys
+
             def close(self):
                 self.closed = True
 
@@ -292,6 +303,9 @@ class TestLoadDataErrorPaths:
                 for params in params_list:
                     self.execute(query, params)
 
+            def fetchone(self):
+                return None  # no catalog rows: applicants is not partitioned
+
             def close(self):
                 self.closed = True
 
@@ -338,6 +352,9 @@ class TestLoadDataErrorPaths:
                 for params in params_list:
                     self.execute(query, params)
 
+            def fetchone(self):
+                return None  # no catalog rows: applicants is not partitioned
+
             def close(self):
                 self.closed = True
 
@@ -384,6 +401,9 @@ class TestLoadDataErrorPaths:
                 for params in params_list:
                     self.execute(query, params)
 
+            def fetchone(self):
+                return None  # no catalog rows: applicants is not partitioned
+
             def close(self):
                 self.closed = True
 
@@ -505,6 +525,9 @@ class TestLoadDataBatchInsertion:
                 for params in params_list:
                     self.execute(query, params)
 
+            def fetchone(self):
+                return None  # no catalog rows: applicants is not partitioned
+
             def close(self):
                 self.closed = True
 
@@ -534,6 +557,11 @@ class TestLoadDataBatchInsertion:
 class TestLoadDataMainBlock:
     """Test load_data main execution."""
 
+    @pytest.fixture(autouse=True)
+    def console_argv(self, monkeypatch):
+        """main() reads sys.argv like the gradcafe-load console script."""
+        monkeypatch.setattr(sys, 'argv', ['gradcafe-load'])
+
     def test_main_function_structure(self):
         """Test that load_data main functions exist."""
         # Verify main functions exist
@@ -553,7 +581,7 @@ class TestLoadDataMainBlock:
         def mock_create_table(conn):
             pass
 
-        def mock_load_json_data(path, conn):
+        def mock_load_json_data(path, conn, **options):
             return 100
 
         def mock_verify_data(conn):
@@ -599,7 +627,7 @@ class TestLoadDataMainBlock:
         def mock_create_table(conn):
             pass
 
-        def mock_load_json_data(path, conn):
+        def mock_load_json_data(path, conn, **options):
             raise FileNotFoundError(f"File not found: {path}")
 
         monkeypatch.setattr('psycopg.connect', mock_connect)
@@ -628,7 +656,7 @@ class TestLoadDataMainBlock:
         def mock_create_table(conn):
             pass
 
-        def mock_load_json_data(path, conn):
+        def mock_load_json_data(path, conn, **options):
             raise ValueError("Unexpected error")
 
         monkeypatch.setattr('psycopg.connect', mock_connect)
@@ -658,7 +686,7 @@ class TestLoadDataMainBlock:
         def mock_create_table(conn):
             pass
 
-        def mock_load_json_data(path, conn):
+        def mock_load_json_data(path, conn, **options):
             return 50
 
         def mock_verify_data(conn):
@@ -693,7 +721,7 @@ class TestLoadDataMainBlock:
         def mock_create_table(conn):
             pass
 
-        def mock_load_json_data(path, conn):
+        def mock_load_json_data(path, conn, **options):
             return 25
 
         def mock_verify_data(conn):
@@ -742,6 +770,9 @@ class MockCursor:
         for params in params_list:
             self.execute(query, params)
 
+    def fetchone(self):
+        return None  # no catalog rows: applicants is not partitioned
+
     def close(self):
         self.closed = True
 
@@ -754,6 +785,7 @@ class TestLoadDataIfNameMain:
         """Test __main__ block executes main() via runpy."""
         monkeypatch.setattr('psycopg.connect', lambda **kwargs: MagicMock())
         src_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'load_data.py')
+        monkeypatch.setattr(sys, 'argv', [src_path])
         runpy.run_path(src_path, run_name='__main__')
 
 
@@ -0,0 +1,122 @@
+"""
+Tests for load_dimensions.py: dimension tables, interning and table conversion.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data
+import load_dimensions
+import query_data
+
+
+def _line(i, status, degree, program, university):
+    row = {
+        "url": f"https://test.com/result/{i}", "semester_year_start": "Fall 2026",
+        "applicant_status": status, "masters_or_phd": degree, "citizenship": "American",
+        "gpa": "3.5", "llm-generated-program": program, "llm-generated-university": university,
+    }
+    return json.dumps(row) + "\n"
+
+
+def _names(conn, table):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT name FROM {table} ORDER BY name")
+        return [row[0] for row in cur.fetchall()]
+
+
+class TestKeyColumns:
+    """Test the column mapping helpers."""
+
+    def test_key_columns_replace_dimension_fields(self):
+        assert load_dimensions.key_columns(('p_id', 'status', 'degree', 'gpa')) == (
+            'p_id', 'status_id', 'degree_id', 'gpa'
+        )
+        assert 'program' in load_data._APPLICANT_COLS
+        assert 'program_id' in load_data._APPLICANT_COLS
+
+    def test_key_lookup_quotes_name(self):
+        lookup = load_dimensions.key_lookup('statuses', "O'Brien")
+        assert lookup.as_string(None) == "(SELECT id FROM \"statuses\" WHERE name = 'O''Brien')"
+
+
+class TestInterner:
+    """Test Interner against a mock cursor."""
+
+    def test_cache_avoids_repeat_lookups(self):
+        cursor = MagicMock()
+        cursor.fetchall.side_effect = lambda: [(name, i) for i, name in enumerate(cursor.execute.call_args[0][1][0])]
+        interner = load_dimensions.Interner(('p_id', 'status', 'degree'))
+
+        rows = interner.encode(cursor, [(1, 'Accepted', 'PhD'), (2, 'Rejected', None), (3, 'Accepted', 'PhD')])
+        lookups = cursor.execute.call_count
+
+        assert rows == [(1, 0, 0), (2, 1, None), (3, 0, 0)]
+        assert interner.encode(cursor, [(4, 'Rejected', 'PhD', b'hash')]) == [(4, 1, 0, b'hash')]
+        assert cursor.execute.call_count == lookups
+
+
+@pytest.mark.db
+class TestDimensionsDatabase:
+    """Interning and conversion against PostgreSQL."""
+
+    def test_load_stores_each_name_once(self, tmp_path, scratch_schema):
+        path = tmp_path / "rows.jsonl"
+        path.write_text(
+            _line(1, 'Accepted', 'PhD', 'Computer Science', 'Stanford University')
+            + _line(2, 'Rejected', 'PhD', 'Computer Science', 'Stanford University')
+            + _line(3, 'Accepted', 'Masters', 'Mathematics', None)
+        )
+        load_data.create_applicants_table(scratch_schema)
+
+        load_data.load_json_data(str(path), scratch_schema, mode='copy')
+        load_data.load_json_data(str(path), scratch_schema)
+
+        assert _names(scratch_schema, 'statuses') == ['Accepted', 'Rejected']
+        assert _names(scratch_schema, 'programs') == ['Computer Science', 'Mathematics']
+        assert _names(scratch_schema, 'universities') == ['Stanford University']
+        with scratch_schema.cursor() as cur:
+            cur.execute("SELECT count(*) FROM applicants WHERE university_id IS NULL")
+            assert cur.fetchone() == (1,)
+
+        results = query_data.question_10(scratch_schema)
+        assert [row[:4] for row in results] == [('Stanford University', 'Computer Science', 2, 1)]
+        assert [row[:3] for row in query_data.question_11(scratch_schema)] == [('Masters', 1, 1), ('PhD', 2, 1)]
+
+    def test_converts_text_layout(self, scratch_schema, capsys):
+        with scratch_schema.cursor() as cur:
+            cur.execute(
+                "CREATE TABLE applicants (p_id INTEGER PRIMARY KEY, program TEXT, status TEXT, term TEXT,"
+                " us_or_international TEXT, gpa NUMERIC(3,2), degree TEXT,"
+                " llm_generated_program TEXT, llm_generated_university TEXT)"
+            )
+            cur.execute(
+                "INSERT INTO applicants VALUES"
+                " (1, 'MIT, CS', 'Accepted', 'Fall 2026', 'International', 3.9, 'PhD', 'CS', 'MIT'),"
+                " (2, 'MIT, CS', 'Rejected', 'Fall 2026', NULL, NULL, 'PhD', 'CS', 'MIT')"
+            )
+        scratch_schema.commit()
+
+        load_data.create_applicants_table(scratch_schema)
+
+        assert 'dimension tables' in capsys.readouterr().out
+        assert query_data.question_2(scratch_schema) == 100
+        with scratch_schema.cursor() as cur:
+            cur.execute(
+                "SELECT p_id, s.name, d.name FROM applicants"
+                " JOIN statuses s ON s.id = status_id JOIN degrees d ON d.id = degree_id ORDER BY p_id"
+            )
+            assert cur.fetchall() == [(1, 'Accepted', 'PhD'), (2, 'Rejected', 'PhD')]
+            assert not load_dimensions.convert_text_columns(cur)
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,262 @@
+"""
+Tests for load_manifest.py and the incremental load path in load_data.py.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data
+import load_manifest
+
+
+def _line(i, **extra):
+    return json.dumps({"url": f"https://test.com/result/{i}", **extra}) + "\n"
+
+
+def _count(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT count(*) FROM applicants")
+        return cur.fetchone()[0]
+
+
+def _manifest_offset(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT committed_offset FROM load_manifest")
+        return cur.fetchone()[0]
+
+
+@pytest.fixture
+def manifest_db(scratch_schema):
+    """Scratch schema with the applicants and manifest tables created."""
+    load_data.create_applicants_table(scratch_schema)
+    load_manifest.create_manifest_table(scratch_schema)
+    return scratch_schema
+
+
+@pytest.mark.db
+class TestFileIdentity:
+    """Test file_identity."""
+
+    def test_identity_fields(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text(_line(1))
+        identity = load_manifest.file_identity(str(path))
+
+        assert identity["path"] == os.path.realpath(path)
+        assert identity["size"] == path.stat().st_size == identity["head_bytes"]
+        assert identity["inode"] == path.stat().st_ino
+        assert len(identity["head_hash"]) == 16
+
+    def test_head_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(load_manifest, 'HEAD_BYTES', 8)
+        path = tmp_path / "rows.jsonl"
+        path.write_text(_line(1) + _line(2))
+        first = load_manifest.file_identity(str(path))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(_line(3))
+
+        assert first["head_bytes"] == 8
+        assert load_manifest.file_identity(str(path))["head_hash"] == first["head_hash"]
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_manifest.file_identity(str(tmp_path / "missing.jsonl"))
+
+
+@pytest.mark.db
+class TestResumeOffset:
+    """Test how resume_offset compares a file with its manifest entry."""
+
+    @pytest.fixture
+    def recorded(self, tmp_path, manifest_db, monkeypatch):
+        """A two-line file fully recorded in the manifest, its head being the first line."""
+        monkeypatch.setattr(load_manifest, 'HEAD_BYTES', len(_line(1)))
+        path = tmp_path / "rows.jsonl"
+        path.write_text(_line(1) + _line(2))
+        identity = load_manifest.file_identity(str(path))
+        with manifest_db.cursor() as cur:
+            load_manifest.record_offset(cur, identity, identity["size"])
+        manifest_db.commit()
+        return path, identity
+
+    def _resume(self, conn, path):
+        return load_manifest.resume_offset(conn, load_manifest.file_identity(str(path)))
+
+    def test_unknown_file_starts_at_zero(self, tmp_path, manifest_db):
+        path = tmp_path / "new.jsonl"
+        path.write_text(_line(1))
+        assert self._resume(manifest_db, path) == 0
+
+    def test_unchanged_file_resumes_at_end(self, manifest_db, recorded):
+        path, identity = recorded
+        assert self._resume(manifest_db, path) == identity["size"]
+
+    def test_appended_file_resumes_at_offset(self, manifest_db, recorded):
+        path, identity = recorded
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(_line(3))
+        assert self._resume(manifest_db, path) == identity["size"]
+
+    def test_truncated_file_starts_over(self, manifest_db, recorded):
+        path, _ = recorded
+        path.write_text(_line(1))
+        assert self._resume(manifest_db, path) == 0
+
+    def test_replaced_file_starts_over(self, manifest_db, recorded):
+        path, _ = recorded
+        replacement = path.with_name("replacement.jsonl")
+        replacement.write_text(_line(1) + _line(2) + _line(3))
+        os.replace(replacement, path)
+        assert self._resume(manifest_db, path) == 0
+
+    def test_rewritten_same_size_starts_over(self, manifest_db, recorded):
+        path, identity = recorded
+        os.utime(path, ns=(identity["mtime_ns"] + 10**9, identity["mtime_ns"] + 10**9))
+        assert self._resume(manifest_db, path) == 0
+
+    def test_grown_rewrite_with_stale_offset_starts_over(self, manifest_db, recorded):
+        """A rewrite in place that grew leaves the old offset mid-line."""
+        path, identity = recorded
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_line(1) + _line(2, program="a longer standardized name") + _line(3))
+        assert path.stat().st_ino == identity["inode"]
+        assert self._resume(manifest_db, path) == 0
+
+    def test_grown_rewrite_at_line_boundary_starts_over(self, manifest_db, recorded):
+        """The block before the offset is compared even when it ends a line."""
+        path, _ = recorded
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_line(1) + _line(8) + _line(3))
+        assert self._resume(manifest_db, path) == 0
+
+    def test_manifest_without_tail_hash_starts_over(self, manifest_db, recorded):
+        path, _ = recorded
+        with manifest_db.cursor() as cur:
+            cur.execute("UPDATE load_manifest SET tail_hash = NULL")
+        assert self._resume(manifest_db, path) == 0
+
+    def test_changed_head_starts_over(self, manifest_db, recorded):
+        path, _ = recorded
+        with open(path, 'r+', encoding='utf-8') as f:
+            f.write('{"url": "https://test.com/result/9"}\n')
+            f.seek(0, os.SEEK_END)
+            f.write(_line(3))
+        assert self._resume(manifest_db, path) == 0
+
+
+@pytest.mark.db
+class TestIncrementalLoad:
+    """Run incremental loads against PostgreSQL."""
+
+    def test_reload_is_noop_and_append_loads_tail(self, tmp_path, manifest_db, capsys):
+        path = tmp_path / "rows.jsonl"
+        path.write_text(_line(1) + _line(2) + _line(3))
+
+        assert load_data.load_json_data(str(path), manifest_db, incremental=True) == 3
+        assert _manifest_offset(manifest_db) == path.stat().st_size
+        assert load_data.load_json_data(str(path), manifest_db, incremental=True) == 0
+        assert 'unchanged since the last load' in capsys.readouterr().out
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(_line(4) + _line(5))
+        assert load_data.load_json_data(str(path), manifest_db, incremental=True) == 2
+        assert 'Resuming' in capsys.readouterr().out
+        assert _count(manifest_db) == 5
+
+    def test_rewrite_in_place_reloads_everything(self, tmp_path, manifest_db):
+        """A standardizer-style rewrite that grew the file is upserted in full."""
+        path = tmp_path / "rows.jsonl"
+        path.write_text("".join(_line(i, program="old") for i in range(1, 4)))
+        load_data.load_json_data(str(path), manifest_db, incremental=True, upsert=True)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("".join(_line(i, program="renamed program") for i in range(1, 5)))
+
+        assert load_data.load_json_data(str(path), manifest_db, incremental=True, upsert=True) == 4
+        with manifest_db.cursor() as cur:
+            cur.execute("SELECT DISTINCT program FROM applicants")
+            assert cur.fetchall() == [("renamed program",)]
+
+    def test_partial_last_line_is_retried(self, tmp_path, manifest_db):
+        """A line still being written is not counted as loaded."""
+        path = tmp_path / "rows.jsonl"
+        complete = _line(1)
+        path.write_text(complete + '{"url": "https://test.com/res')
+
+        assert load_data.load_json_data(str(path), manifest_db, mode='copy', incremental=True) == 1
+        assert _manifest_offset(manifest_db) == len(complete)
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('ult/2"}\n')
+        assert load_data.load_json_data(str(path), manifest_db, mode='copy', incremental=True) == 1
+        assert _count(manifest_db) == 2
+        assert _manifest_offset(manifest_db) == path.stat().st_size
+
+    def test_trailing_skipped_lines_are_recorded(self, tmp_path, manifest_db):
+        path = tmp_path / "rows.jsonl"
+        path.write_text('{"url": "no id here"}\n')
+
+        assert load_data.load_json_data(str(path), manifest_db, incremental=True) == 0
+        assert _manifest_offset(manifest_db) == path.stat().st_size
+
+    def test_failed_batch_resumes_after_last_commit(self, tmp_path, manifest_db, monkeypatch):
+        """The offset is committed with its batch, so a crash loses no progress."""
+        monkeypatch.setitem(load_data._BATCH_SIZES, 'insert', 2)
+        path = tmp_path / "rows.jsonl"
+        lines = [_line(i) for i in range(1, 6)]
+        path.write_text("".join(lines))
+        real_insert = load_data._insert_batch
+        calls = []
+
+        def flaky_insert(cursor, records, upsert=False):
+            calls.append(len(records))
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            real_insert(cursor, records, upsert)
+
+        monkeypatch.setattr('load_data._insert_batch', flaky_insert)
+        with pytest.raises(RuntimeError):
+            load_data.load_json_data(str(path), manifest_db, incremental=True)
+        manifest_db.rollback()
+        assert _manifest_offset(manifest_db) == len(lines[0]) + len(lines[1])
+
+        monkeypatch.setattr('load_data._insert_batch', real_insert)
+        assert load_data.load_json_data(str(path), manifest_db, incremental=True) == 3
+        assert _count(manifest_db) == 5
+
+    def test_parallel_incremental_load(self, tmp_path, manifest_db, monkeypatch):
+        """Shards cover only the new tail; the offset is recorded at the end."""
+        monkeypatch.setenv('PGOPTIONS', '-c search_path=load_data_test')
+        path = tmp_path / "rows.jsonl"
+        path.write_text("".join(_line(i) for i in range(1, 21)))
+        load_data.load_json_data(str(path), manifest_db, incremental=True)
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("".join(_line(i) for i in range(21, 41)))
+        conn = manifest_db
+        assert load_data.load_json_data_parallel(str(path), conn, 2, mode='copy', incremental=True) == 20
+        assert _manifest_offset(conn) == path.stat().st_size
+        assert load_data.load_json_data_parallel(str(path), conn, 2, incremental=True) == 0
+        assert _count(conn) == 40
+
+    def test_shard_ranges_within_byte_range(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        lines = [_line(i) for i in range(1, 30)]
+        path.write_text("".join(lines))
+        start = sum(map(len, lines[:10]))
+        end = sum(map(len, lines[:25]))
+
+        ranges = load_data._shard_ranges(str(path), 4, (start, end))
+        assert ranges[0][0] == start and ranges[-1][1] == end
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,156 @@
+"""
+Tests for load_partitions.py and loading into the term-partitioned layout.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data
+import load_partitions
+import migrate
+import query_data
+
+
+def _line(i, term):
+    row = {"url": f"https://test.com/result/{i}", "semester_year_start": term, "masters_or_phd": "PhD"}
+    return json.dumps(row) + "\n"
+
+
+def _partitions(conn):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass('applicants')"
+        )
+        return {row[0] for row in cur.fetchall()}
+
+
+def _rows_per_partition(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT tableoid::regclass::text, count(*) FROM applicants GROUP BY 1")
+        return dict(cur.fetchall())
+
+
+@pytest.fixture
+def partitioned_db(scratch_schema):
+    """Scratch schema with a term-partitioned applicants table."""
+    load_data.create_applicants_table(scratch_schema, partitioned=True)
+    return scratch_schema
+
+
+class TestPartitionName:
+    """Test partition_name."""
+
+    @pytest.mark.parametrize('term, name', [
+        ('Fall 2026', 'applicants_fall_2026'),
+        ('Spring 2025', 'applicants_spring_2025'),
+        (None, 'applicants_no_term'),
+    ])
+    def test_readable_names(self, term, name):
+        assert load_partitions.partition_name(term) == name
+
+    def test_other_spellings_are_hashed(self):
+        names = {load_partitions.partition_name(t) for t in ('fall 2026', 'FALL 2026', 'Fall 2026 ', '2026')}
+
+        assert len(names) == 4
+        assert all(name.startswith('applicants_t_') and len(name) <= 63 for name in names)
+
+    def test_pg14_keeps_termless_rows_unique_locally(self):
+        cursor = MagicMock()
+        cursor.connection.info.server_version = 140011
+
+        load_partitions.create_partitioned_table(cursor, "term TEXT")
+
+        statements = [call.args[0].as_string(None) for call in cursor.execute.call_args_list
+                      if not isinstance(call.args[0], str)]
+        assert 'NULLS NOT DISTINCT' not in statements[0]
+        assert statements[-1].startswith('CREATE UNIQUE INDEX IF NOT EXISTS "applicants_no_term_p_id_key"')
+
+
+@pytest.mark.db
+class TestPartitionedLoad:
+    """Load into the partitioned layout against PostgreSQL."""
+
+    def test_create_is_idempotent(self, partitioned_db):
+        load_data.create_applicants_table(partitioned_db, partitioned=True)
+
+        assert load_partitions.is_partitioned(partitioned_db)
+        assert _partitions(partitioned_db) == {'applicants_no_term'}
+
+    def test_unpartitioned_table_is_detected(self, scratch_schema):
+        assert not load_partitions.is_partitioned(scratch_schema)
+        load_data.create_applicants_table(scratch_schema)
+        assert not load_partitions.is_partitioned(scratch_schema)
+
+    @pytest.mark.parametrize('mode', load_data.LOAD_MODES)
+    def test_load_creates_partitions_and_is_idempotent(self, tmp_path, partitioned_db, monkeypatch, mode):
+        monkeypatch.setitem(load_data._BATCH_SIZES, mode, 2)
+        path = tmp_path / "rows.jsonl"
+        terms = ['Fall 2026', 'Fall 2025', 'Fall 2026', None, 'fall 2026']
+        path.write_text("".join(_line(i, term) for i, term in enumerate(terms, 1)))
+
+        load_data.load_json_data(str(path), partitioned_db, mode=mode)
+        load_data.load_json_data(str(path), partitioned_db, mode=mode)
+
+        counts = _rows_per_partition(partitioned_db)
+        assert counts.pop('applicants_fall_2026') == 2
+        assert counts.pop('applicants_fall_2025') == 1
+        assert counts.pop('applicants_no_term') == 1
+        assert list(counts.values()) == [1]
+
+    def test_upsert_updates_in_place(self, tmp_path, partitioned_db):
+        path = tmp_path / "rows.jsonl"
+        path.write_text(_line(1, 'Fall 2026') + _line(2, None))
+        load_data.load_json_data(str(path), partitioned_db, mode='copy', upsert=True)
+
+        path.write_text(_line(1, 'Fall 2026').replace('PhD', 'Masters') + _line(2, None))
+        load_data.load_json_data(str(path), partitioned_db, mode='copy', upsert=True)
+
+        with partitioned_db.cursor() as cur:
+            cur.execute("SELECT p_id, d.name FROM applicants JOIN degrees d ON d.id = degree_id ORDER BY p_id")
+            assert cur.fetchall() == [(1, 'Masters'), (2, 'PhD')]
+
+    @pytest.mark.parametrize('question, scanned', [
+        ('question_1', {'applicants_fall_2026'}),
+        ('question_8', {'applicants_fall_2026', 'applicants_spring_2026'}),
+        ('question_9', {'applicants_fall_2026', 'applicants_spring_2026'}),
+    ])
+    def test_term_filter_is_pruned(self, tmp_path, partitioned_db, question, scanned):
+        path = tmp_path / "rows.jsonl"
+        path.write_text(_line(1, 'Fall 2026') + _line(2, 'Fall 2025') + _line(3, None) + _line(4, 'Spring 2026'))
+        load_data.load_json_data(str(path), partitioned_db)
+
+        recorder = migrate._RecordingConnection(partitioned_db)
+        getattr(query_data, question)(recorder)
+        plans = set()
+        with partitioned_db.cursor() as cur:
+            for statement, _ in recorder.statements:
+                cur.execute("EXPLAIN " + statement)
+                plans.update(word for row in cur.fetchall() for word in row[0].split())
+
+        assert {name for name in _partitions(partitioned_db) if name in plans} == scanned
+
+    def test_ensure_partitions(self, scratch_schema):
+        load_data.create_applicants_table(scratch_schema)
+        load_partitions.ensure_partitions(scratch_schema, {'Fall 2026'})
+        scratch_schema.rollback()
+        assert _partitions(scratch_schema) == set()
+
+        with scratch_schema.cursor() as cur:
+            cur.execute("DROP TABLE applicants")
+        load_data.create_applicants_table(scratch_schema, partitioned=True)
+        load_partitions.ensure_partitions(scratch_schema, {'Fall 2026'})
+        scratch_schema.commit()
+        assert _partitions(scratch_schema) == {'applicants_no_term', 'applicants_fall_2026'}
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,265 @@
+"""
+Tests for migrate.py: declarative index creation and the EXPLAIN index check.
+"""
+
+import os
+import runpy
+import sys
+from unittest.mock import MagicMock
+
+import psycopg
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import load_data
+import load_partitions
+import migrate
+
+FIELDS = ('p_id', 'program', 'term', 'status', 'degree', 'us_or_international',
+          'gpa', 'gre', 'gre_v', 'gre_aw', 'llm_generated_program', 'llm_generated_university')
+ROWS = [
+    (1, 'Johns Hopkins University, Computer Science', 'Fall 2026', 'Accepted', 'Masters', 'American',
+     3.9, 320, 160, 4.5, 'Computer Science', 'Johns Hopkins University'),
+    (2, 'MIT, Computer Science', 'Fall 2026', 'Accepted', 'PhD', 'International',
+     3.7, 325, 158, 4.0, 'Computer Science', 'Massachusetts Institute of Technology (MIT)'),
+    (3, 'Stanford University, Mathematics', 'Spring 2025', 'Rejected', 'PhD', 'American',
+     None, None, None, None, 'Mathematics', 'Stanford University'),
+]
+
+
+@pytest.fixture
+def seeded(scratch_schema):
+    """Scratch applicants table with a few rows every question can format."""
+    load_data.create_applicants_table(scratch_schema)
+    with scratch_schema.cursor() as cur:
+        records = [tuple(dict(zip(FIELDS, row)).get(f) for f in load_data._RECORD_FIELDS) for row in ROWS]
+        cur.executemany(load_data.APPLICANT_INSERT, load_data.make_interner().encode(cur, records))
+    scratch_schema.commit()
+    return scratch_schema
+
+
+def _index_names(conn):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = 'load_data_test'"
+            " AND indexname NOT LIKE '%\\_pkey' AND indexname NOT LIKE '%\\_key'"
+        )
+        names = {row[0] for row in cur.fetchall()}
+    conn.commit()  # create_indexes needs an idle connection
+    return names
+
+
+@pytest.mark.db
+class TestCreateIndexes:
+    """Run the index migration against PostgreSQL."""
+
+    def test_creates_declared_indexes_once(self, seeded):
+        built = migrate.create_indexes(seeded)
+
+        declared = [name for name, _, _ in migrate.INDEXES]
+        assert built == [name for name in declared if name in built]
+        assert _index_names(seeded) == set(built)
+        assert 'applicants_term_status_degree_idx' in built
+        assert not migrate.create_indexes(seeded)
+        assert seeded.autocommit is False
+
+    def test_rebuilds_invalid_index(self, seeded, capsys):
+        """An index left invalid by a failed concurrent build is replaced."""
+        seeded.autocommit = True
+        with pytest.raises(psycopg.errors.UniqueViolation):
+            # Duplicate terms make the build fail after the index is registered
+            seeded.execute("CREATE UNIQUE INDEX CONCURRENTLY applicants_scores_idx ON applicants (term)")
+        seeded.autocommit = False
+
+        assert 'applicants_scores_idx' in migrate.create_indexes(seeded)
+        assert 'is invalid' in capsys.readouterr().out
+        with seeded.cursor() as cur:
+            cur.execute(
+                "SELECT i.indisvalid, i.indisunique FROM pg_index i"
+                " JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = 'applicants_scores_idx'"
+            )
+            assert cur.fetchone() == (True, False)
+
+    def test_trigram_indexes_need_pg_trgm(self):
+        """The extension check covers unavailable, forbidden and usable pg_trgm."""
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        assert migrate._enable_trgm(cursor) is False
+
+        cursor.fetchone.return_value = (1,)
+        cursor.execute.side_effect = [None, psycopg.errors.InsufficientPrivilege("denied")]
+        assert migrate._enable_trgm(cursor) is False
+
+        cursor.execute.side_effect = None
+        assert migrate._enable_trgm(cursor) is True
+
+    def test_trigram_indexes_created_when_available(self, monkeypatch):
+        conn = MagicMock()
+        conn.autocommit = False
+        conn.cursor.return_value.fetchall.return_value = [("applicants_term_status_degree_idx", True)]
+        monkeypatch.setattr('migrate._enable_trgm', lambda cursor: True)
+
+        built = migrate.create_indexes(conn)
+
+        assert 'applicants_program_trgm_idx' in built
+        assert 'applicants_term_status_degree_idx' not in built
+        assert len(built) == len(migrate.INDEXES) - 1
+        assert conn.autocommit is False
+
+
+@pytest.mark.db
+class TestPartitioning:
+    """Convert to the term-partitioned layout and detach old terms."""
+
+    def test_partition_existing_table(self, seeded, capsys):
+        migrate.create_indexes(seeded)
+
+        assert migrate.partition_applicants(seeded) is True
+        assert 'Moved 3 rows' in capsys.readouterr().out
+        assert load_partitions.is_partitioned(seeded)
+        with seeded.cursor() as cur:
+            cur.execute("SELECT tableoid::regclass::text, count(*) FROM applicants GROUP BY 1 ORDER BY 1")
+            assert cur.fetchall() == [('applicants_fall_2026', 2), ('applicants_spring_2025', 1)]
+            cur.execute("SELECT to_regclass('applicants_unpartitioned')")
+            assert cur.fetchone() == (None,)
+        assert _index_names(seeded) == set()
+        assert migrate.partition_applicants(seeded) is False
+
+        built = migrate.create_indexes(seeded)
+        assert 'applicants_term_status_degree_idx' in built
+        assert 'applicants_fall_2026_term_status_id_degree_id_idx' in _index_names(seeded)
+
+    def test_detach_term(self, seeded):
+        migrate.partition_applicants(seeded)
+
+        archived = migrate.detach_term(seeded, 'Spring 2025')
+        assert archived.startswith('applicants_spring_2025_archived_')
+        assert seeded.autocommit is False
+        with seeded.cursor() as cur:
+            cur.execute("SELECT count(*) FROM applicants")
+            assert cur.fetchone() == (2,)
+            cur.execute(f"SELECT p_id FROM {archived}")
+            assert cur.fetchall() == [(3,)]
+        seeded.commit()
+        with pytest.raises(ValueError, match='no partition'):
+            migrate.detach_term(seeded, 'Spring 2025')
+
+    def test_reload_after_detach_creates_new_partition(self, seeded, tmp_path):
+        migrate.partition_applicants(seeded)
+        archived = migrate.detach_term(seeded, 'Spring 2025')
+        path = tmp_path / "rows.jsonl"
+        path.write_text(
+            '{"url": "https://test.com/result/3", "semester_year_start": "Spring 2025"}\n'
+            '{"url": "https://test.com/result/4", "semester_year_start": "Spring 2025"}\n'
+        )
+
+        load_data.load_json_data(str(path), seeded)
+
+        with seeded.cursor() as cur:
+            cur.execute(
+                "SELECT tableoid::regclass::text, p_id FROM applicants"
+                " WHERE term = 'Spring 2025' ORDER BY p_id"
+            )
+            assert cur.fetchall() == [('applicants_spring_2025', 3), ('applicants_spring_2025', 4)]
+            cur.execute(f"SELECT count(*) FROM {archived}")
+            assert cur.fetchone() == (1,)
+
+
+@pytest.mark.db
+class TestIndexUsageCheck:
+    """Test the EXPLAIN-based index usage check."""
+
+    def test_every_question_uses_an_index(self, seeded):
+        migrate.create_indexes(seeded)
+
+        usage = migrate.check_index_usage(seeded)
+
+        assert list(usage) == list(migrate.QUESTIONS)
+        assert all(statements and all(statements) for statements in usage.values())
+        assert usage['question_1'] == [{'applicants_term_status_degree_idx'}]
+        assert usage['question_3'] == [{'applicants_scores_idx'}]
+        assert len(usage['question_9']) == 2
+
+    def test_without_indexes_questions_report_none(self, seeded, capsys):
+        usage = migrate.check_index_usage(seeded)
+
+        assert migrate._print_index_usage(usage) is False
+        assert 'NO INDEX' in capsys.readouterr().out
+
+    def test_plan_indexes_walks_nested_plans(self):
+        plan = {
+            "Node Type": "Aggregate",
+            "Plans": [
+                {"Node Type": "Bitmap Heap Scan", "Plans": [
+                    {"Node Type": "BitmapOr", "Plans": [
+                        {"Node Type": "Bitmap Index Scan", "Index Name": "a_idx"},
+                        {"Node Type": "Bitmap Index Scan", "Index Name": "b_idx"},
+                    ]},
+                ]},
+            ],
+        }
+        assert migrate._plan_indexes(plan) == {"a_idx", "b_idx"}
+        assert migrate._plan_indexes({"Node Type": "Seq Scan"}) == set()
+
+
+@pytest.mark.db
+class TestMigrateMain:
+    """Test the migrate.py entry point."""
+
+    @pytest.fixture
+    def patched(self, monkeypatch):
+        conn = MagicMock()
+        monkeypatch.setattr('migrate.get_connection', lambda: conn)
+        monkeypatch.setattr('migrate.load_data.create_applicants_table', lambda c, partitioned=False: None)
+        monkeypatch.setattr('migrate.load_manifest.create_manifest_table', lambda c: None)
+        monkeypatch.setattr('migrate.create_indexes', lambda c: ['x_idx'])
+        return conn
+
+    def test_main_migrates_and_closes(self, patched, capsys):
+        assert migrate.main([]) == 0
+        assert '1 index(es) built' in capsys.readouterr().out
+        patched.close.assert_called_once()
+
+    @pytest.mark.parametrize('sets, code', [([{'x_idx'}], 0), ([set()], 1)])
+    def test_main_check_sets_exit_code(self, patched, monkeypatch, capsys, sets, code):
+        monkeypatch.setattr('migrate.check_index_usage', lambda c: {'question_1': sets})
+        assert migrate.main(['--check']) == code
+        assert 'question_1' in capsys.readouterr().out
+
+    def test_main_partition_and_detach(self, patched, monkeypatch, capsys):
+        calls = []
+        monkeypatch.setattr(
+            'migrate.load_data.create_applicants_table', lambda c, partitioned=False: calls.append(partitioned)
+        )
+        monkeypatch.setattr('migrate.partition_applicants', lambda c: True)
+        monkeypatch.setattr('migrate.detach_term', lambda c, term: f"applicants_{term}")
+
+        assert migrate.main(['--partition', '--detach', 'a', '--detach', 'b']) == 0
+        out = capsys.readouterr().out
+        assert calls == [True]
+        assert 'now partitioned by term' in out and 'applicants_b' in out
+
+    def test_main_detach_unknown_term(self, patched, monkeypatch, capsys):
+        def missing(conn, term):
+            raise ValueError(f"applicants has no partition for term {term!r}")
+        monkeypatch.setattr('migrate.detach_term', missing)
+
+        assert migrate.main(['--detach', 'Fall 1999']) == 1
+        assert 'Error: applicants has no partition' in capsys.readouterr().out
+        patched.close.assert_called_once()
+
+    def test_if_name_main_block(self, monkeypatch):
+        """Running the module exits with main()'s return code."""
+        monkeypatch.setattr('psycopg.connect', lambda **kwargs: MagicMock())
+        monkeypatch.setattr(sys, 'argv', ['migrate.py'])
+        src_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'migrate.py')
+        with pytest.raises(SystemExit) as exc:
+            runpy.run_path(src_path, run_name='__main__')
+        assert exc.value.code == 0
+
+
+# Run tests with pytest
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])